@@ -1,5 +1,4 @@
 from source.Sensor import Sensor
-import matplotlib.pyplot as plt
 import numpy as np
 from typing import List
 from source.helperFunctions import generate_active_list
@@ -8,12 +7,13 @@ VOLTAGE = 3.3 #V
 
 class AVR128DB64T(Sensor):
 
+    modes_attribute = "modes_MCR" # name of the modes list, see Sensor.get_modes()
+
     def __init__(self, duration, time_step, modes_MCR, loop_rate):
         self.duration = duration
         self.time_step = time_step
         self.modes_MCR = modes_MCR
         self.loop_rate = loop_rate
-        self.time = np.arange(0, duration, time_step)
         self.active_time_params = generate_active_list(duration, modes_MCR)
 
     def generate_valid_configs_mcr(self):
@@ -45,18 +45,25 @@ class AVR128DB64T(Sensor):
         all_configs += configs
         
         return all_configs
-    
-    def run_sim(self):
-        try:
-            self.error_check()
-            power = self.get_all_modes_power()
-            data = np.zeros(len(power))
-            return power, data, self.time 
-        except TypeError as e:
-            print("A type error occurred. Your active times array may exceed the set duration.", e)
-            return -1
-    @staticmethod
-    
+
+    generate_valid_configs = generate_valid_configs_mcr
+
+    def run_sim(self, as_trace=False, power_dtype=None, data_dtype=None, memory_budget=None):
+        """
+          Computes the power usage of the modes in modes_MCR. The microcontroller has no plot, so this is simulate().
+
+          Parameters
+          ----------
+            as_trace: if True, power and data are returned as PowerTrace and DataTrace segment traces
+            power_dtype, data_dtype: dtypes of the power and data vectors, see Sensor.simulate()
+            memory_budget: bytes the vectors may take, see Sensor.simulate()
+
+          Returns
+          -------
+            Power consumptions, data usages (all 0), and times. Empty lists if at least one mode is invalid
+        """
+        return self.simulate(as_trace, power_dtype, data_dtype, memory_budget)
+
     def compute_power(self, mode, clock, freq, lp, sd):
         power_used = 0
         freq_options = [1, 2, 3, 4, 8, 12, 16, 20, 24]
@@ -143,6 +150,23 @@ class AVR128DB64T(Sensor):
     def compute_data(self):
         return 0
     
+    def get_segment_rates(self, times):
+        """
+          Computes the power consumption and data usage of one active period of active_time_params
+
+          Parameters
+          ----------
+            times: tuple (start, end, configuration, sampling_rate)
+
+          Returns
+          -------
+            power: Float representing power in mW
+            data: number of bytes used in 1 second
+        """
+        mode, clock, freq, lp, sd = times[2]
+        power = self.compute_power(mode, clock, freq, lp, sd)
+        return power, self.compute_data()
+
     def get_all_modes_power(self):
         """
           Computes the power consumption of all modes in modes_MCR
@@ -153,26 +177,10 @@ class AVR128DB64T(Sensor):
 
           Returns
           -------
-            power_arr: list of all computed power consumptions
+            power_arr: numpy array of all computed power consumptions
         """    
-        length = len(self.time)
-        power_arr = [0] * length # creating corresponding power array to time intervals, default values
-        for times in self.active_time_params: # check if the given start and end time is a valid value in the time array and round to nearest value 
-            start_index = int(times[0] / self.time_step) # getting index of the closest value to active times 
-            end_index = int(times[1] / self.time_step)
-
-            if start_index < 0 or end_index > len(self.time): # not valid time
-                print("Error. Index not valid.")
-                return
-            
-            params = times[2]
-            power = 0
-            mode, clock, freq, lp, sd = params
-            power = self.compute_power(self,mode, clock, freq, lp, sd)
-            for i in range(start_index, end_index):
-                power_arr[i] = power
-
-        return np.array(power_arr)
+        power_arr, _ = self.compute_vectors(self.get_segment_rates)
+        return power_arr
     
     def error_check(self):
         """
@@ -187,9 +195,8 @@ class AVR128DB64T(Sensor):
             error: True if a configuration is invalid, False otherwise
         """
         error = False
-        all_configs = self.generate_valid_configs_mcr()
         for param in self.modes_MCR:
-            if param[0] not in all_configs:
-                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], all_configs))
+            if not self.is_valid_config(param[0]):
+                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], self.generate_valid_configs_mcr()))
                 error = True
         return error
\ No newline at end of file
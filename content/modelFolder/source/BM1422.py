@@ -1,5 +1,4 @@
 from source.Sensor import Sensor
-import matplotlib.pyplot as plt
 import numpy as np
 from typing import List
 from source.helperFunctions import generate_active_list
@@ -14,10 +13,11 @@ MEASUREMENT_DURATION = 0.0005 #s
 
 #Magnetometer class. has code from accelerometer, doesnt work at the moment.
 class BM1422(Sensor):
+    modes_attribute = "modes_mag" # name of the modes list, see Sensor.get_modes()
+
     def __init__(self, duration, time_step, loop_rate, modelist):
         self.duration = duration
         self.time_step = time_step
-        self.time = np.arange(0, duration, time_step) #time at which to collect data
         self.loop_rate = loop_rate
         self.modes_mag = modelist
         self.active_time_params = generate_active_list(duration, self.modes_mag)
@@ -65,35 +65,8 @@ class BM1422(Sensor):
         all_configs += s_configs + [('POWER_DOWN',0,0)]
 
         return all_configs
-    
-    def run_sim(self):
-        """
-            This function will call the error_check(), get_all_modes_power(), get_all_modes_data() functions. It first checks if the params
-            for this sensor are valid and then calls the functions to get the power and data info.
-
-        Parameters
-        ----------
-            None
-
-        Returns
-        -------
-            power (numpy array)
-            data (numpy array)
-            time (numpy array)
-        """ 
-        
-        #active_times would be a list of tuples/list that would define the time at which the sensor was running
-        # i.e. [[0,1],[4,5],[6,7]] would have the sensor running from time 0s to 1s,
-        # 4s to 5s, 6s to 7s
-        error = self.error_check()
-        if error == False:
-            power = self.get_all_modes_power()
-            data = self.get_all_modes_data()
-            self.plotData(power, data, self.time, self.active_time_params)
-
-            return np.array(power), np.array(data), np.array(self.time)
-        return [], [], []
 
+    generate_valid_configs = generate_valid_configs_mag
 
     def compute_data(self, mode, sample_freq, averaging, sampling_rate):
         """
@@ -213,6 +186,82 @@ class BM1422(Sensor):
         return power
     
     
+    def _compute_power_array(self, mode, sample_freq, averaging, sampling_rate, active_current_consumption, standby_current_consumption):
+        """
+          Computes power consumption of many configurations at once for the given currents,
+          see compute_power_array() and compute_power_overest_array().
+        """
+        mode = np.asarray(mode)
+        sample_freq = np.asarray(sample_freq, dtype=float)
+        averaging = np.asarray(averaging, dtype=float)
+        sampling_rate = np.asarray(sampling_rate, dtype=float)
+
+        active_conversion_time = averaging * MEASUREMENT_DURATION
+
+        with np.errstate(divide="ignore", invalid="ignore"): # only the selected branch is kept
+            c_standby_time = np.where(active_conversion_time < 1 / sample_freq, 1 / sample_freq - active_conversion_time, 0)
+            c_current = (((active_current_consumption/1000)*active_conversion_time)+((standby_current_consumption/1000)*c_standby_time)) * sample_freq
+
+            s_standby_time = np.where(active_conversion_time < sampling_rate, sampling_rate - active_conversion_time, 0)
+            s_sampling_rate = np.where(active_conversion_time < sampling_rate, sampling_rate, active_conversion_time)
+            s_current = ((((active_current_consumption)/1000)*active_conversion_time)+(((standby_current_consumption)/1000)*s_standby_time)) / (s_sampling_rate)
+
+        current = np.select(
+            [mode == "CONTINUOUS", mode == "SINGLE", mode == "POWER_DOWN"],
+            [c_current, s_current, standby_current_consumption / 1000],
+            default=0,
+        )
+        return current * (VOLTAGE * 1000)
+
+    def compute_power_array(self, mode, sample_freq, averaging, sampling_rate):
+        """
+          Computes power consumption of many configurations at once. Same formulas as compute_power(),
+          evaluated with np.select, so the results are identical to the scalar path.
+
+          Parameters
+          ----------
+            mode: array of strings representing modes of BM1 sensor
+            sample_freq: array of floats representing how often samples are taken (for CONTINUOUS)
+            averaging: array of ints representing how many samples are averaged together for a outputted data sample
+            sampling_rate: array of floats representing the time between samples being requested
+
+          Returns
+          -------
+            power: numpy array of power in mW, broadcast over the arguments
+        """
+        return BM1422._compute_power_array(self, mode, sample_freq, averaging, sampling_rate, ACTIVE_CURRENT, STANDBY_CURRENT)
+
+    def compute_power_overest_array(self, mode, sample_freq, averaging, sampling_rate):
+        """
+          Computes overestimated power consumption of many configurations at once, see compute_power_overest().
+
+          Parameters
+          ----------
+            mode, sample_freq, averaging, sampling_rate: arrays, see compute_power_array()
+
+          Returns
+          -------
+            power: numpy array of power in mW, broadcast over the arguments
+        """
+        return BM1422._compute_power_array(self, mode, sample_freq, averaging, sampling_rate, ACTIVE_CURRENT_OVER, STANDBY_CURRENT_OVER)
+
+    def compute_data_array(self, mode, sampling_rate):
+        """
+          Computes data usage of many configurations at once, see compute_data().
+
+          Parameters
+          ----------
+            mode: array of strings representing modes of BM1 sensor
+            sampling_rate: array of floats representing the number of seconds between samples
+
+          Returns
+          -------
+            data: numpy array of bytes used in 1 second
+        """
+        mode = np.asarray(mode)
+        with np.errstate(divide="ignore"):
+            return np.where(mode == "POWER_DOWN", 0.0, READ_BYTES / np.asarray(sampling_rate, dtype=float))
+
     def error_check(self):
         """
           Checks if the configurations contained within self.modes_mag are valid
@@ -226,51 +275,50 @@ class BM1422(Sensor):
             error: True if a configuration is invalid, False otherwise
         """
         error = False
-        all_configs = self.generate_valid_configs_mag()
         for param in self.modes_mag:
-            if param[0] not in all_configs:
-                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], all_configs))
+            if not self.is_valid_config(param[0]):
+                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], self.generate_valid_configs_mag()))
                 error = True
         return error
     
-    def get_all_modes_power(self):
+    def get_segment_rates(self, times):
         """
-          Computes the power consumption of all modes in modes_mag
+          Computes the power consumption and data usage of one active period of active_time_params
 
           Parameters
           ----------
-            None
+            times: tuple (start, end, configuration, sampling_rate)
 
           Returns
           -------
-            power_arr: list of all computed power consumptions
-        """    
-        length = len(self.time)
-        power_arr = [0] * length # creating corresponding power array to time intervals, default values
-
-        for times in self.active_time_params: # check if the given start and end time is a valid value in the time array and round to nearest value 
-            start_index = int(times[0] / self.time_step) # getting index of the closest value to active times 
-            end_index = int(times[1] / self.time_step)
-
-            if start_index < 0 or end_index > len(self.time): # not valid time
-                print("Error. Index not valid.")
-                return
+            power: Float representing overestimated power in mW
+            data: number of bytes used in 1 second
+        """
+        mode, sample_freq, num_averages = times[2]
+        sampling_rate = times[3]
 
-            params = times[2]
-            power = 0
-            mode, sample_freq, num_averages = params
-            sampling_rate = times[3]
+        power = self.compute_power_overest(mode, sample_freq, num_averages, sampling_rate)
+        data = self.compute_data(mode, sample_freq, num_averages, sampling_rate)
+        return power, data
 
-            power = self.compute_power_overest(mode, sample_freq, num_averages, sampling_rate)
+    def get_all_modes_power(self):
+        """
+          Computes the power consumption of all modes in modes_mag
 
-            for i in range(start_index, end_index):
-                power_arr[i] = power
+          Parameters
+          ----------
+            None
 
+          Returns
+          -------
+            power_arr: numpy array of all computed power consumptions
+        """    
+        power_arr, _ = self.compute_vectors(self.get_segment_rates)
         return power_arr
     
     def get_all_modes_data(self):
         """
-          Computes the data usage of all modes in modes_tmp
+          Computes the data usage of all modes in modes_mag
 
           Parameters
           ----------
@@ -278,23 +326,7 @@ class BM1422(Sensor):
 
           Returns
           -------
-            data_arr: list of all computed data usages
+            data_arr: numpy array of all computed data usages
         """    
-        length = len(self.time)
-        data_arr = [0] * length # creating corresponding power array to time intervals, default values 
-        data_accumulated = 0
-        
-        for times in self.active_time_params: # for each active period
-            start_index = int(times[0] / self.time_step) 
-            end_index = int(times[1] / self.time_step)
-            params = times[2]
-            mode, sample_freq, num_averages = params
-            sampling_rate = times[3]
-            data_per_second = self.compute_data(mode, sample_freq, num_averages, sampling_rate)
-
-            for i in range(start_index, length):
-                if i < end_index:
-                    data_accumulated += data_per_second
-                data_arr[i] = data_accumulated 
-                
+        _, data_arr = self.compute_vectors(self.get_segment_rates)
         return data_arr
\ No newline at end of file
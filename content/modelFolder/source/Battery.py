@@ -0,0 +1,106 @@
+import numpy as np
+from source.helperFunctions import clamped_cumsum, mask_intervals
+
+class Battery():
+    """
+    Energy storage of the LunaSat. Integrates the solar power minus the load over the mission, so a surplus
+    during the lunar day can carry the LunaSat through times the panel cannot, unlike
+    SM111K.plot_power_and_times_possible(), which only compares the instantaneous power.
+
+    Usage Example:
+    lunasat = LunaSatSystem(duration=709*3600, time_step=30, modes_tmp=modes_TMP, modes_mcr=modes_MCR, latitude=45)
+    battery = Battery(capacity=500, floor=0.2)
+    result = battery.simulate_system(lunasat)
+    print(result["brownouts"], result["energy_wasted"])
+
+    args:
+        capacity (float): energy [mWh] the battery holds when full
+        charge_efficiency (float): fraction of the surplus power that is stored
+        discharge_efficiency (float): fraction of the energy taken from the battery that reaches the load
+        floor (float): lowest state of charge (fraction of capacity) the battery may be discharged to
+        ceiling (float): highest state of charge (fraction of capacity) the battery is charged to
+        initial_charge (float): state of charge (fraction of capacity) at the start, defaults to ceiling
+    """
+    def __init__(self, capacity, charge_efficiency=0.95, discharge_efficiency=0.95, floor=0.0, ceiling=1.0, initial_charge=None):
+        if not 0 <= floor <= ceiling <= 1:
+            raise ValueError("Error. floor and ceiling have to satisfy 0 <= floor <= ceiling <= 1.")
+        self.capacity = capacity
+        self.charge_efficiency = charge_efficiency
+        self.discharge_efficiency = discharge_efficiency
+        self.floor = floor
+        self.ceiling = ceiling
+        self.initial_charge = ceiling if initial_charge is None else min(max(initial_charge, floor), ceiling)
+
+    def simulate(self, time, solar_power, load_power, time_step=None) -> dict:
+        """
+        Runs the battery over a run with the prefix scan of helperFunctions.clamped_cumsum().
+        Each sample holds its power for one time_step, like the sensor models.
+
+        args:
+            time (numpy array): times [s] of the samples, e.g. result["time"] of LunaSatSystem.simulate()
+            solar_power (numpy array or float): power [mW] produced at each time
+            load_power (numpy array or float): power [mW] consumed at each time
+            time_step (float): seconds between samples, defaults to the spacing of time
+        returns:
+            dict with
+                time [s],
+                state_of_charge: fraction of capacity after each sample,
+                energy [mWh]: energy stored after each sample,
+                brownout: boolean array, True where the battery is at its floor and cannot supply the load,
+                brownouts: (number of brown-outs, 2) array of the (start, end) times [s] of the brown-outs,
+                energy_wasted [mWh]: solar energy that could not be stored because the battery was full,
+                energy_unmet [mWh]: load energy that could not be supplied during brown-outs
+        """
+        time = np.asarray(time, dtype=float)
+        if time_step is None:
+            time_step = time[1] - time[0] if len(time) > 1 else 1
+        net_power = np.broadcast_to(np.asarray(solar_power, dtype=float) - np.asarray(load_power, dtype=float), time.shape)
+        # mW over one time step to mWh in or out of the battery
+        deltas = np.where(net_power > 0, net_power * self.charge_efficiency, net_power / self.discharge_efficiency) * time_step / 3600
+
+        lower = self.floor * self.capacity
+        upper = self.ceiling * self.capacity
+        initial = self.initial_charge * self.capacity
+        energy = clamped_cumsum(deltas, initial, lower, upper)
+
+        unclamped = np.concatenate(([initial], energy[:-1])) + deltas
+        wasted = np.maximum(unclamped - upper, 0)
+        unmet = np.maximum(lower - unclamped, 0)
+        brownout = unmet > 0
+        return {
+            "time": time,
+            "state_of_charge": energy / self.capacity if self.capacity > 0 else np.zeros(len(energy)),
+            "energy": energy,
+            "brownout": brownout,
+            "brownouts": mask_intervals(brownout, time, time_step),
+            "energy_wasted": float(wasted.sum()) / self.charge_efficiency,
+            "energy_unmet": float(unmet.sum()) * self.discharge_efficiency,
+        }
+
+    def simulate_system(self, lunasat, total="total") -> dict:
+        """
+        Runs the battery against the solar panel and the combined load of a LunaSatSystem.
+
+        args:
+            lunasat (LunaSatSystem): system with a latitude, so it includes the SM111K solar panel
+            total (str): load to supply, "total" or "rf_total"
+        returns:
+            dict of simulate(), None if the modes of a component are invalid
+        """
+        if lunasat.solar_panel is None:
+            raise ValueError("Error. The LunaSatSystem needs a latitude to simulate the solar panel.")
+        result = lunasat.simulate()
+        if result is None:
+            return None
+        return self.simulate(result["time"], result["solar_power"], result[total + "_power"], lunasat.time_step)
+
+    def plot_state_of_charge(self, result) -> None:
+        """
+        Plots the state of charge of simulate() and shades the brown-outs. See plotFunctions.plot_state_of_charge(),
+        matplotlib is only imported here.
+
+        args:
+            result (dict): returned by simulate() or simulate_system()
+        """
+        from source.plotFunctions import plot_state_of_charge
+        plot_state_of_charge(result["time"], result["state_of_charge"], result["brownout"], self.floor, self.ceiling)
@@ -1,12 +1,12 @@
 from source.Sensor import Sensor
-import matplotlib.pyplot as plt
 import numpy as np
 from typing import List
 from source.helperFunctions import generate_active_list
-import math
 #class for the capacative sensor. wont have too much functionality since 
 #we only know of its data usage. However, the basis for a power module will be provided when that is known
 class CAP11NA(Sensor):
+    modes_attribute = "modelist" # name of the modes list, see Sensor.get_modes()
+
     def __init__(self, time_step, duration, modelist, loop_rate):
         """
         Initilize object class
@@ -17,66 +17,36 @@ class CAP11NA(Sensor):
         self.duration = duration
         self.active_time_params = generate_active_list(duration, modelist)
         self.loop_rate = loop_rate
-        self.time = np.arange(0,self.duration,self.time_step)
         self.modelist = modelist
         
-    def error_check(self,modelist):
+    def generate_valid_configs_cap(self):
+        """
+        Returns list of all valid CAP11NA configurations.
+        """
+        return [("CAP_ON"), ("CAP_OFF")]
+
+    generate_valid_configs = generate_valid_configs_cap
+
+    def error_check(self,modelist=None):
+        if modelist is None:
+            modelist = self.modelist
         error = False
         for item in modelist:
-            if item[0] != "CAP_ON" and item[0] != "CAP_OFF":
+            if not self.is_valid_config(item[0]):
                 print("Error. Invalid configuration {}. Valid m to choose from: [\"CAP_ON\",\"CAP_OFF\"]")
                 error = True
-            else:
-                error = False
         return error
     
-    def run_sim(self) -> int:
+    def get_segment_rates(self, times):
         """
-        Returns time, power, data vectors and plot.
+        Returns power and bytes per second of one active period.
 
         args:
-            none
+            times (start, end, mode, sampling rate) from active_time_params
         returns:
-            time, power, data. plots and all vectors used in plotting
+            power in mW and bytes per second.
         """
-        self.error_check(self.modelist)
-        time_index = []
-        Power = []
-        Data = []
-        Power_sec = []
-        Data_sec = []
-        time = 0
-        i=0
-        k = int(self.duration / self.time_step)
-        time_index.append(0)
-        #initialized parameters
-        
-        for item in self.modelist: #Create vectors for each configuration that say how much power and data they use
-            i +=1
-            time += item[1]* (1/self.time_step)
-            time_index.append(time)
-            power_sec = (self.get_Power_per_sec(item[0],item[2])*np.ones(int(time_index[i]-time_index[i-1])))
-            data_sec = (self.get_Bytes_per_sec(item[0],item[2])*np.ones(int(time_index[i]-time_index[i-1])))
-            Power_sec.append(power_sec)
-            Data_sec.append(data_sec)
-            
-        Power_per_run = np.concatenate(Power_sec)
-        Data_per_run = np.concatenate(Data_sec)
-        runs = math.ceil(self.duration /(time_index[-1]*self.time_step))
-        
-        for ii in np.arange(0,runs,1):#Create vectors that copy the run power and data for the entire timeframe
-            Power.append(Power_per_run)
-            Data.append(Data_per_run)
-            
-        Power = (np.concatenate(Power))
-        Data = (np.concatenate(Data))
-        
-        Power_Vec = Power[0:k+1]
-        Time_Vec = np.arange(0,self.duration,self.time_step)
-        Data_Vec = np.cumsum(Data[0:k+1])
-
-        self.plotData(Power_Vec, Data_Vec, Time_Vec, self.active_time_params)
-        return Power_Vec,Data_Vec,Time_Vec
+        return self.get_Power_per_sec(times[2], times[3]), self.get_Bytes_per_sec(times[2], times[3])
     
     def get_Power_per_sec(self, mode, sampling_rate):
         """
@@ -118,4 +88,35 @@ class CAP11NA(Sensor):
             return 0
         else:
             print("Error. Invalid configuration.")
-            return -1
\ No newline at end of file
+            return -1
+
+    def get_Power_per_sec_array(self, mode, sampling_rate):
+        """
+        Returns estimated power usage of many configurations at once, see get_Power_per_sec().
+
+        args:
+            mode: array of modes, sampling_rate: array of seconds between samples
+        returns:
+            numpy array of mW, -1 for invalid modes.
+        """
+        mode = np.asarray(mode)
+        cap_estimated_power_usage = 1 # mW
+        cap_estimated_sample_time = 0.005 # s
+        with np.errstate(divide="ignore"):
+            on_power = cap_estimated_power_usage * (1 - (1/np.asarray(sampling_rate, dtype=float) * cap_estimated_sample_time))
+        return np.select([mode == "CAP_ON", mode == "CAP_OFF"], [on_power, 0.0], default=-1)
+
+    def get_Bytes_per_sec_array(self, mode, sampling_rate):
+        """
+        Returns number of bytes per second of many configurations at once, see get_Bytes_per_sec().
+
+        args:
+            mode: array of modes, sampling_rate: array of seconds between samples
+        returns:
+            numpy array of bytes per second, -1 for invalid modes.
+        """
+        mode = np.asarray(mode)
+        cap_bytes_per_second = 6
+        with np.errstate(divide="ignore"):
+            on_data = (cap_bytes_per_second) * (1/np.asarray(sampling_rate, dtype=float))
+        return np.select([mode == "CAP_ON", mode == "CAP_OFF"], [on_data, 0.0], default=-1)
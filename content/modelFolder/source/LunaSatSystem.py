@@ -0,0 +1,315 @@
+import os
+import numpy as np
+from source.TMP117 import TMP117
+from source.BM1422 import BM1422
+from source.MPU6000 import MPU6000
+from source.TPIS1S1385 import TPIS1S1385
+from source.CAP11NA import CAP11NA
+from source.AVR128DB64T import AVR128DB64T
+from source.SX1272 import SX1272
+from source.SM111K import SM111K
+from source.Trace import Trace
+from source.helperFunctions import num_samples, time_chunks, summarize_chunks, cast_vector, check_memory_budget, CHUNK_SIZE
+
+MIN_POWER = 29.7 # mW, minimum power always consumed by the LunaSat. Unavoidable.
+SENSORS = ["tmp", "mag", "acc", "tp", "cap"] # summed with the microcontroller into total_power and total_data
+
+class LunaSatSystem():
+    """
+    Simulates every component of a LunaSat on one shared timebase, in place of adding up the
+    vectors of each notebook by hand as in "2.0 Combined PDM". Components without modes are left out.
+
+    Usage Example:
+    lunasat = LunaSatSystem(duration=600, time_step=1, modes_tmp=modes_TMP, modes_acc=modes_ACC, modes_mcr=modes_MCR, latitude=45)
+    result = lunasat.simulate()
+    plt.plot(result["time"], result["total_power"])
+
+    For runs too long to hold in memory, e.g. a whole lunar day at the ACC rate, simulate_chunks() yields the
+    same vectors in pieces, and summarize() and export() reduce or write them one piece at a time.
+
+    args:
+        duration (float): seconds to simulate
+        time_step (float): seconds between simulation points
+        modes_tmp, modes_mag, modes_acc, modes_tp, modes_cap, modes_mcr, modes_rf (list): modes lists
+            [(config, duration, sampling_rate), ...] of the TMP117, BM1422, MPU6000, TPIS1S1385,
+            CAP11NA, AVR128DB64T and SX1272
+        start_time_hrs (float): hours since lunar midnight at the start of the simulation, for the solar panel
+        latitude (float): latitude of the LunaSat in degrees, None to leave out the SM111K solar panel
+        add_power (float): constant power [mW] of additional components, e.g. EEPROM and LEDs
+        min_power (float): constant power [mW] always consumed by the LunaSat
+        time_steps (dict): time step of single components if it differs from time_step, e.g. {"acc": 0.01}.
+            Their output is mapped onto the shared timebase with Trace.to_grid(), conserving energy. Data
+            is accumulated once per shared step like the other components, see Trace.DataTrace.
+    """
+    def __init__(self, duration, time_step, modes_tmp=None, modes_mag=None, modes_acc=None, modes_tp=None,
+                 modes_cap=None, modes_mcr=None, modes_rf=None, start_time_hrs=0, latitude=None,
+                 add_power=0, min_power=MIN_POWER, time_steps=None):
+        self.duration = duration
+        self.time_step = time_step
+        self._time = None
+        self.add_power = add_power
+        self.min_power = min_power
+        self.time_steps = {} if time_steps is None else time_steps
+        step = lambda name: self.time_steps.get(name, time_step)
+
+        self.components = {}
+        if modes_tmp is not None:
+            self.components["tmp"] = TMP117(step("tmp"), duration, modes_tmp, loop_rate=20)
+        if modes_mag is not None:
+            self.components["mag"] = BM1422(duration, step("mag"), 20, modes_mag)
+        if modes_acc is not None:
+            self.components["acc"] = MPU6000(step("acc"), duration, modes_acc, loop_rate=1000)
+        if modes_tp is not None:
+            self.components["tp"] = TPIS1S1385(step("tp"), duration, modes_tp, loop_rate=20)
+        if modes_cap is not None:
+            self.components["cap"] = CAP11NA(step("cap"), duration, modes_cap, loop_rate=20)
+        if modes_mcr is not None:
+            self.components["mcr"] = AVR128DB64T(duration=duration, time_step=step("mcr"), modes_MCR=modes_mcr, loop_rate=20)
+        if modes_rf is not None:
+            self.components["rf"] = SX1272(step("rf"), duration, modes_rf, loop_rate=20)
+
+        self.start_time = start_time_hrs
+        self.solar_panel = None
+        if latitude is not None:
+            self.solar_panel = SM111K(start_time_hrs, duration/3600, time_step, latitude)
+
+    @property
+    def time(self) -> np.array:
+        """
+        Shared time vector, np.arange(0, duration, time_step). Built on first use, simulate_chunks() does not need it.
+        """
+        if self._time is None:
+            self._time = np.arange(0, self.duration, self.time_step)
+        return self._time
+
+    def fields(self) -> list:
+        """
+        Returns the names of the vectors simulate() returns.
+        """
+        fields = ["time"]
+        for name in self.components:
+            fields += [name + "_power", name + "_data"]
+        fields += ["total_power", "total_data", "rf_total_power", "rf_total_data"]
+        if self.solar_panel is not None:
+            fields.append("solar_power")
+        return fields
+
+    def simulate_component(self, name) -> tuple:
+        """
+        Runs one component and returns its power and cumulative data vectors on the shared timebase.
+        Components with their own time step are simulated as traces and mapped with Trace.to_grid().
+
+        args:
+            name (str): component name, e.g. "tmp"
+        returns:
+            power, data numpy arrays, or empty lists if the modes are invalid
+        """
+        component = self.components[name]
+        if component.time_step == self.time_step:
+            power, data, _ = component.simulate()
+            return power, data
+        power, data, _ = component.simulate(as_trace=True)
+        if not isinstance(power, Trace):
+            return [], []
+        return power.to_grid(self.time, self.time_step), data.to_grid(self.time, self.time_step)
+
+    def output_nbytes(self, power_dtype=None, data_dtype=None) -> int:
+        """
+        Returns the number of bytes the vectors of simulate() take, without building them.
+
+        args:
+            power_dtype, data_dtype: dtypes of the power and data vectors, None for float64
+        """
+        itemsize = {"power": np.dtype(float if power_dtype is None else power_dtype).itemsize,
+                    "data": np.dtype(float if data_dtype is None else data_dtype).itemsize,
+                    "time": np.dtype(float).itemsize}
+        nbytes = sum(itemsize[field.split("_")[-1]] for field in self.fields())
+        return num_samples(self.duration, self.time_step) * nbytes
+
+    def simulate(self, power_dtype=None, data_dtype=None, memory_budget=None, chunk_size=CHUNK_SIZE):
+        """
+        Runs every component on the shared timebase. All vectors live in one preallocated block and the
+        totals are accumulated into it in place, so no temporaries of the full length are created for the sums.
+        With power_dtype or data_dtype the vectors are filled chunk by chunk from simulate_chunks() instead.
+
+        total_power / total_data are the sensors, the microcontroller, add_power and min_power, like total_power
+        in "2.0 Combined PDM". rf_total_power / rf_total_data are the microcontroller, the SX1272, add_power and
+        min_power, like rf_micro_power.
+
+        args:
+            power_dtype (numpy dtype): dtype of the power vectors, e.g. np.float32. None for float64.
+            data_dtype (numpy dtype): dtype of the cumulative data vectors, e.g. np.int64 or np.uint32 for whole
+                Bytes. None for float64.
+            memory_budget (int): bytes the vectors may take, see output_nbytes(). Above it, a ValueError is raised;
+                evaluate the run in pieces with simulate_chunks() instead.
+            chunk_size (int): number of samples per chunk when filling typed vectors
+        returns:
+            dict of numpy arrays, one per name of fields(): time [s], <component>_power [mW] and
+            <component>_data [Bytes] of each component, the totals and solar_power [mW] if a latitude was given.
+            None if the modes of a component are invalid.
+        """
+        check_memory_budget(num_samples(self.duration, self.time_step), self.output_nbytes(power_dtype, data_dtype), memory_budget)
+        if power_dtype is not None or data_dtype is not None:
+            return self._collect_chunks(chunk_size, power_dtype, data_dtype)
+
+        result = self._new_result(self.time)
+        for name, component in self.components.items():
+            power, data = self.simulate_component(name)
+            if len(power) != len(self.time):
+                print("Error. The modes of the " + type(component).__name__ + " are invalid.")
+                return None
+            self._add_component(result, name, power, data)
+
+        if self.solar_panel is not None:
+            result["solar_power"][:] = self.solar_panel.power_at(self.start_time + self.time/3600)
+        return result
+
+    def _collect_chunks(self, chunk_size, power_dtype, data_dtype) -> dict:
+        """
+        Returns the dict of simulate() with typed vectors, filled from simulate_chunks() so no float64 vector of
+        the whole run is created next to them. None if the modes of a component are invalid.
+        """
+        length = num_samples(self.duration, self.time_step)
+        result = {field: np.empty(length, dtype=self._field_dtype(field, power_dtype, data_dtype)) for field in self.fields()}
+        start = 0
+        for chunk in self.simulate_chunks(chunk_size, power_dtype, data_dtype):
+            size = len(chunk["time"])
+            for field, vector in chunk.items():
+                result[field][start:start + size] = vector
+            start += size
+        if start != length:
+            return None
+        return result
+
+    @staticmethod
+    def _field_dtype(field, power_dtype, data_dtype):
+        if field.endswith("_power") and power_dtype is not None:
+            return power_dtype
+        if field.endswith("_data") and data_dtype is not None:
+            return data_dtype
+        return float
+
+    def _new_result(self, time) -> dict:
+        """
+        Returns the dict of simulate() for time, all vectors in one preallocated block and the constant power
+        already in the totals.
+        """
+        fields = self.fields()
+        block = np.zeros((len(fields), len(time)))
+        result = dict(zip(fields, block))
+        result["time"][:] = time
+
+        constant_power = self.min_power + self.add_power
+        result["total_power"][:] = constant_power
+        result["rf_total_power"][:] = constant_power
+        return result
+
+    def _add_component(self, result, name, power, data):
+        """
+        Writes the vectors of one component into result and adds them to its totals in place.
+        """
+        result[name + "_power"][:] = power
+        result[name + "_data"][:] = data
+        totals = []
+        if name in SENSORS or name == "mcr":
+            totals.append("total")
+        if name == "rf" or name == "mcr":
+            totals.append("rf_total")
+        for total in totals:
+            np.add(result[total + "_power"], power, out=result[total + "_power"])
+            np.add(result[total + "_data"], data, out=result[total + "_data"])
+
+    def simulate_chunks(self, chunk_size=CHUNK_SIZE, power_dtype=None, data_dtype=None):
+        """
+        Yields the result of simulate() in consecutive chunks of chunk_size samples, so memory is bounded by the
+        chunk size instead of growing with duration / time_step. Every component is simulated once as segment
+        traces, each chunk is evaluated from the traces and the cumulative data of each component is carried from
+        chunk to chunk. Concatenating the chunks gives the vectors of simulate().
+
+        Usage Example:
+        for chunk in lunasat.simulate_chunks(10**6):
+            peak_power = max(peak_power, chunk["total_power"].max())
+
+        args:
+            chunk_size (int): number of samples per chunk
+            power_dtype, data_dtype: dtypes of the power and data chunks, see simulate()
+        yields:
+            dict of numpy arrays of at most chunk_size samples, one per name of fields(). Nothing if the modes of
+            a component are invalid.
+        """
+        traces = {}
+        for name, component in self.components.items():
+            if component.validate_modes():
+                print("Error. The modes of the " + type(component).__name__ + " are invalid.")
+                return
+            # not simulate(as_trace=True), it also returns the full time vector of the component
+            power, data = component.compute_traces(component.get_segment_rates)
+            traces[name] = (power, data, component.time_step == self.time_step)
+
+        total_data = dict.fromkeys(self.components, 0.0)
+        # all chunks but the last hold one extra time, the end of their last step for Trace.average()
+        for edges in time_chunks(self.duration, self.time_step, chunk_size, extend=True):
+            time = edges[:chunk_size]
+            result = self._new_result(time)
+            for name, (power_trace, data_trace, same_step) in traces.items():
+                if same_step:
+                    power = power_trace.resample(time)
+                    rate = data_trace.resample(time)
+                else: # like Trace.to_grid() in simulate_component()
+                    power = power_trace.average(edges, self.time_step)[:len(time)]
+                    rate = data_trace.average(edges, self.time_step)[:len(time)]
+                rate[0] += total_data[name] # continues the running sum instead of adding an offset afterwards
+                data = np.cumsum(rate)
+                total_data[name] = data[-1]
+                self._add_component(result, name, power, data)
+
+            if self.solar_panel is not None:
+                result["solar_power"][:] = self.solar_panel.power_at(self.start_time + time/3600)
+            if power_dtype is not None or data_dtype is not None:
+                result = {field: cast_vector(vector, self._field_dtype(field, power_dtype, data_dtype)) for field, vector in result.items()}
+            yield result
+
+    def summarize(self, chunk_size=CHUNK_SIZE, datarate_limit=None, total="total") -> dict:
+        """
+        Streams the run with simulate_chunks() and reduces one of its power and data pairs to energy, average and
+        peak power, total data and optionally datarate limit violations, see helperFunctions.summarize_chunks().
+
+        args:
+            chunk_size (int): number of samples per chunk
+            datarate_limit (float): Bytes per second that can be stored, None to skip the check
+            total (str): "total", "rf_total" or a component name, e.g. "acc"
+        returns:
+            dict of the reductions, None if the modes of a component are invalid
+        """
+        chunks = ((chunk[total + "_power"], chunk[total + "_data"], chunk["time"]) for chunk in self.simulate_chunks(chunk_size))
+        summary = summarize_chunks(chunks, self.time_step, datarate_limit)
+        if summary["samples"] != num_samples(self.duration, self.time_step):
+            return None
+        return summary
+
+    def export(self, file_name, chunk_size=CHUNK_SIZE, fields=None) -> int:
+        """
+        Streams the run with simulate_chunks() into a .npy file of shape (samples, len(fields)), one row per time
+        and one column per field, written chunk by chunk. Read it back with np.load(file_name, mmap_mode="r").
+
+        args:
+            file_name (str): path of the .npy file
+            chunk_size (int): number of samples per chunk
+            fields (list): names of fields() to write, defaults to all of them
+        returns:
+            number of samples written, 0 if the modes of a component are invalid
+        """
+        if fields is None:
+            fields = self.fields()
+        length = num_samples(self.duration, self.time_step)
+        header = {"descr": np.lib.format.dtype_to_descr(np.dtype(float)), "fortran_order": False, "shape": (length, len(fields))}
+        written = 0
+        with open(file_name, "wb") as f:
+            np.lib.format.write_array_header_1_0(f, header)
+            for chunk in self.simulate_chunks(chunk_size):
+                f.write(np.column_stack([chunk[field] for field in fields]).tobytes())
+                written += len(chunk["time"])
+        if written != length: # invalid modes, the header does not match the data
+            os.remove(file_name)
+            return 0
+        return written
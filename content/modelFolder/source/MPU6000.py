@@ -6,6 +6,8 @@ from source.helperFunctions import generate_active_list
 VOLTAGE = 3.3 #Volts
 
 class MPU6000(Sensor):
+    modes_attribute = "modes_mpu" # name of the modes list, see Sensor.get_modes()
+
     def __init__ (self, time_step, duration, modes_mpu, loop_rate):
         self.time_step = time_step
         self.duration = duration
@@ -13,7 +15,6 @@ class MPU6000(Sensor):
         self.active_time_params = generate_active_list(duration, modes_mpu)
         self.modes_mpu = modes_mpu
         self.loop_rate = loop_rate
-        self.time = np.arange(0,self.duration,self.time_step)
 
     def generate_valid_configs_acc(self):
         low_power_wakeup = [0, 1.25, 5, 20, 40]
@@ -47,6 +48,9 @@ class MPU6000(Sensor):
         accelerometer_gyroscope_dmp_config = [("ACCELEROMETER_AND_GYROSCOPE_DMP",0, dlp, srd) for dlp in dlp_options_trunc for srd in range(256)]
         all_configs += accelerometer_config + gyroscope_config + gyroscope_dmp_config + accelerometer_gyroscope_config +accelerometer_gyroscope_dmp_config + [('SHUTDOWN',0,"000", srd) for srd in range(256)]
         return all_configs
+
+    generate_valid_configs = generate_valid_configs_acc
+
     def error_check(self):
         """
           Checks if the configurations contained within self.modes_tp are valid
@@ -60,10 +64,9 @@ class MPU6000(Sensor):
             error: True if a configuration is invalid, False otherwise
         """
         error = False
-        all_configs = self.generate_valid_configs_acc()
         for param in self.modes_mpu:
-            if param[0] not in all_configs:
-                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], all_configs))
+            if not self.is_valid_config(param[0]):
+                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], self.generate_valid_configs_acc()))
                 error = True
         return error
     
@@ -146,56 +149,120 @@ class MPU6000(Sensor):
             power = 0
         return power
         
-    def run_sim(self) :
+    def get_mode_power_array(self, mode, low_power_wakeup, digital_low_pass, sample_rate_divisor, sampling_rate):
         """
-          Checks if modes are valid before coputer the power and data usage of given configurations in modes_mpu. Plots results.
+          Calculates power of many configurations at once. Same formulas as get_mode_power(),
+          evaluated with np.select, so the results are identical to the scalar path.
 
           Parameters
           ----------
-            None
+            mode: array of strings representing modes of MPU6000 sensor
+            low_power_wakeup: array of floats representing how fast the sensor wakes up when in low power mode
+            digital_low_pass: array of 3 bit strings
+            sample_rate_divisor: array of ints
+            sampling_rate: array of floats representing the time between samples
 
           Returns
           -------
-            Lists of power consumptions, data usages, and times. Empty lists if at least one mode is invalid
-        """   
-        error = self.error_check()
-        if error == False:
-            power = self.get_all_modes_power()
-            data = self.get_all_modes_data()
-            self.plotData(power, data, self.time, self.active_time_params)
-            return np.array(power), np.array(data), np.array(self.time)
-        return [], [], []
-        
-    def get_all_modes_power(self):
+            numpy array of power in mW, broadcast over the arguments
         """
-          Computes the power consumption of all modes in modes_mpu
+        mode = np.asarray(mode)
+        low_power_wakeup = np.asarray(low_power_wakeup, dtype=float)
+        digital_low_pass = np.asarray(digital_low_pass)
+        sample_rate_divisor = np.asarray(sample_rate_divisor, dtype=float)
+        sampling_rate = np.asarray(sampling_rate, dtype=float)
+
+        fast_low_pass = (digital_low_pass == "000") | (digital_low_pass == "111")
+        gyroscope_output_rate = np.where(fast_low_pass, 8000, 1000)
+        active_conversion_time = 1/((gyroscope_output_rate*1000) / (1 + sample_rate_divisor))
+        active_conversion_time *= 1000 # overestimation
+        fast_enough = active_conversion_time < sampling_rate
+        accelerometer_ok = fast_enough & ~fast_low_pass # accelerometer modes do not exist for 000 and 111
+
+        low_power = np.select(
+            [low_power_wakeup == 1.25, low_power_wakeup == 5, low_power_wakeup == 20, low_power_wakeup == 40],
+            [((10*VOLTAGE)/1000), ((20*VOLTAGE)/1000), ((70*VOLTAGE)/1000), ((140*VOLTAGE)/1000)],
+            default=0,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"): # only the selected branch is kept
+            power = np.select(
+                [
+                    (mode == "ACCELEROMETER_LOW_POWER") & accelerometer_ok,
+                    (mode == "ACCELEROMETER_AND_GYROSCOPE") & accelerometer_ok,
+                    (mode == "ACCELEROMETER") & accelerometer_ok,
+                    (mode == "GYROSCOPE") & fast_enough,
+                    (mode == "ACCELEROMETER_AND_GYROSCOPE_DMP") & accelerometer_ok,
+                    (mode == "GYROSCOPE_DMP") & fast_enough,
+                ],
+                [
+                    low_power/sampling_rate,
+                    ((3.8*VOLTAGE))/sampling_rate,
+                    ((500*VOLTAGE)/1000)/sampling_rate,
+                    ((3.6*VOLTAGE))/sampling_rate,
+                    ((3.9*VOLTAGE))/sampling_rate,
+                    ((3.7*VOLTAGE))/sampling_rate,
+                ],
+                default=0,
+            )
+        return power
+
+    def get_bytes_per_second_array(self, mode, sampling_rate):
+        """
+          Calculates the data of many configurations at once, see get_bytes_per_second().
 
           Parameters
           ----------
-            None
+            mode: array of strings representing modes of MPU6000 sensor
+            sampling_rate: array of floats representing the time between samples
 
           Returns
           -------
-            power_arr: list of all computed power consumptions
-        """    
-        length = len(self.time)
-        power_arr = [0] * length # creating corresponding power array to time intervals, default values
+            numpy array of bytes per second
+        """
+        mode = np.asarray(mode)
+        sampling_rate = np.asarray(sampling_rate, dtype=float)
+        with np.errstate(divide="ignore"):
+            return np.select(
+                [mode == "SHUTDOWN", (mode == "ACCELEROMETER_AND_GYROSCOPE") | (mode == "ACCELEROMETER_AND_GYROSCOPE_DMP")],
+                [0.0, (12+4)/sampling_rate],
+                default=(6+4)/sampling_rate,
+            )
 
-        for times in self.active_time_params: # check if the given start and end time is a valid value in the time array and round to nearest value 
-            start_index = int(times[0] / self.time_step) # getting index of the closest value to active times 
-            end_index = int(times[1] / self.time_step)
+    def get_segment_rates(self, times):
+        """
+          Computes the power consumption and data usage of one active period of active_time_params
 
-            if start_index < 0 or end_index > len(self.time): # not valid time
-                print("Error. Index not valid.")
-                return
-            params = times[2]
-            mode, low_power_wakeup, digital_low_pass, sample_rate_divisor = params
-            power = self.get_mode_power(mode, low_power_wakeup, digital_low_pass,sample_rate_divisor, times[3])
+          Parameters
+          ----------
+            times: tuple (start, end, configuration, sampling_rate)
 
-            for i in range(start_index, end_index):
-                power_arr[i] = power
+          Returns
+          -------
+            power: Float representing power in mW
+            data: number of bytes used in 1 second
+        """
+        mode, low_power_wakeup, digital_low_pass, sample_rate_divisor = times[2]
+        sampling_rate = times[3]
+
+        power = self.get_mode_power(mode, low_power_wakeup, digital_low_pass, sample_rate_divisor, sampling_rate)
+        data = self.get_bytes_per_second(mode, low_power_wakeup, digital_low_pass, sample_rate_divisor, sampling_rate)
+        return power, data
+
+    def get_all_modes_power(self):
+        """
+          Computes the power consumption of all modes in modes_mpu
 
+          Parameters
+          ----------
+            None
+
+          Returns
+          -------
+            power_arr: numpy array of all computed power consumptions
+        """    
+        power_arr, _ = self.compute_vectors(self.get_segment_rates)
         return power_arr
+
     def get_all_modes_data(self):
         """
           Computes the data usage of all modes in modes_mpu
@@ -206,24 +273,9 @@ class MPU6000(Sensor):
 
           Returns
           -------
-            data_arr: list of all computed data usages
+            data_arr: numpy array of all computed data usages
         """    
-        length = len(self.time)
-        data_arr = [0] * length # creating corresponding power array to time intervals, default values 
-        data_accumulated = 0
-        
-        for times in self.active_time_params: # for each active period
-            start_index = int(times[0] / self.time_step) 
-            end_index = int(times[1] / self.time_step)
-            params = times[2]
-            mode, low_power_wakeup, digital_low_pass, sampling_rate_divisor = params
-            data_per_second = self.get_bytes_per_second(mode, low_power_wakeup, digital_low_pass, sampling_rate_divisor, times[3])
-
-            for i in range(start_index, length):
-                if i < end_index:
-                    data_accumulated += data_per_second
-                data_arr[i] = data_accumulated 
-                
+        _, data_arr = self.compute_vectors(self.get_segment_rates)
         return data_arr
 
 
@@ -241,15 +293,13 @@ class MPU6000(Sensor):
           -------
             The measure rate and how much data is being collected in Bytes
         """
-        error = self.error_check()
-        if error == False:
-            if mode == "SHUTDOWN" :
-                return 0
-                          
-            if mode == "ACCELEROMETER_AND_GYROSCOPE" or mode == "ACCELEROMETER_AND_GYROSCOPE_DMP":
-                return (12+4)/sampling_rate
-            else:
-                return (6+4)/sampling_rate
+        if mode == "SHUTDOWN" :
+            return 0
+                      
+        if mode == "ACCELEROMETER_AND_GYROSCOPE" or mode == "ACCELEROMETER_AND_GYROSCOPE_DMP":
+            return (12+4)/sampling_rate
+        else:
+            return (6+4)/sampling_rate
 
 
 """
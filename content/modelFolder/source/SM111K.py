@@ -8,12 +8,25 @@
     solar_panel_model = SM141K(start_time_hrs=0, duration_hrs=709, time_step_seconds=30, latitude=45)
     solar_panel_model.Available() #plots power produced throughout a lunar day
     plt.show() #needed if outside of jupyter notebook
+
+    model() keeps the power traces it computed in an LRU cache keyed by (latitude, start, end, step),
+    so repeated feasibility checks with the same panel are served without recomputing them. The cache holds
+    at most SM111K.cache_bytes of traces, and traces larger than SM111K.cache_entry_bytes are not cached.
+    Set SM111K.cache_dir to a folder to also keep them on disk as .npy files between sessions.
 """
+import hashlib
+import os
+from collections import OrderedDict
 import numpy as np
-from matplotlib import pyplot as plt
-import sys as sys
+from source.Trace import Trace
+from source.helperFunctions import mask_runs, mask_intervals
 
 class SM111K():
+    cache_bytes = 64 * 2**20 # total size of the power traces kept in memory by model()
+    cache_entry_bytes = 16 * 2**20 # larger traces, e.g. latitude x time grids, are computed but not cached
+    cache_dir = None # folder of the on-disk .npy layer of the cache, None to keep the traces in memory only
+    _cache = OrderedDict() # shared by all panels, the traces only depend on the key
+
     def __init__(self, start_time_hrs, duration_hrs, time_step_seconds, latitude):
 
         self.start_time         = start_time_hrs
@@ -32,14 +45,14 @@ class SM111K():
     # No effect on irradiance by moons atmosphere - atmosphere is practically non existant
     # No irradiance on the dark side - if there was any it would be EXTREMELY small
 
-    def power(self, psi:float ) -> float:
+    def power(self, psi):
         """
         Returns power produced by solar panel
 
         args:
-            psi (float): angle [rad] of incidience of solar panel to Sun
+            psi (float or numpy array): angle [rad] of incidience of solar panel to Sun
         returns:
-            power (float): power in milliwatts of power produced by solar panels
+            power (float or numpy array): power in milliwatts of power produced by solar panels
         """
         SOLAR_CONSTANT = 1360 # W/m^2
         SURFACE_AREA = .00072 #m^2
@@ -48,13 +61,7 @@ class SM111K():
 
         power = np.cos(psi) * SOLAR_CONSTANT * SURFACE_AREA * CELL_EFFICIENCY * 1000
 
-        if power>MAX_POWER_OUT:
-            power=MAX_POWER_OUT
-            
-        if power < 0:
-            power = 0
-
-        return power
+        return np.clip(power, 0, MAX_POWER_OUT)
 
     # Analytical Equation for the Dayside Temperature (from Hurley et al, 2015)
     def temp(self, psi: float) -> float:
@@ -72,26 +79,23 @@ class SM111K():
     def psi(self, lat, time):
         """
         Returns the angle of the lunar surface . Solar
-        panel facing directly toward the sun corresponds to psi = 0 rad
+        panel facing directly toward the sun corresponds to psi = 0 rad.
+        lat and time may be numpy arrays, they are broadcast against each other.
 
         args:
-            lat (float): latitude [degrees] on Lunar surface from (-90,90)
-            time (float): time [hrs] since Lunar midnight
+            lat (float or numpy array): latitude [degrees] on Lunar surface from (-90,90)
+            time (float or numpy array): time [hrs] since Lunar midnight
         returns:
-            psi (float): angle [rad] of Lunar surface with respect to sun.
+            psi (float or numpy array): angle [rad] of Lunar surface with respect to sun.
+                NaN for times outside of the dayside (before sunrise or after sunset).
         """
 
         # Bounds check latitude
-        if (abs(lat)>90):
-            sys.exit('Error. Latitude should be less than 90 degrees!')
-        else:
-            pass
+        if np.any(np.abs(lat)>90):
+            raise ValueError('Error. Latitude should be less than 90 degrees!')
 
-        # Bounds check time
-        if ((time < self.lunar_dawn) or (time > self.lunar_dusk)):
-            sys.exit(f"Error. Time should be between sunrise({self.lunar_dawn} hrs) and sunset({self.lunar_dusk} hrs)  for the dayside!")
-        else:
-            pass
+        time = np.asarray(time, dtype=float)
+        night = (time < self.lunar_dawn) | (time > self.lunar_dusk)
 
         time_angle_midnight = ((time/self.lunar_day_length)*(2*np.pi))%(2*np.pi)
 
@@ -101,82 +105,241 @@ class SM111K():
         # +z - out of the page (from the moon to the sun)
         # +y - from right to left in the page
         # +x - from bottom to top, in the page
+        #
+        # The initial position vector r = [0,0,1] is rotated about the y-axis by the latitude,
+        # r1 = [sin(lat), 0, cos(lat)], and then about the +x axis by the angle from noon,
+        # r2 = [sin(lat), -sin(noon)*cos(lat), cos(noon)*cos(lat)].
+        # Since we used unit vectors, psi is the cosine inverse of the dot product r . r2,
+        # which is the z component of r2.
 
-        # Initial position vector - (x,y,z) triplet: [0,0,1]
-
-        r = np.mat(np.array([[0],[0],[1]]))
-
-        # 1. Latitudinal rotation
-
-        # Given our co-ordinate system, latitudinal rotation is a rotation about the y-axis
-        # Rotation matrix for rotation about the y-axis is:
-        # [cos(theta), 0, sin(theta); 0, 1, 0; -sin(theta), 0, cos(theta)]
+        lat_rad = (np.asarray(lat, dtype=float)*np.pi/180)
 
-        lat_rad = (lat*np.pi/180)
-
-        t11 = np.cos(lat_rad)
-        t13 = np.sin(lat_rad)
-        t31 = -t13
-        t33 = t11
+        dot_product = np.cos(time_angle_noon) * np.cos(lat_rad)
+        psi = np.arccos(dot_product)
 
-        R_y = np.mat(np.array([[t11,0,t13],[0,1,0],[t31,0,t33]]))
+        return np.where(night, np.nan, psi)
 
-        r1 = R_y*r
+    def model(self, start_time=None, end_time=None, time_step=None, latitude=None, use_cache=True):
+        """
+        Run a simulation of the solar panel power production starting at
+        start_time and going until end_time. Times are specified in hours since
+        lunar midnight. If paramters are not specified, class variable times are
+        used (specified during initialization). The whole time vector is computed
+        at once; night times are masked to 0 power. Results are cached, see the
+        module docstring. Windows longer than a lunar day are computed from one
+        lunar day with period_power() if the lunar day is a whole number of time
+        steps, so the powers are the same as power_at() either way.
 
-        # 2. Longitudinal rotation
+        args:
+            start_time (float): hours since lunar midnight of start time of model
+            end_time (float): hours of end time
+            time_step (float): hours between simulation points
+            latitude (float or array): latitude on Lunar surface in degrees from (-90,90).
+                An array of latitudes gives one row of powers per latitude.
+            use_cache (bool): False to compute the powers without looking them up in or adding them to the cache
+        returns:
+            times (numpy array): vector of times at which simulation was ran
+            powers (numpy array): vector of power produced corresponding to time
+                in times, or a (latitude x time) array if latitude is an array
+        """
 
-        # Rotate about the +x axis by the angle from noon.
-        # R_x = [1, 0, 0; 0, cos(theta), -sin(theta); 0, sin(theta), cos(theta)]
+        if start_time is None: start_time = self.start_time
+        if end_time is None: end_time = self.end_time
+        if time_step is None: time_step = self.time_step
+        if latitude is None: latitude = self.latitude
 
-        C = np.cos(time_angle_noon)
-        S = np.sin(time_angle_noon)
+        times = np.arange(start_time, end_time, time_step)
+        key = self._cache_key("model", latitude, start_time, end_time, time_step)
+        powers = self._cache_get(key) if use_cache else None
+        if powers is None:
+            if end_time - start_time > self.lunar_day_length and self.period_samples(time_step) is not None:
+                powers = self.period_power(times, time_step, latitude, use_cache)
+            else:
+                powers = self.power_at(times, latitude)
+            if not use_cache:
+                return times, powers
+            self._cache_put(key, powers)
+        return times, powers.copy() # the cached trace is not handed out, so it cannot be changed by the caller
+
+    def period_samples(self, time_step):
+        """
+        Returns the number of time steps in a lunar day, None if the lunar day is not a whole number of them.
 
-        R_x = np.mat(np.array([[1,0,0],[0,C,-S],[0,S,C]]))
-        r2 = R_x*r1
+        args:
+            time_step (float): hours between simulation points
+        """
+        samples = self.lunar_day_length / time_step
+        if abs(samples - round(samples)) > 1e-9 * samples:
+            return None
+        return int(round(samples))
 
-        # 3. Now taking the dot product, dividing by the square of the magnitudes of the vectors, and then taking cosine inverse.
-        # Since we used unit vectors, we're basically only taking the cosine inverse.
+    def period_power(self, times, time_step, latitude=None, use_cache=True):
+        """
+        Returns the power at the given times from one lunar day of power sampled every time_step, so windows
+        of several lunations only evaluate the geometry of one. The lunar day starts at the first time and the
+        samples are repeated by index, so the powers are those of power_at(). The lunar day has to be a whole
+        number of time steps, see period_samples().
 
-        dot_product = r[0,0]*r2[0,0] + r[1,0]*r2[1,0] + r[2,0]*r2[2,0]
-        psi = np.arccos(dot_product)
+        args:
+            times (numpy array): hours since lunar midnight, every time_step from the first one, e.g. of model()
+            time_step (float): hours between the times
+            latitude (float or array): latitude on Lunar surface in degrees from (-90,90),
+                defaults to the latitude specified during initialization
+            use_cache (bool): False to compute the lunar day without the cache
+        returns:
+            powers (numpy array): power [mW] at each time, or a (latitude x time) array
+                if latitude is an array
+        """
+        if latitude is None: latitude = self.latitude
+
+        samples = self.period_samples(time_step)
+        if samples is None:
+            raise ValueError("Error. The lunar day is not a whole number of time steps, use power_at().")
+        times = np.asarray(times, dtype=float)
+        if len(times) == 0:
+            return self.power_at(times, latitude)
+
+        phase = times[0] % self.lunar_day_length
+        key = self._cache_key("period", latitude, phase, self.lunar_day_length, time_step)
+        period = self._cache_get(key) if use_cache else None
+        if period is None:
+            period = self.power_at(phase + np.arange(samples) * time_step, latitude)
+            if use_cache:
+                self._cache_put(key, period)
+
+        index = np.rint((times - times[0]) / time_step).astype(np.intp) % samples
+        return period[..., index]
+
+    @staticmethod
+    def _cache_key(kind, latitude, start_time, end_time, time_step) -> tuple:
+        # times are quantized, so keys computed in different ways from the same numbers match
+        quantize = lambda value: round(float(value), 9)
+        latitude = np.asarray(latitude, dtype=float)
+        return (kind, latitude.shape, tuple(quantize(lat) for lat in latitude.ravel()),
+                quantize(start_time), quantize(end_time), quantize(time_step))
+
+    @classmethod
+    def _cache_file(cls, key) -> str:
+        return os.path.join(cls.cache_dir, "sm111k_" + hashlib.sha1(repr(key).encode()).hexdigest()[:20] + ".npy")
+
+    @classmethod
+    def _cache_get(cls, key):
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            return cls._cache[key]
+        if cls.cache_dir is not None and os.path.exists(cls._cache_file(key)):
+            powers = np.load(cls._cache_file(key))
+            cls._cache_put(key, powers, write=False)
+            return powers
+        return None
+
+    @classmethod
+    def _cache_put(cls, key, powers, write=True):
+        if powers.nbytes > cls.cache_entry_bytes:
+            return
+        cls._cache[key] = powers
+        cls._cache.move_to_end(key)
+        while sum(cached.nbytes for cached in cls._cache.values()) > cls.cache_bytes:
+            cls._cache.popitem(last=False) # least recently used
+        if write and cls.cache_dir is not None:
+            os.makedirs(cls.cache_dir, exist_ok=True)
+            np.save(cls._cache_file(key), powers)
+
+    @classmethod
+    def clear_cache(cls, disk=False):
+        """
+        Empties the power trace cache of model().
 
-        return psi
+        args:
+            disk (bool): if True, also deletes the .npy files in cache_dir
+        """
+        cls._cache.clear()
+        if disk and cls.cache_dir is not None and os.path.isdir(cls.cache_dir):
+            for file_name in os.listdir(cls.cache_dir):
+                if file_name.startswith("sm111k_") and file_name.endswith(".npy"):
+                    os.remove(os.path.join(cls.cache_dir, file_name))
 
-    def model(self, start_time=None, end_time=None, time_step=None, latitude=None):
+    def power_at(self, times, latitude=None):
         """
-        Run a simulation of the solar panel power production starting at
-        start_time and going until end_time. Times are specified in hours since
-        lunar midnight. If paramters are not specified, class variable times are
-        used (specified during initialization).
+        Returns the power produced by the solar panel at the given times, e.g. on the
+        timebase of a sensor simulation. Night times are masked to 0 power.
 
         args:
-            start_time (float): hours since lunar midnight of start time of model
-            end_time (float): hours of end time
-            time_step (float): seconds between simulation points
-            latitude (float): latitude on Lunar surface in degrees from (-90,90)
+            times (numpy array): hours since lunar midnight
+            latitude (float or array): latitude on Lunar surface in degrees from (-90,90),
+                defaults to the latitude specified during initialization
         returns:
-            times (list[float]): vector of times at which simulation was ran
-            powers (list[float]): vector of power produced corresponding to time
-                in times
+            powers (numpy array): power [mW] at each time, or a (latitude x time) array
+                if latitude is an array
         """
+        if latitude is None: latitude = self.latitude
 
-        if start_time==None: start_time = self.start_time
-        if end_time==None: end_time = self.end_time
-        if time_step==None: time_step = self.time_step
-        if latitude==None: latitude = self.latitude
+        latitude = np.asarray(latitude, dtype=float)
+        times = np.asarray(times, dtype=float)
+        lunar_times = times % self.lunar_day_length
+        day = (lunar_times >= self.lunar_dawn) & (lunar_times <= self.lunar_dusk)
 
-        times = np.arange(start_time, end_time, time_step)
-        powers = np.zeros(len(times))
+        powers = np.zeros(latitude.shape + times.shape)
+        angles = self.psi(latitude[..., np.newaxis], lunar_times[day])
+        powers[..., day] = self.power(angles)
 
-        for i in range(len(times)):
-            time = times[i]
-            time %= self.lunar_day_length
-            if time >= self.lunar_dawn and time <= self.lunar_dusk:
-                angle = self.psi(latitude, time)
-                powers[i] = self.power(angle)
+        return powers
 
+    def feasibility_map(self, load, latitudes=None):
+        """
+        Computes where the solar panel covers a load, for every latitude of a grid and every time of the
+        model() window at once. The powers of all latitudes are one broadcast (latitude x time) array, see
+        power_at(), compared against the load in one operation. The grid bypasses the cache of model(), which
+        is meant for single-latitude traces.
 
-        return times, powers
+        args:
+            load (float, numpy array or PowerTrace): power [mW] consumed. A float is a constant load, an array
+                has one value per time of model(), and a PowerTrace, e.g. simulate(as_trace=True) of a sensor,
+                is evaluated at the seconds since start_time.
+            latitudes (numpy array): latitudes [degrees] of the grid, defaults to -90 to 90 in steps of 1
+        returns:
+            dict with
+                times: hours since lunar midnight of model(),
+                latitudes: latitude of each row,
+                margin: (latitude x time) array of solar power minus load [mW],
+                feasible: (latitude x time) boolean array, True where the solar power exceeds the load,
+                feasible_hours: hours each latitude can run the load
+        """
+        if latitudes is None:
+            latitudes = np.arange(-90, 91, 1)
+        latitudes = np.asarray(latitudes, dtype=float).ravel()
+        times, powers = self.model(latitude=latitudes, use_cache=False)
+
+        if isinstance(load, Trace):
+            load = load.resample((times - self.start_time) * 3600)
+        load = np.asarray(load, dtype=float)
+        if load.ndim > 0 and load.shape != times.shape:
+            raise ValueError("Error. The load has {} values, model() has {} times.".format(len(load), len(times)))
+
+        margin = np.subtract(powers, load, out=powers) # powers is not cached, reused for the margin
+        feasible = margin > 0
+        return {
+            "times": times,
+            "latitudes": latitudes,
+            "margin": margin,
+            "feasible": feasible,
+            "feasible_hours": np.count_nonzero(feasible, axis=1) * self.time_step,
+        }
+
+    def plot_feasibility_map(self, load, latitudes=None):
+        """
+        Plots feasibility_map() as a heatmap of latitude against time.
+
+        args:
+            load (float, numpy array or PowerTrace): power [mW] consumed, see feasibility_map()
+            latitudes (numpy array): latitudes [degrees] of the grid, defaults to -90 to 90 in steps of 1
+        returns:
+            dict of feasibility_map()
+        """
+        from source.plotFunctions import plot_feasibility_map
+        feasibility = self.feasibility_map(load, latitudes)
+        plot_feasibility_map(feasibility["times"], feasibility["latitudes"], feasibility["feasible"])
+        return feasibility
 
     def plot_power_available(self):
         """
@@ -187,15 +350,9 @@ class SM111K():
         returns:
             None
         """
+        from source.plotFunctions import plot_power_available
         times,output = self.model()
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.plot(times, output, color="steelblue")
-        ax.set_title("Power Available", fontsize=20)
-        ax.set_xlabel("Time (hours)", fontsize=16)
-        ax.set_ylabel("Power (mW)", fontsize=16)
-
-        ax.grid(True, alpha=0.25)
-
+        plot_power_available(times, output)
 
     def plot_power_and_times_possible(self,max_power):
         """
@@ -207,6 +364,7 @@ class SM111K():
         returns:
             1x2 list of times that the lunasat can be run
         """
+        from source.plotFunctions import plot_power_possible
         time,power = self.model()
         multiplier = int(np.ceil(len(power) / len(max_power)))
         if(multiplier==0):
@@ -215,20 +373,15 @@ class SM111K():
         max_power = max_power[:len(power)]
         possiblePower = np.where(power>max_power,power,0)
 
-        fig, ax = plt.subplots(figsize=(8,5))
-        ax.plot(time, power, color="steelblue")
-        ax.fill_between(time, possiblePower, step="pre", alpha=0.4)
-        ax.set_title("Power Available", fontsize=20)
-        ax.set_xlabel("Time Since Lunar Midnight (Earth hours)", fontsize=16)
-        ax.set_ylabel("Power (mW)", fontsize=16)
-
-        ax.grid(True, alpha=0.25)
+        plot_power_possible(time, power, possiblePower)
 
-        timePossible = np.where(power>max_power,time,None)
-        timePossible = timePossible[timePossible!=None]
-        if(len(timePossible)==0):
+        starts, stops = mask_runs(power>max_power)
+        if(len(starts)==0):
             print("ERROR! At least one of your configurations exceeds the maximum available power.")
             return "ERROR"
         print("Configurations possible in the interval:")
-        print([min(timePossible),max(timePossible)])
+        print([time[starts[0]],time[stops[-1]-1]])
+        if(len(starts)>1):
+            print("Configurations possible in the windows (start, end hours):")
+            print(mask_intervals(power>max_power, time, self.time_step).tolist())
         return "Configurations meet power requirements"
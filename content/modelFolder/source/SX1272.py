@@ -1,6 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import random 
 from source.helperFunctions import generate_active_list
 from source.Sensor import Sensor
 
@@ -8,10 +6,11 @@ VOLTAGE = 3.3 #Volts
 MEASUREMENT_RATE = 0 #seconds
 
 class SX1272(Sensor):
+    modes_attribute = "modes_SX1" # name of the modes list, see Sensor.get_modes()
+
     def __init__(self, time_step, duration, modes_SX1, loop_rate): 
         self.time_step = time_step
         self.duration = duration
-        self.time = np.arange(0, duration, time_step) #time at which to collect data
         self.active_time_params = generate_active_list(duration, modes_SX1)
         self.loop_rate = loop_rate
         self.modes_SX1 = modes_SX1
@@ -68,7 +67,9 @@ class SX1272(Sensor):
         idle_config = [("IDLE",915,13,125,"OFF",12,6,ps) for ps in range(233)]
         all_configs += fstx_config + fsrx_config + sleep_config + standby_config + idle_config
         return all_configs
-    
+
+    generate_valid_configs = generate_valid_configs_sx1
+
     def error_check(self):
         """
           Checks if the configurations contained within self.modes_SX1 are valid
@@ -82,10 +83,9 @@ class SX1272(Sensor):
             error: True if a configuration is invalid, False otherwise
         """
         error = False
-        all_configs = self.generate_valid_configs_sx1()
         for param in self.modes_SX1:
-            if param[0] not in all_configs:
-                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], all_configs))
+            if not self.is_valid_config(param[0]):
+                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], self.generate_valid_configs_sx1()))
                 error = True
 
         return error
@@ -204,81 +204,109 @@ class SX1272(Sensor):
             data = payload_size / (-1*transmission_reception_rate)
         return data
     
-    def get_all_modes_power(self):
+    def compute_power_array(self, mode, frequency, output_power, bandwidth, lna_boost, spreading_factor, coding_rate, payload_size, transmission_reception_rate):
         """
-          Computes the power consumption of all modes in modes_SX1
+          Computes power consumption of many configurations at once. Same formulas as compute_power(),
+          evaluated with np.select, so the results are identical to the scalar path.
 
           Parameters
           ----------
-            None
+            arrays of the arguments of compute_power(), broadcast against each other
 
           Returns
           -------
-            power_arr: list of all computed power consumptions
-        """    
-        # Code here
-        length = len(self.time)
-        power_arr = [0] * length # creating corresponding power array to time intervals, default values
+            power: numpy array of power in mW
+        """
+        mode = np.asarray(mode)
+        output_power = np.asarray(output_power)
+        bandwidth = np.asarray(bandwidth)
+        lna_boost = np.asarray(lna_boost)
+        payload_size = np.asarray(payload_size, dtype=float)
+        transmission_reception_rate = np.asarray(transmission_reception_rate, dtype=float)
 
-        for times in self.active_time_params: # check if the given start and end time is a valid value in the time array and round to nearest value 
-            start_index = int(times[0] / self.time_step) # getting index of the closest value to active times 
-            end_index = int(times[1] / self.time_step)
+        active_time_period = payload_size*8/4800
+        standby_time = 1 - active_time_period #an estimate
+        standby_power = (standby_time * ((1.5*VOLTAGE)/1000))
+        fast_enough = active_time_period < transmission_reception_rate
+        standard = (np.asarray(frequency) == 915) & (np.asarray(spreading_factor) == 12) & (np.asarray(coding_rate) == 6)
 
-            if start_index < 0 or end_index > len(self.time): # not valid time
-                print("Error. Index not valid.")
-                return
+        # currents in mA
+        tx_current = np.select([output_power == 7, output_power == 13, output_power == 17, output_power == 20], [18, 28, 90, 125], default=np.nan)
+        boost_current = np.select([bandwidth == 125, bandwidth == 250, bandwidth == 500], [10.8, 11.6, 13], default=np.nan)
+        no_boost_current = np.select([bandwidth == 125, bandwidth == 250, bandwidth == 500], [9.7, 10.5, 12], default=np.nan)
+        rx_current = np.select([lna_boost == "OFF", lna_boost == "ON"], [no_boost_current, boost_current], default=np.nan)
+        receiving = (mode == "RXCONTINUOUS") | (mode == "RXSINGLE")
 
-            params = times[2]
-            power = 0
-            mode, frequency, output_power, bandwidth, lna_boost, spreading_factor, coding_rate, payload_size = params
-            sampling_rate = times[3]
+        power = np.select(
+            [
+                mode == "SLEEP",
+                mode == "STANDBY",
+                (mode == "TX") & fast_enough & ~np.isnan(tx_current),
+                receiving & fast_enough & ~np.isnan(rx_current),
+                mode == "IDLE",
+                ((mode == "FSTX") | (mode == "FSRX")) & fast_enough,
+                (mode == "CAD") & ~np.isnan(boost_current),
+            ],
+            [
+                ((0.1*VOLTAGE)/1000),
+                (1.4*VOLTAGE),
+                (active_time_period)*(tx_current*VOLTAGE) + standby_power,
+                (active_time_period)*(rx_current*VOLTAGE) + standby_power,
+                ((1.5*VOLTAGE)/1000),
+                (active_time_period)*(4.5*VOLTAGE) + standby_power,
+                (active_time_period)*(boost_current*VOLTAGE),
+            ],
+            default=0,
+        )
+        return np.where(standard, power, 0)
 
-                # if conv_cycle_time > 0:   
-                #     if self.loop_rate < 1/conv_cycle_time:
-                #         conv_cycle_time = 1/self.loop_rate
+    def compute_data_array(self, mode, payload_size, transmission_reception_rate):
+        """
+          Computes data usage of many configurations at once, see compute_data().
 
-            power = self.compute_power(mode, frequency, output_power, bandwidth, lna_boost, spreading_factor, coding_rate, payload_size, sampling_rate)
+          Parameters
+          ----------
+            mode: array of strings representing modes of SX1272
+            payload_size: array of payload sizes in bytes
+            transmission_reception_rate: array of seconds between transmissions / receptions
 
-            for i in range(start_index, end_index):
-                power_arr[i] = power
+          Returns
+          -------
+            data: numpy array of bytes per second, negative for transmissions
+        """
+        mode = np.asarray(mode)
+        payload_size = np.asarray(payload_size, dtype=float)
+        transmission_reception_rate = np.asarray(transmission_reception_rate, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.select(
+                [(mode == "RXCONTINUOUS") | (mode == "RXSINGLE") | (mode == "FSRX"), (mode == "TX") | (mode == "FSTX")],
+                [payload_size / transmission_reception_rate, payload_size / (-1*transmission_reception_rate)],
+                default=0.0,
+            )
 
-        return power_arr
-    
-    def get_all_modes_data(self):
+    def get_segment_rates(self, times):
         """
-          Computes the data usage of all modes in modes_SX1
+          Computes the power consumption and data usage of one active period of active_time_params
 
           Parameters
           ----------
-            None
+            times: tuple (start, end, configuration, transmission_reception_rate)
 
           Returns
           -------
-            data_arr: list of all computed data usages
+            power: Float representing power in mW
+            data: number of bytes used in 1 second
         """
-        data_arr = None
-        length = len(self.time)
-        data_arr = [0] * length
-        data_accumulated = 0
-
-        for times in self.active_time_params: # for each active period
-            start_index = int(times[0] / self.time_step) 
-            end_index = int(times[1] / self.time_step)
-            params = times[2]
-            mode, frequency, output_power, bandwidth, lna_boost, spreading_factor, coding_rate, payload_size = params
-            sampling_rate = times[3]
-            data_per_second = self.compute_data(mode, frequency, output_power, bandwidth, lna_boost, spreading_factor, coding_rate, payload_size, sampling_rate)
-
-            for i in range(start_index, length):
-                if i < end_index:
-                    data_accumulated += data_per_second
-                data_arr[i] = data_accumulated 
-        
-        return data_arr
+        mode, frequency, output_power, bandwidth, lna_boost, spreading_factor, coding_rate, payload_size = times[2]
+        sampling_rate = times[3]
+
+        power = self.compute_power(mode, frequency, output_power, bandwidth, lna_boost, spreading_factor, coding_rate, payload_size, sampling_rate)
+        data = self.compute_data(mode, frequency, output_power, bandwidth, lna_boost, spreading_factor, coding_rate, payload_size, sampling_rate)
+        return power, data
 
-    def run_sim(self):
+    def get_all_modes_power(self):
         """
-          Checks if modes are valid before coputer the power and data usage of given configurations in modes_SX1. Plots results.
+          Computes the power consumption of all modes in modes_SX1
 
           Parameters
           ----------
@@ -286,14 +314,22 @@ class SX1272(Sensor):
 
           Returns
           -------
-            Lists of power consumptions, data usages, and times. Empty lists if at least one mode is invalid
+            power_arr: numpy array of all computed power consumptions
         """    
-        
-        error = self.error_check()
-        if error == False:
-            power = self.get_all_modes_power()
-            data = self.get_all_modes_data()
-            self.plotData(power, data, self.time, self.active_time_params)
-
-            return np.array(power), np.array(data), np.array(self.time)
-        return [], [], []
\ No newline at end of file
+        power_arr, _ = self.compute_vectors(self.get_segment_rates)
+        return power_arr
+    
+    def get_all_modes_data(self):
+        """
+          Computes the data usage of all modes in modes_SX1
+
+          Parameters
+          ----------
+            None
+
+          Returns
+          -------
+            data_arr: numpy array of all computed data usages
+        """
+        _, data_arr = self.compute_vectors(self.get_segment_rates)
+        return data_arr
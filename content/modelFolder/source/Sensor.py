@@ -1,7 +1,9 @@
-import matplotlib.pyplot as plt
+import contextlib
+import io
 import numpy as np
 from typing import List
-import random
+from source.helperFunctions import generate_periodic_schedule, num_samples, time_chunks, cast_vector, check_memory_budget, CHUNK_SIZE
+from source.Trace import PowerTrace, DataTrace
 
 class Sensor:
     """
@@ -13,54 +15,325 @@ class Sensor:
         #optional init function for any sensor.
         self.__dict__.update(config)
 
+    @property
+    def time(self) -> np.array:
+        """
+            Time vector of the simulation, np.arange(0, duration, time_step). Built on first use, so sensors that are
+            only simulated with simulate_chunks() never hold it.
+        """
+        if getattr(self, "_time", None) is None:
+            self._time = np.arange(0, self.duration, self.time_step)
+        return self._time
+
+    @time.setter
+    def time(self, value):
+        self._time = value
+
+    def num_samples(self) -> int:
+        """
+            Returns len(self.time) without building the time vector.
+        """
+        if getattr(self, "_time", None) is not None:
+            return len(self._time)
+        return num_samples(self.duration, self.time_step)
+
+    def generate_valid_configs(self):
+        """
+            Creates a list of all valid configurations. Each sensor points this at its own generate_valid_configs_* function.
+        """
+        return []
+
+    @classmethod
+    def get_valid_configs(cls) -> frozenset:
+        """
+            Returns the valid configurations of the sensor as a frozenset. The set is built once per sensor class
+            and reused by error_check(), helperFunctions.valid() and generateBitstrings.validate_configs().
+
+            Returns:
+                frozenset of valid configurations.
+        """
+        if "_valid_configs" not in cls.__dict__: # cached per class, not shared with the parent class
+            cls._valid_configs = frozenset(cls.generate_valid_configs(cls))
+        return cls._valid_configs
+
+    @classmethod
+    def is_valid_config(cls, config) -> bool:
+        """
+            Checks if a single configuration is valid in O(1).
+
+            Arguments:
+                config: configuration tuple (or mode string) of the sensor.
+
+            Returns:
+                True if the configuration is valid, False otherwise.
+        """
+        try:
+            return config in cls.get_valid_configs()
+        except TypeError: # unhashable configurations, e.g. lists, are never valid
+            return False
+
+    def get_modes(self) -> list:
+        """
+            Returns the modes list of the sensor, i.e. [(configuration, duration, sampling_rate), ...]. Each sensor
+            names the attribute holding it in modes_attribute.
+        """
+        return getattr(self, self.modes_attribute)
+
+    def validate_modes(self, modes=None) -> bool:
+        """
+            Runs error_check() once for a modes list. The result is cached against a copy of the list, so calling
+            run_sim() again with the same modes does not validate again.
+
+            Arguments:
+                modes: modes list of the sensor, i.e. [(configuration, duration, sampling_rate), ...]. Defaults to get_modes().
+
+            Returns:
+                error: True if a configuration is invalid, False otherwise
+        """
+        if modes is None:
+            modes = self.get_modes()
+        if getattr(self, "_validated_modes", None) != modes:
+            self._validation_error = self.error_check()
+            self._validated_modes = list(modes)
+        return self._validation_error
+
+    def get_segment_indices(self):
+        """
+            Converts the start and end times in active_time_params to indices of the time vector.
+
+            Returns:
+                start_indices: numpy array of the first index of each active period.
+                end_indices: numpy array of the index after the last index of each active period.
+        """
+        bounds = np.array([(times[0], times[1]) for times in self.active_time_params], dtype=float).reshape(-1, 2)
+        indices = (bounds / self.time_step).astype(np.int64) # truncates like int(), same rounding as the old per-sample loops
+        return indices[:, 0], indices[:, 1]
+
+    def get_rates(self, segment_rates, segments=None) -> np.array:
+        """
+            Evaluates segment_rates once per distinct (configuration, sampling_rate) instead of once per active
+            period. The warnings the formulas print, e.g. for a sampling rate the sensor cannot keep up with, are
+            printed once each.
+
+            Arguments:
+                segment_rates: function taking one entry of active_time_params and returning (power, bytes_per_second).
+                segments: entries of the form of active_time_params. Defaults to active_time_params.
+
+            Returns:
+                float64 numpy array with one row of (power, bytes_per_second) per segment.
+        """
+        if segments is None:
+            segments = self.active_time_params
+        rates = {}
+        keys = [repr((times[2], times[3])) for times in segments]
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for key, times in zip(keys, segments):
+                if key not in rates:
+                    rates[key] = segment_rates(times)
+        for line in dict.fromkeys(output.getvalue().splitlines()):
+            print(line)
+        return np.array([rates[key] for key in keys], dtype=float).reshape(-1, 2)
+
+    def compute_vectors(self, segment_rates):
+        """
+            Computes the power and data vectors of every active period in active_time_params. Each active period
+            is constant, so the per-sample rates are built with np.repeat and the data is a single cumulative sum.
+
+            Arguments:
+                segment_rates: function taking one entry of active_time_params and returning (power, bytes_per_second).
+
+            Returns:
+                power_vector: float64 numpy array of power (mW) at each value of self.time.
+                data_vector: float64 numpy array of accumulated data (Bytes) at each value of self.time.
+        """
+        length = self.num_samples()
+        start_indices, end_indices = self.get_segment_indices()
+        if len(start_indices) == 0:
+            return np.zeros(length), np.zeros(length)
+        if start_indices[0] < 0 or end_indices.max() > length: # not valid time
+            print("Error. Index not valid.")
+            return None, None
+
+        rates = self.get_rates(segment_rates)
+        counts = np.maximum(end_indices - start_indices, 0) # active periods follow each other, see generate_active_list()
+
+        power_vector = np.zeros(length)
+        rate_vector = np.zeros(length)
+        stop = start_indices[0] + counts.sum()
+        power_vector[start_indices[0]:stop] = np.repeat(rates[:, 0], counts)
+        rate_vector[start_indices[0]:stop] = np.repeat(rates[:, 1], counts)
+        data_vector = np.cumsum(rate_vector) # bytes per second are accumulated once per sample
+
+        return power_vector, data_vector
     
+    def compute_traces(self, segment_rates):
+        """
+            Computes the power and data of every active period in active_time_params as segment traces instead of
+            dense vectors. Segment boundaries are aligned to the time_step grid the same way as in compute_vectors(),
+            so trace.to_vector(self.time) gives the same vectors.
+
+            Arguments:
+                segment_rates: function taking one entry of active_time_params and returning (power, bytes_per_second).
+
+            Returns:
+                power_trace: PowerTrace of power (mW).
+                data_trace: DataTrace of the data rate (Bytes per second).
+        """
+        start_indices, end_indices = self.get_segment_indices()
+        rates = self.get_rates(segment_rates)
+        end_indices = np.minimum(end_indices, self.num_samples()) # like compute_vectors(), nothing past the time vector
+        starts = start_indices * self.time_step
+        ends = end_indices * self.time_step
+
+        return PowerTrace.from_segments(starts, ends, rates[:, 0]), DataTrace.from_segments(starts, ends, rates[:, 1])
+
+    def output_nbytes(self, power_dtype=None, data_dtype=None) -> int:
+        """
+            Returns the number of bytes the time, power and data vectors of simulate() take, without building them.
+
+            Arguments:
+                power_dtype, data_dtype: dtypes of the power and data vectors, None for float64.
+        """
+        itemsize = lambda dtype: np.dtype(float if dtype is None else dtype).itemsize
+        return self.num_samples() * (np.dtype(float).itemsize + itemsize(power_dtype) + itemsize(data_dtype))
+
+    def simulate(self, as_trace=False, power_dtype=None, data_dtype=None, memory_budget=None):
+        """
+            Checks if the modes are valid and computes the power and data usage of the whole run without plotting.
+            Use this instead of run_sim() for sweeps and batch evaluation.
+
+            Arguments:
+                as_trace: if True, power and data are returned as PowerTrace and DataTrace segment traces.
+                power_dtype: dtype of the power vector, e.g. np.float32. None for float64.
+                data_dtype: dtype of the cumulative data vector, e.g. np.int64 or np.uint32 for whole Bytes. None for float64.
+                memory_budget: bytes the vectors may take, see output_nbytes(). Above it, a ValueError is raised; evaluate
+                    the run in pieces with simulate_chunks() instead. Segment traces are not limited.
+
+            Returns:
+                power, data and time vectors. Empty lists if at least one mode is invalid.
+        """
+        if self.validate_modes():
+            return [], [], []
+        if not as_trace:
+            check_memory_budget(self.num_samples(), self.output_nbytes(power_dtype, data_dtype), memory_budget)
+        if as_trace:
+            power, data = self.compute_traces(self.get_segment_rates)
+        elif power_dtype is None and data_dtype is None:
+            power, data = self.compute_vectors(self.get_segment_rates)
+        else: # filled chunk by chunk, so no float64 vector of the whole run is created next to the output
+            power = np.empty(self.num_samples(), dtype=float if power_dtype is None else power_dtype)
+            data = np.empty(self.num_samples(), dtype=float if data_dtype is None else data_dtype)
+            start = 0
+            for power_chunk, data_chunk, _ in self.simulate_chunks(CHUNK_SIZE, power_dtype, data_dtype):
+                power[start:start + len(power_chunk)] = power_chunk
+                data[start:start + len(data_chunk)] = data_chunk
+                start += len(power_chunk)
+        return power, data, self.time
+
+    def simulate_chunks(self, chunk_size=CHUNK_SIZE, power_dtype=None, data_dtype=None):
+        """
+            Checks if the modes are valid and yields the power and data usage of the run in consecutive chunks of
+            chunk_size samples, for durations whose vectors do not fit in memory, e.g. a whole lunar day at the
+            ACC rate. The chunks are built from the segment traces and the cumulative data is carried from chunk
+            to chunk, so concatenating them gives exactly the vectors of simulate().
+
+            Usage Example:
+            for power, data, time in tmp.simulate_chunks(10**6):
+                peak_power = max(peak_power, power.max())
+
+            Arguments:
+                chunk_size: number of samples per chunk.
+                power_dtype, data_dtype: dtypes of the power and data chunks, see simulate().
+
+            Yields:
+                power, data and time numpy arrays of at most chunk_size samples. Nothing if at least one mode is invalid.
+        """
+        if self.validate_modes():
+            return
+        power_trace, data_trace = self.compute_traces(self.get_segment_rates)
+        total_data = 0.0
+        for time in time_chunks(self.duration, self.time_step, chunk_size):
+            power = power_trace.resample(time)
+            rate = data_trace.resample(time)
+            rate[0] += total_data # continues the running sum of simulate() instead of adding an offset afterwards
+            data = np.cumsum(rate)
+            total_data = data[-1]
+            yield cast_vector(power, power_dtype), cast_vector(data, data_dtype), time
+
+    def run_sim(self, as_trace=False, power_dtype=None, data_dtype=None, memory_budget=None):
+        """
+            Runs simulate() and plots the results with plotData().
+
+            Arguments:
+                as_trace: if True, power and data are returned as PowerTrace and DataTrace segment traces.
+                power_dtype, data_dtype: dtypes of the power and data vectors, see simulate().
+                memory_budget: bytes the vectors may take, see simulate().
+
+            Returns:
+                power, data and time vectors. Empty lists if at least one mode is invalid.
+        """
+        if self.validate_modes(): # nothing to plot
+            return [], [], []
+        power, data, time = self.simulate(as_trace, power_dtype, data_dtype, memory_budget)
+        if power is None: # active times outside of the time vector, see compute_vectors()
+            return [], [], []
+        if as_trace:
+            self.plotData(power.to_vector(time), data.to_vector(time), time, self.active_time_params)
+            return power, data, np.array(time)
+        self.plotData(power, data, time, self.active_time_params)
+        return np.array(power), np.array(data), np.array(time)
+
+    def get_schedule_summary(self, segment_rates=None) -> dict:
+        """
+            Computes the totals of the whole run analytically from one scheduling period, its repeat count and the
+            tail (see generate_periodic_schedule()). Nothing is expanded to time_step resolution, so the cost is
+            O(len(modes)) however long duration is and however small time_step is.
+
+            Arguments:
+                segment_rates: function taking one entry of active_time_params and returning (power, bytes_per_second).
+                    Defaults to the sensor's get_segment_rates().
+
+            Returns:
+                dictionary with energy (mJ), average_power (mW), peak_power (mW) and total_data (Bytes, bytes per
+                second times seconds). None if at least one mode is invalid.
+        """
+        if segment_rates is None:
+            segment_rates = self.get_segment_rates
+        if self.validate_modes():
+            return None
+
+        period, repeats, tail = generate_periodic_schedule(self.duration, self.get_modes())
+        energy = 0
+        total_data = 0
+        peak_power = 0
+        all_rates = self.get_rates(segment_rates, period + tail)
+        for segments, rates, count in ((period, all_rates[:len(period)], repeats), (tail, all_rates[len(period):], 1)):
+            if count == 0 or len(segments) == 0:
+                continue
+            durations = np.array([times[1] - times[0] for times in segments], dtype=float)
+            energy += count * np.dot(rates[:, 0], durations)
+            total_data += count * np.dot(rates[:, 1], durations)
+            if np.any(durations > 0):
+                peak_power = max(peak_power, rates[durations > 0, 0].max())
+
+        return {
+            "energy": energy,
+            "average_power": energy / self.duration if self.duration > 0 else 0,
+            "peak_power": peak_power,
+            "total_data": total_data,
+        }
+
     def plotData(self, power_vector: np.array, data_vector: np.array, time_vector: np.array, active_times: List[tuple]) -> None:
         """
             Creates plots given power, data, and time vectors. Active times is needed for the topmost plot.
+            See plotFunctions.plot_sensor_data(), matplotlib is only imported here.
 
             Arguments:
-                power_vector: calculated values from getVectors() function. 
-                data_vector: calculated values from getVectors() function. 
-                time_vector: calculated values from getVectors() function. 
-                active_times: active times list from generateActiveList() function.
-        """
-        colors = []
-        #num_modes = len(set([time[2] for time in active_times]))#gets number of distinct modes in active_times
-        num_modes = 3
-        #generates number of random colors for active times plot, different color for each mode (usually).
-        for i in range(num_modes):
-            color = "#%06x" % random.randint(0, 0xFFFFFF)
-            colors.append(color)
-
-        #plot setup/ manipulation.
-        fig, (ax1,ax2,ax3) = plt.subplots(nrows=3,ncols=1,sharex=True,gridspec_kw={'height_ratios': [num_modes*0.3, 3, 3]},figsize=(7,7))
-        ax1.set_title("Power and Data")
-        ax1.set_xlim(0, active_times[-1][1])#set limit to be the last value of active_times.
-        ax1.set_ylabel('Active times')
-        ax1.grid()
-
-        #active times plot. 
-        ticks = {}
-        for i,v in enumerate(active_times):
-            if v[2] not in ticks.keys():#correspond a color for each mode.
-                 ticks[v[2]] = i
-            #set each bar with a corresponding color and height
-            ax1.broken_barh([(v[0],v[1]-v[0])], (ticks[v[2]], 0.8), color=colors[ticks[v[2]]])#change 0.8 to change height of bars.
-        ax1.set_yticks([x + 0.5 for x in ticks.values()], labels=ticks.keys())#set labels for each mode in active times chart
-
-        power_plot, = ax2.plot(time_vector, power_vector)
-        ax2.tick_params('y', labelsize=12)
-        ax2.tick_params('x', labelbottom=False)
-        ax2.set_ylabel('Power (mW)')
-        ax2.grid()
-        
-        data_plot, = ax3.plot(time_vector, data_vector)
-        ax3.tick_params('y', labelsize=12)
-        ax3.tick_params('x', labelsize=12)
-        ax3.set_ylabel('Data (Bytes)')
-        ax3.set_xlabel('Seconds')
-        ax3.grid()
-
-        plt.ion()
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+                power_vector: calculated values from simulate(). 
+                data_vector: calculated values from simulate(). 
+                time_vector: calculated values from simulate(). 
+                active_times: active times list from generate_active_list() function.
+        """
+        from source.plotFunctions import plot_sensor_data
+        plot_sensor_data(power_vector, data_vector, time_vector, active_times)
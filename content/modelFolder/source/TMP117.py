@@ -1,6 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import random 
 from source.helperFunctions import generate_active_list
 from source.Sensor import Sensor
 
@@ -12,10 +10,11 @@ STANDBY_CURRENT = 1.25 #μA
 READ_BYTES = 6 #bytes, 2 for temperature data and 4 for timestamp
 
 class TMP117(Sensor):
+    modes_attribute = "modes_tmp" # name of the modes list, see Sensor.get_modes()
+
     def __init__(self, time_step, duration, modes_tmp, loop_rate): 
         self.time_step = time_step
         self.duration = duration
-        self.time = np.arange(0, duration, time_step) #time at which to collect data
         self.active_time_params = generate_active_list(duration, modes_tmp)
         self.loop_rate = loop_rate
         self.modes_tmp = modes_tmp
@@ -60,6 +59,8 @@ class TMP117(Sensor):
 
         return all_configs
 
+    generate_valid_configs = generate_valid_configs_tmp
+
     def error_check(self):
         """
           Checks if the configurations contained within self.modes_tmp are valid
@@ -73,10 +74,9 @@ class TMP117(Sensor):
             error: True if a configuration is invalid, False otherwise
         """
         error = False
-        all_configs = self.generate_valid_configs_tmp()
         for param in self.modes_tmp:
-            if param[0] not in all_configs:
-                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], all_configs))
+            if not self.is_valid_config(param[0]):
+                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], self.generate_valid_configs_tmp()))
                 error = True
         return error
 
@@ -160,49 +160,89 @@ class TMP117(Sensor):
         
         return data
     
-    def get_all_modes_power(self):
+    def compute_power_array(self, mode, num_averages, conv_cycle_time, sampling_rate):
         """
-          Computes the power consumption of all modes in modes_tmp
+          Computes power consumption of many configurations at once. Same formulas as compute_power(),
+          evaluated with np.select instead of if/elif, so the results are identical to the scalar path.
 
           Parameters
           ----------
-            None
+            mode: array of strings representing modes of TMP117 sensor
+            num_averages: array of ints representing how many conversions are averaged together for a data sample
+            conv_cycle_time: array of floats representing how often conversions are accumulated (for Continuous)
+            sampling_rate: array of floats representing the number of seconds between samples (for One_Shot)
 
           Returns
           -------
-            power_arr: list of all computed power consumptions
-        """    
-        length = len(self.time)
-        power_arr = [0] * length # creating corresponding power array to time intervals, default values
+            power: numpy array of power in mW, broadcast over the arguments
+        """
+        mode = np.asarray(mode)
+        num_averages = np.asarray(num_averages, dtype=float)
+        conv_cycle_time = np.asarray(conv_cycle_time, dtype=float)
+        sampling_rate = np.asarray(sampling_rate, dtype=float)
+
+        active_conversion_time = np.where(num_averages == 0, CONVERSION_DURATION, num_averages * CONVERSION_DURATION)
+
+        with np.errstate(divide="ignore", invalid="ignore"): # only the selected branch is kept
+            cc_standby_time = np.where(active_conversion_time < conv_cycle_time, conv_cycle_time - active_conversion_time, 0)
+            cc_cycle_time = np.where(active_conversion_time < conv_cycle_time, conv_cycle_time, active_conversion_time)
+            cc_current = (((ACTIVE_CURRENT/1000)*active_conversion_time)+((STANDBY_CURRENT/1000)*cc_standby_time))/cc_cycle_time
+
+            os_standby_time = np.where(active_conversion_time < sampling_rate, sampling_rate - active_conversion_time, 0)
+            os_sampling_rate = np.where(active_conversion_time < sampling_rate, sampling_rate, active_conversion_time)
+            os_current = ((((ACTIVE_CURRENT)/1000)*active_conversion_time)+(((SHUTDOWN_CURRENT)/1000)*os_standby_time)) / (os_sampling_rate)
+
+        current = np.select(
+            [mode == "CONTINUOUS_CONVERSION", mode == "ONE_SHOT", mode == "SHUTDOWN"],
+            [cc_current, os_current, SHUTDOWN_CURRENT/1000],
+            default=0,
+        )
+        return current * (VOLTAGE * 1000)
+
+    def compute_data_array(self, mode, sampling_rate):
+        """
+          Computes data usage of many configurations at once, see compute_data().
 
-        for times in self.active_time_params: # check if the given start and end time is a valid value in the time array and round to nearest value 
-            start_index = int(times[0] / self.time_step) # getting index of the closest value to active times 
-            end_index = int(times[1] / self.time_step)
+          Parameters
+          ----------
+            mode: array of strings representing modes of TMP117 sensor
+            sampling_rate: array of floats representing the number of seconds between samples
 
-            if start_index < 0 or end_index > len(self.time): # not valid time
-                print("Error. Index not valid.")
-                return
+          Returns
+          -------
+            data: numpy array of bytes used in 1 second
+        """
+        mode = np.asarray(mode)
+        with np.errstate(divide="ignore"):
+            return np.where(mode == "SHUTDOWN", 0.0, READ_BYTES / np.asarray(sampling_rate, dtype=float))
 
-            params = times[2]
-            power = 0
-            if params != "SHUTDOWN":
-                mode, conv_cycle_time, num_averages = params
-                sampling_rate = times[3]
+    def get_segment_rates(self, times):
+        """
+          Computes the power consumption and data usage of one active period of active_time_params
 
-                # if conv_cycle_time > 0:   
-                #     if self.loop_rate < 1/conv_cycle_time:
-                #         conv_cycle_time = 1/self.loop_rate
+          Parameters
+          ----------
+            times: tuple (start, end, configuration, sampling_rate)
+
+          Returns
+          -------
+            power: Float representing power in mW
+            data: number of bytes used in 1 second
+        """
+        mode, num_averages, conv_cycle_time = times[2]
+        sampling_rate = times[3]
 
-                power = self.compute_power(mode, conv_cycle_time, num_averages, sampling_rate)
+        # if conv_cycle_time > 0:   
+        #     if self.loop_rate < 1/conv_cycle_time:
+        #         conv_cycle_time = 1/self.loop_rate
 
-            for i in range(start_index, end_index):
-                power_arr[i] = power
+        power = self.compute_power(mode, num_averages, conv_cycle_time, sampling_rate)
+        data = self.compute_data(mode, conv_cycle_time, num_averages, sampling_rate)
+        return power, data
 
-        return power_arr
-            
-    def get_all_modes_data(self):
+    def get_all_modes_power(self):
         """
-          Computes the data usage of all modes in modes_tmp
+          Computes the power consumption of all modes in modes_tmp
 
           Parameters
           ----------
@@ -210,30 +250,14 @@ class TMP117(Sensor):
 
           Returns
           -------
-            data_arr: list of all computed data usages
+            power_arr: numpy array of all computed power consumptions
         """    
-        length = len(self.time)
-        data_arr = [0] * length # creating corresponding power array to time intervals, default values 
-        data_accumulated = 0
-        
-        for times in self.active_time_params: # for each active period
-            start_index = int(times[0] / self.time_step) 
-            end_index = int(times[1] / self.time_step)
-            params = times[2]
-            mode, conv_cycle_time, num_averages = params
-            sampling_rate = times[3]
-            data_per_second = self.compute_data(mode, conv_cycle_time, num_averages, sampling_rate)
-
-            for i in range(start_index, length):
-                if i < end_index:
-                    data_accumulated += data_per_second
-                data_arr[i] = data_accumulated 
-                
-        return data_arr
-    
-    def run_sim(self):
+        power_arr, _ = self.compute_vectors(self.get_segment_rates)
+        return power_arr
+            
+    def get_all_modes_data(self):
         """
-          Checks if modes are valid before coputer the power and data usage of given configurations in modes_tmp. Plots results.
+          Computes the data usage of all modes in modes_tmp
 
           Parameters
           ----------
@@ -241,17 +265,11 @@ class TMP117(Sensor):
 
           Returns
           -------
-            Lists of power consumptions, data usages, and times. Empty lists if at least one mode is invalid
+            data_arr: numpy array of all computed data usages
         """    
-        
-        error = self.error_check()
-        if error == False:
-            power = self.get_all_modes_power()
-            data = self.get_all_modes_data()
-            self.plotData(power, data, self.time, self.active_time_params)
-
-            return np.array(power), np.array(data), np.array(self.time)
-        return [], [], []
+        _, data_arr = self.compute_vectors(self.get_segment_rates)
+        return data_arr
+    
 # time_step = 0.0155
 # active_time_params = [(0, 15, "OS_8_0.0155"), (5, 45, "CC_32_16"), (70, 75, "OS_64_1"), (75,100, "OS_8_0.0155")]
 # tmp = TMP117(time_step, 100, active_time_params, loop_rate = 20) # creating TMP117 class
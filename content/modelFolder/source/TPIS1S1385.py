@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from source.Sensor import Sensor
 from source.helperFunctions import generate_active_list
 from typing import List
@@ -12,17 +11,21 @@ MEASUREMENT_DURATION = 0.0005 #s
 
 class TPIS1S1385(Sensor):
 
+    modes_attribute = "modes_tp" # name of the modes list, see Sensor.get_modes()
+
     def __init__ (self, time_step, duration, modes_tp, loop_rate = 60):
         self.time_step = time_step
         self.duration = duration
         self.active_time_params = generate_active_list(duration, modes_tp)
         self.modes_tp = modes_tp
         self.loop_rate = loop_rate
-        self.time = np.arange(0,self.duration,self.time_step) #time at which to collect data
     
     def generate_valid_configs_tp(self):
         all_configs = [("TP_ON"), ("TP_OFF")]
         return all_configs
+
+    generate_valid_configs = generate_valid_configs_tp
+
     def error_check(self):
         """
           Checks if the configurations contained within self.modes_tp are valid
@@ -36,33 +39,12 @@ class TPIS1S1385(Sensor):
             error: True if a configuration is invalid, False otherwise
         """
         error = False
-        all_configs = self.generate_valid_configs_tp()
         for param in self.modes_tp:
-            if param[0] not in all_configs:
-                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], all_configs))
+            if not self.is_valid_config(param[0]):
+                print("Error. Invalid configuration {}. Valid Configurations to choose from: {}".format(param[0], self.generate_valid_configs_tp()))
                 error = True
         return error
 
-    def run_sim(self):
-        """
-          Checks if modes are valid before coputer the power and data usage of given configurations in modes_tp. Plots results.
-
-          Parameters
-          ----------
-            None
-
-          Returns
-          -------
-            Lists of power consumptions, data usages, and times. Empty lists if at least one mode is invalid
-        """ 
-        error = self.error_check()
-        if error == False:
-            power = self.get_all_modes_power()
-            data = self.get_all_modes_data()
-            self.plotData(power, data, self.time, self.active_time_params)
-            return np.array(power), np.array(data), np.array(self.time)
-        return [], [], []
-
     def get_mode_power(self, mode, sampling_rate):
         """
           This function calculates power when sensor is active
@@ -115,36 +97,78 @@ class TPIS1S1385(Sensor):
             return 6/measure_rate
         else:
             return 0 
-    def get_all_modes_power(self):
+    def get_mode_power_array(self, mode, sampling_rate):
         """
-          Computes the power consumption of all modes in modes_tp
+          Calculates power of many configurations at once. Same formulas as get_mode_power(),
+          evaluated with np.select, so the results are identical to the scalar path.
 
           Parameters
           ----------
-            None
+            mode: array of strings representing modes of TPIS1S1385 sensor
+            sampling_rate: array of floats representing the time between samples
 
           Returns
           -------
-            power_arr: list of all computed power consumptions
-        """    
-        length = len(self.time)
-        power_arr = [0] * length # creating corresponding power array to time intervals, default values
+            numpy array of power in mW, -1 for invalid modes
+        """
+        mode = np.asarray(mode)
+        sampling_rate = np.asarray(sampling_rate, dtype=float)
+        fast_enough = MEASUREMENT_DURATION < sampling_rate
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.select(
+                [(mode == "TP_ON") & fast_enough, (mode == "TP_OFF") & fast_enough, (mode == "TP_ON") | (mode == "TP_OFF")],
+                [((ACTIVE_CURRENT * VOLTAGE / 1000))/sampling_rate, ((SHUTDOWN_CURRENT * VOLTAGE / 1000))/sampling_rate, 0.0],
+                default=-1,
+            )
+
+    def get_bytes_per_second_array(self, mode, sampling_rate):
+        """
+          Calculates the data of many configurations at once, see get_bytes_per_second().
+
+          Parameters
+          ----------
+            mode: array of strings representing modes of TPIS1S1385 sensor
+            sampling_rate: array of floats representing the time between samples
 
-        for times in self.active_time_params: # check if the given start and end time is a valid value in the time array and round to nearest value 
-            start_index = int(times[0] / self.time_step) # getting index of the closest value to active times 
-            end_index = int(times[1] / self.time_step)
+          Returns
+          -------
+            numpy array of bytes per second
+        """
+        measure_rate = np.maximum(np.asarray(sampling_rate, dtype=float), MEASUREMENT_DURATION)
+        return np.where(np.asarray(mode) == "TP_ON", 6/measure_rate, 0.0)
+
+    def get_segment_rates(self, times):
+        """
+          Computes the power consumption and data usage of one active period of active_time_params
+
+          Parameters
+          ----------
+            times: tuple (start, end, mode, sampling_rate)
+
+          Returns
+          -------
+            power: Float representing power in mW
+            data: number of bytes used in 1 second
+        """
+        power = self.get_mode_power(times[2], times[3])
+        data = self.get_bytes_per_second(times[2], times[3])
+        return power, data
 
-            if start_index < 0 or end_index > len(self.time): # not valid time
-                print("Error. Index not valid.")
-                return
-            params = times[2]
-            power = 0
-            power = self.get_mode_power(params,times[3])
+    def get_all_modes_power(self):
+        """
+          Computes the power consumption of all modes in modes_tp
 
-            for i in range(start_index, end_index):
-                power_arr[i] = power
+          Parameters
+          ----------
+            None
 
+          Returns
+          -------
+            power_arr: numpy array of all computed power consumptions
+        """    
+        power_arr, _ = self.compute_vectors(self.get_segment_rates)
         return power_arr
+
     def get_all_modes_data(self):
         """
           Computes the data usage of all modes in modes_tp
@@ -155,21 +179,7 @@ class TPIS1S1385(Sensor):
 
           Returns
           -------
-            data_arr: list of all computed data usages
+            data_arr: numpy array of all computed data usages
         """    
-        length = len(self.time)
-        data_arr = [0] * length 
-        data_accumulated = 0
-        
-        for times in self.active_time_params: # for each active period
-            start_index = int(times[0] / self.time_step) 
-            end_index = int(times[1] / self.time_step)
-            params = times[2]
-            data_per_second = self.get_bytes_per_second(params,times[3])
-
-            for i in range(start_index, length):
-                if i < end_index:
-                    data_accumulated += data_per_second
-                data_arr[i] = data_accumulated 
-                
+        _, data_arr = self.compute_vectors(self.get_segment_rates)
         return data_arr
\ No newline at end of file
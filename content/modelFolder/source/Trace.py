@@ -0,0 +1,240 @@
+import numpy as np
+
+class Trace:
+    """
+        Piecewise constant signal stored by segments instead of by samples. Segment i has the constant value
+        values[i] from breakpoints[i] (inclusive) to breakpoints[i+1] (exclusive). The signal is 0 outside of
+        [breakpoints[0], breakpoints[-1]). Memory scales with the number of mode changes, not with duration / time_step.
+
+        Arguments:
+            breakpoints: increasing times (s) of the segment boundaries, one more than values.
+            values: constant value of each segment.
+    """
+    def __init__(self, breakpoints, values):
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        if len(self.breakpoints) != len(self.values) + 1:
+            raise ValueError("A trace needs exactly one more breakpoint than values.")
+
+    @classmethod
+    def from_segments(cls, starts, ends, values):
+        """
+            Creates a trace from back to back segments, such as the entries of active_time_params.
+            Segments of zero length are dropped.
+
+            Arguments:
+                starts: start time of each segment.
+                ends: end time of each segment, equal to the start of the next one.
+                values: constant value of each segment.
+        """
+        starts = np.asarray(starts, dtype=float)
+        ends = np.asarray(ends, dtype=float)
+        values = np.asarray(values, dtype=float)
+        keep = ends > starts
+        if not np.any(keep):
+            return cls([0.0], [])
+        return cls(np.append(starts[keep], ends[keep][-1]), values[keep])
+
+    @classmethod
+    def from_vector(cls, time_vector, values, time_step=None):
+        """
+            Creates a trace from a dense vector, e.g. the power vector of run_sim(). Sample i holds its value from
+            time_vector[i] until the next sample, the last one for time_step. Runs of equal values become one segment.
+
+            Arguments:
+                time_vector: increasing sample times (s).
+                values: value at each sample.
+                time_step: length (s) of the last sample. Defaults to the spacing of the first two samples.
+        """
+        time_vector = np.asarray(time_vector, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if len(time_vector) == 0:
+            return cls([0.0], [])
+        if time_step is None:
+            time_step = time_vector[1] - time_vector[0] if len(time_vector) > 1 else 1.0
+        starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+        return cls(np.append(time_vector[starts], time_vector[-1] + time_step), values[starts])
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return "{}({} segments, {} s to {} s)".format(type(self).__name__, len(self), self.start, self.end)
+
+    @property
+    def start(self) -> float:
+        return self.breakpoints[0]
+
+    @property
+    def end(self) -> float:
+        return self.breakpoints[-1]
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def resample(self, time_vector: np.array) -> np.array:
+        """
+            Returns the value of the trace at each time of time_vector.
+
+            Arguments:
+                time_vector: times (s) at which to evaluate the trace, e.g. np.arange(0, duration, time_step).
+
+            Returns:
+                float64 numpy array of the same length as time_vector.
+        """
+        time_vector = np.asarray(time_vector, dtype=float)
+        index = np.searchsorted(self.breakpoints, time_vector, side="right") - 1
+        inside = (index >= 0) & (index < len(self.values))
+        resampled = np.zeros(time_vector.shape)
+        resampled[inside] = self.values[index[inside]]
+        return resampled
+
+    def to_vector(self, time_vector: np.array) -> np.array:
+        """
+            Returns the dense vector run_sim() returns for this signal on time_vector.
+        """
+        return self.resample(time_vector)
+
+    def average(self, time_vector: np.array, time_step: float = None) -> np.array:
+        """
+            Returns the mean of the trace over each step of time_vector, i.e. over [time_vector[i], time_vector[i+1]),
+            from the exact integral at the step boundaries. Unlike resample(), the integral (energy for power, Bytes
+            for a data rate) is conserved whether the steps are finer or coarser than the segments.
+
+            Arguments:
+                time_vector: increasing start time (s) of each step.
+                time_step: length (s) of the last step. Defaults to the spacing of the first two times.
+
+            Returns:
+                float64 numpy array of the same length as time_vector.
+        """
+        time_vector = np.asarray(time_vector, dtype=float)
+        if len(time_vector) == 0:
+            return np.zeros(0)
+        if time_step is None:
+            time_step = time_vector[1] - time_vector[0] if len(time_vector) > 1 else self.duration
+        edges = np.append(time_vector, time_vector[-1] + time_step)
+        return np.diff(self.integrate(edges)) / np.diff(edges)
+
+    def to_grid(self, time_vector: np.array, time_step: float = None) -> np.array:
+        """
+            Returns the dense vector of this signal on another grid, conserving its integral, see average().
+        """
+        return self.average(time_vector, time_step)
+
+    def integrate(self, time_vector: np.array = None) -> np.array:
+        """
+            Returns the exact integral of the trace from its start.
+
+            Arguments:
+                time_vector: times (s) at which to return the integral. Defaults to the breakpoints.
+
+            Returns:
+                float64 numpy array of the cumulative integral (value * seconds).
+        """
+        knots = np.concatenate(([0.0], np.cumsum(self.values * np.diff(self.breakpoints))))
+        if time_vector is None:
+            return knots
+        return np.interp(time_vector, self.breakpoints, knots)
+
+    def total(self) -> float:
+        """
+            Returns the integral of the whole trace (value * seconds).
+        """
+        return float(np.dot(self.values, np.diff(self.breakpoints)))
+
+    def max(self) -> float:
+        return float(self.values.max()) if len(self.values) > 0 else 0.0
+
+    def min(self) -> float:
+        return float(self.values.min()) if len(self.values) > 0 else 0.0
+
+    def mean(self) -> float:
+        """
+            Returns the time weighted mean of the trace.
+        """
+        return self.total() / self.duration if self.duration > 0 else 0.0
+
+    def __getitem__(self, key):
+        """
+            Slices the trace by time, i.e. trace[10:20] is the part of the trace between 10 s and 20 s.
+        """
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("Traces can only be sliced by time, i.e. trace[start:stop].")
+        start = self.start if key.start is None else max(key.start, self.start)
+        stop = self.end if key.stop is None else min(key.stop, self.end)
+        if stop <= start:
+            return type(self)([start], [])
+        inner = self.breakpoints[(self.breakpoints > start) & (self.breakpoints < stop)]
+        breakpoints = np.concatenate(([start], inner, [stop]))
+        return type(self)(breakpoints, self.resample(breakpoints[:-1]))
+
+    def __add__(self, other):
+        """
+            Adds two traces of the same kind (e.g. the power of two sensors) or a constant. Breakpoints are merged, so
+            the result has at most len(self) + len(other) segments. A constant is added over the span of the trace.
+        """
+        if np.isscalar(other):
+            return type(self)(self.breakpoints, self.values + other)
+        if not isinstance(other, Trace):
+            return NotImplemented
+        if type(self) is not type(other):
+            raise TypeError("Cannot add a {} to a {}.".format(type(other).__name__, type(self).__name__))
+        breakpoints = np.union1d(self.breakpoints, other.breakpoints)
+        starts = breakpoints[:-1]
+        return type(self)(breakpoints, self.resample(starts) + other.resample(starts))
+
+    def __radd__(self, other):
+        if np.isscalar(other) and other == 0: # lets sum() start from 0
+            return self
+        return self.__add__(other)
+
+class PowerTrace(Trace):
+    """
+        Piecewise constant power (mW) of a sensor or of the whole LunaSat.
+    """
+    def energy(self) -> float:
+        """
+            Returns the energy (mJ) used over the whole trace.
+        """
+        return self.total()
+
+class DataTrace(Trace):
+    """
+        Piecewise constant data rate (Bytes per second) of a sensor or of the whole LunaSat.
+
+        Cumulative data vectors follow the sensor models: the rate is added once per sample, whatever time_step is,
+        so the last value of a vector is the sum of the per sample rates. It is the data in Bytes only for a 1 s
+        step; a 5 B/s trace of 10 s gives 50 on a 1 s grid and 500 on a 0.1 s grid. to_vector(), to_grid() and
+        total_data() all use this convention, total() is the integral in Bytes.
+    """
+    def to_vector(self, time_vector: np.array) -> np.array:
+        """
+            Returns the cumulative data vector run_sim() returns on time_vector, see DataTrace.
+        """
+        return np.cumsum(self.resample(time_vector))
+
+    @classmethod
+    def from_vector(cls, time_vector, data, time_step=None):
+        """
+            Creates a data rate trace from a cumulative data vector of run_sim(), undoing the per sample
+            accumulation. Passing the trace of simulate(as_trace=True) instead avoids the rounding of the difference.
+        """
+        return super().from_vector(time_vector, np.diff(np.asarray(data, dtype=float), prepend=0), time_step)
+
+    def to_grid(self, time_vector: np.array, time_step: float = None) -> np.array:
+        """
+            Returns the cumulative data vector on another grid from the mean rate of each step, see average() and
+            DataTrace.
+        """
+        return np.cumsum(self.average(time_vector, time_step))
+
+    def total_data(self, time_step: float = 1.0) -> float:
+        """
+            Returns the last value of to_grid() on a grid of time_step covering the trace, see DataTrace.
+
+            Arguments:
+                time_step: step (s) of the grid. Defaults to 1 s, for which the result is in Bytes.
+        """
+        return self.total() / time_step
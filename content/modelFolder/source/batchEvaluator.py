@@ -0,0 +1,118 @@
+import concurrent.futures
+import contextlib
+import csv
+import functools
+import glob
+import io
+import os
+from source.LunaSatSystem import LunaSatSystem, MIN_POWER
+from source.generateBitstrings import read_dataset, decode_bitstring, validate_configs
+from source.helperFunctions import check_datarate, DATARATE_LIMIT
+SUMMARY_FIELDS = ["file", "team_no", "team_name", "configurations", "valid", "feasible", "duration", "peak_power",
+                  "average_power", "total_data", "datarate_violations", "first_violation", "message"]
+
+def simulate_configs(config_list, duration_list, sampling_rates_list, time_step=1):
+    """
+    Simulates the TP, CAP, TMP, ACC and MAG sensors running the configurations back to back.
+
+    Parameters
+        config_list (list): nested list of configurations for TP, CAP, TMP, ACC, MAG sensors.
+        duration_list (list): duration (s) of each configuration.
+        sampling_rates_list (list): nested list of sampling rates for TP, CAP, TMP, ACC, MAG sensors.
+        time_step (float): time step (s) of the simulation.
+
+    Returns
+        time, power (mW) and cumulative data (Bytes) numpy arrays, summed over the sensors.
+    """
+    def modes(k):
+        return [(config[k], duration, sampling_rates[k]) for config, duration, sampling_rates in zip(config_list, duration_list, sampling_rates_list)]
+    lunasat = LunaSatSystem(sum(duration_list), time_step, modes_tp=modes(0), modes_cap=modes(1), modes_tmp=modes(2),
+                            modes_acc=modes(3), modes_mag=modes(4), min_power=0)
+    result = lunasat.simulate()
+    return result["time"], result["total_power"], result["total_data"]
+
+def evaluate_submission(file_name, time_step=1, datarate_limit=DATARATE_LIMIT, min_power=MIN_POWER, max_power=None, window=None):
+    """
+    Checks and simulates one file written by generate_dataset().
+
+    Parameters
+        file_name (str): path of the submission, e.g. "outputs/0_EXAMPLE_ARDUINO_CONFIGS.txt".
+        time_step (float): time step (s) of the simulation.
+        datarate_limit (float): Bytes per second the LunaSat can store, checked like plot_total_data().
+        min_power (float): power (mW) always consumed by the LunaSat, added to the sensors.
+        max_power (float): power ceiling (mW). None to only report the peak power.
+        window (float): length (s) of the sliding window of the datarate check, None to check from the start
+            of the run like plot_total_data(). See helperFunctions.check_datarate().
+
+    Returns
+        dict with the fields of SUMMARY_FIELDS.
+    """
+    row = dict.fromkeys(SUMMARY_FIELDS, "")
+    row["file"] = os.path.basename(file_name)
+    row["valid"] = False
+    row["feasible"] = False
+    try:
+        row["team_no"], row["team_name"], bitstrings, duration_list, sampling_rates_list = read_dataset(file_name)
+        config_list = [decode_bitstring(bitstring) for bitstring in bitstrings]
+    except (OSError, KeyError, IndexError, ValueError) as error:
+        row["message"] = "Could not read submission: " + str(error)
+        return row
+    row["configurations"] = len(config_list)
+    if len(config_list) == 0 or len(duration_list) != len(config_list) or len(sampling_rates_list) != len(config_list):
+        row["message"] = "Bitstrings, durations and sampling rates do not match up."
+        return row
+    if sum(duration_list) <= 0:
+        row["message"] = "The total duration has to be longer than 0 seconds."
+        return row
+
+    # validate_configs() and the sensors report problems with print()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        row["valid"] = validate_configs(config_list, sampling_rates_list, duration_list)
+        if row["valid"]:
+            time, power, data = simulate_configs(config_list, duration_list, sampling_rates_list, time_step)
+    messages = [line for line in output.getvalue().splitlines() if line != "All configurations are valid"]
+    row["message"] = messages[0] if len(messages) > 0 else ""
+    if not row["valid"] or len(time) == 0:
+        return row
+
+    power = power + min_power
+    check = check_datarate(time, data, datarate_limit, window, time_step)
+    row["duration"] = sum(duration_list)
+    row["peak_power"] = float(power.max())
+    row["average_power"] = float(power.mean())
+    row["total_data"] = float(data[-1])
+    row["datarate_violations"] = check["violations"]
+    row["first_violation"] = check["first_violation"] if check["violations"] > 0 else ""
+    row["feasible"] = check["violations"] == 0 and (max_power is None or row["peak_power"] <= max_power)
+    return row
+
+def evaluate_submissions(directory="outputs", summary_file="summary.csv", max_workers=None, **options):
+    """
+    Checks and simulates every submission (.txt file) in directory across a process pool and writes one
+    summary table.
+
+    Parameters
+        directory (str): folder holding the <team_no>_<team_name>.txt files.
+        summary_file (str): name of the CSV table written into directory, None to not write it.
+        max_workers (int): number of processes, defaults to the number of cores. 1 runs in this process,
+            e.g. where processes are not available.
+        **options: passed on to evaluate_submission(), e.g. max_power=150.
+
+    Returns
+        list of dicts with the fields of SUMMARY_FIELDS, one per submission, ordered by file name.
+    """
+    files = sorted(glob.glob(os.path.join(directory, "*.txt")))
+    evaluate = functools.partial(evaluate_submission, **options)
+    if max_workers == 1 or len(files) <= 1:
+        rows = [evaluate(file_name) for file_name in files]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rows = list(executor.map(evaluate, files))
+
+    if summary_file is not None:
+        with open(os.path.join(directory, summary_file), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    return rows
@@ -0,0 +1,188 @@
+import numpy as np
+from source.TPIS1S1385 import TPIS1S1385
+from source.CAP11NA import CAP11NA
+from source.TMP117 import TMP117
+from source.MPU6000 import MPU6000
+from source.BM1422 import BM1422
+
+SENSOR_NAMES = ["TP", "CAP", "TMP", "ACC", "MAG"] # same order as the configurations of generate_bitstrings()
+SENSOR_CLASSES = {"TP": TPIS1S1385, "CAP": CAP11NA, "TMP": TMP117, "ACC": MPU6000, "MAG": BM1422}
+MERGE_CHUNK = 2**20 # partial systems formed at once when a sensor's front is merged, 8 MB per float64 column
+
+def acc_min_sampling_rate(digital_low_pass, sample_rate_divisor):
+    """
+    Returns the shortest time between samples (s) an ACC configuration allows, as checked in validate_configs().
+
+    Parameters
+        digital_low_pass (str or numpy array): 3 bit digital low pass setting(s).
+        sample_rate_divisor (int or numpy array): sample rate divisor(s).
+    """
+    digital_low_pass = np.asarray(digital_low_pass)
+    gyroscope_output_rate = np.where((digital_low_pass == "000") | (digital_low_pass == "111"), 8000, 1000)
+    active_conversion_time = 1/((gyroscope_output_rate*1000) / (1 + np.asarray(sample_rate_divisor, dtype=float)))
+    return active_conversion_time * 1000 # overestimation
+
+def _column(configs, i, dtype=None):
+    return np.array([config[i] for config in configs], dtype=dtype)
+
+def sensor_candidates(sensor, sampling_rates, configs=None):
+    """
+    Evaluates every configuration of one sensor at every sampling rate it allows.
+
+    Parameters
+        sensor (str): one of SENSOR_NAMES.
+        sampling_rates (list or numpy array): seconds between samples to try. Rates the sensor cannot keep
+            up with (see validate_configs()) are skipped.
+        configs (list): configurations to try. Defaults to all valid configurations of the sensor.
+
+    Returns
+        (power, data, config_index, sampling_rate) numpy arrays with one entry per candidate, where
+        config_index points into configs.
+    """
+    if sensor not in SENSOR_CLASSES:
+        raise ValueError("Unknown sensor {}. Choose from {}.".format(sensor, SENSOR_NAMES))
+    if configs is None:
+        configs = SENSOR_CLASSES[sensor].generate_valid_configs(SENSOR_CLASSES[sensor])
+    sampling_rates = np.asarray(sampling_rates, dtype=float).ravel()
+    if sensor == "TP":
+        modes = np.array(configs)
+        min_rate = np.full(len(configs), 0.0005)
+        power_fn = lambda i, sr: TPIS1S1385.get_mode_power_array(TPIS1S1385, modes[i], sr)
+        data_fn = lambda i, sr: TPIS1S1385.get_bytes_per_second_array(TPIS1S1385, modes[i], sr)
+    elif sensor == "CAP":
+        modes = np.array(configs)
+        min_rate = np.full(len(configs), 0.001) # Estimate
+        power_fn = lambda i, sr: CAP11NA.get_Power_per_sec_array(CAP11NA, modes[i], sr)
+        data_fn = lambda i, sr: CAP11NA.get_Bytes_per_sec_array(CAP11NA, modes[i], sr)
+    elif sensor == "TMP":
+        modes, num_averages, conv_cycle_times = _column(configs, 0), _column(configs, 1, float), _column(configs, 2, float)
+        min_rate = np.full(len(configs), 0.0155)
+        power_fn = lambda i, sr: TMP117.compute_power_array(TMP117, modes[i], num_averages[i], conv_cycle_times[i], sr)
+        data_fn = lambda i, sr: TMP117.compute_data_array(TMP117, modes[i], sr)
+    elif sensor == "ACC":
+        modes, low_power_wakeups = _column(configs, 0), _column(configs, 1, float)
+        digital_low_passes, sample_rate_divisors = _column(configs, 2), _column(configs, 3, float)
+        min_rate = acc_min_sampling_rate(digital_low_passes, sample_rate_divisors)
+        power_fn = lambda i, sr: MPU6000.get_mode_power_array(MPU6000, modes[i], low_power_wakeups[i], digital_low_passes[i], sample_rate_divisors[i], sr)
+        data_fn = lambda i, sr: MPU6000.get_bytes_per_second_array(MPU6000, modes[i], sr)
+    else:
+        modes, sample_freqs, num_averages = _column(configs, 0), _column(configs, 1, float), _column(configs, 2, float)
+        min_rate = np.full(len(configs), 0.0005)
+        # the simulation uses the overestimated power, see BM1422.get_segment_rates()
+        power_fn = lambda i, sr: BM1422.compute_power_overest_array(BM1422, modes[i], sample_freqs[i], num_averages[i], sr)
+        data_fn = lambda i, sr: BM1422.compute_data_array(BM1422, modes[i], sr)
+
+    # every configuration is repeated once per sampling rate
+    config_index = np.repeat(np.arange(len(configs)), len(sampling_rates))
+    sampling_rate = np.tile(sampling_rates, len(configs))
+    # strictly above the minimum, at the minimum itself the power models fall back to 0 mW
+    allowed = sampling_rate > min_rate[config_index]
+    config_index, sampling_rate = config_index[allowed], sampling_rate[allowed]
+    return power_fn(config_index, sampling_rate), data_fn(config_index, sampling_rate), config_index, sampling_rate
+
+def pareto_mask(power, data):
+    """
+    Returns a boolean mask of the points that are not dominated, i.e. no other point uses at most as much power
+    while producing at least as much data, and is strictly better in one of them. Of identical points only one
+    is kept. The sampling rate is not a third objective: within a configuration the data rate already is
+    bytes per sample / sampling rate, and the sampling rates of different sensors do not add up to a system value.
+
+    Parameters
+        power (numpy array): power of each point (mW).
+        data (numpy array): data rate of each point (bytes per second).
+    """
+    power = np.asarray(power, dtype=float)
+    data = np.asarray(data, dtype=float)
+    mask = np.zeros(len(power), dtype=bool)
+    if len(power) == 0:
+        return mask
+    order = np.lexsort((-data, power)) # increasing power, most data first among equal power
+    sorted_data = data[order]
+    # a point survives if it produces more data than every cheaper (or equally cheap, earlier) point
+    best_before = np.concatenate(([-np.inf], np.maximum.accumulate(sorted_data)[:-1]))
+    mask[order[sorted_data > best_before]] = True
+    return mask
+
+def pareto_front(sampling_rates, max_power=None, min_data=None, configs=None):
+    """
+    Finds the non-dominated full-system configurations in (total power, total data rate), see pareto_mask().
+    Total power and data are the sums over the sensors, so the fronts of the single sensors are merged one
+    sensor at a time. After each merge, dominated partial systems and partial systems that can no longer meet
+    max_power or min_data are dropped. A merge forms at most MERGE_CHUNK partial systems at once and prunes
+    them before forming the next ones.
+
+    Example, every system under 2 mW producing at least 50 bytes per second:
+        config_list, sampling_rates_list, power, data = pareto_front([0.05, 0.1, 1, 10], max_power=2, min_data=50)
+        bitstrings = generate_bitstrings(config_list)
+
+    Parameters
+        sampling_rates (list): seconds between samples to try for every sensor, or a list of five such lists in
+            the order of SENSOR_NAMES.
+        max_power (float): power ceiling of the whole system (mW).
+        min_data (float): data rate floor of the whole system (bytes per second).
+        configs (list): five lists of configurations to try in the order of SENSOR_NAMES, None entries use all
+            valid configurations.
+
+    Returns
+        config_list: nested list of configurations for TP, CAP, TMP, ACC, MAG sensors, ready for generate_bitstrings()
+        sampling_rates_list: nested list of the matching sampling rates, ready for generate_dataset()
+        power: numpy array of the total power of each system (mW)
+        data: numpy array of the total data rate of each system (bytes per second)
+        The systems are sorted by increasing power.
+    """
+    if len(sampling_rates) > 0 and np.ndim(sampling_rates[0]) > 0:
+        rates_per_sensor = sampling_rates
+    else:
+        rates_per_sensor = [sampling_rates] * len(SENSOR_NAMES)
+    if configs is None:
+        configs = [None] * len(SENSOR_NAMES)
+
+    fronts = []
+    for sensor, rates, sensor_configs in zip(SENSOR_NAMES, rates_per_sensor, configs):
+        if sensor_configs is None:
+            sensor_configs = SENSOR_CLASSES[sensor].generate_valid_configs(SENSOR_CLASSES[sensor])
+        power, data, config_index, rate = sensor_candidates(sensor, rates, sensor_configs)
+        keep = pareto_mask(power, data)
+        fronts.append((sensor_configs, power[keep], data[keep], config_index[keep], rate[keep]))
+
+    # bounds on what the sensors that are not merged yet can still add
+    min_power_left = np.cumsum([front[1].min() if len(front[1]) > 0 else np.inf for front in fronts][::-1])[::-1]
+    max_data_left = np.cumsum([front[2].max() if len(front[2]) > 0 else -np.inf for front in fronts][::-1])[::-1]
+    min_power_left = np.append(min_power_left[1:], 0)
+    max_data_left = np.append(max_data_left[1:], 0)
+
+    # each row of choice holds the index into every merged sensor's front
+    power = np.zeros(1)
+    data = np.zeros(1)
+    choice = np.zeros((1, 0), dtype=np.int64)
+    for i, front in enumerate(fronts):
+        n = len(front[1])
+        rows = max(MERGE_CHUNK // max(n, 1), 1)
+        parts = []
+        for start in range(0, len(power), rows):
+            part_power = (power[start:start+rows, None] + front[1][None, :]).ravel()
+            part_data = (data[start:start+rows, None] + front[2][None, :]).ravel()
+            part_choice = np.hstack((np.repeat(choice[start:start+rows], n, axis=0), np.tile(np.arange(n), len(choice[start:start+rows]))[:, None]))
+            keep = pareto_mask(part_power, part_data)
+            if max_power is not None:
+                keep &= part_power + min_power_left[i] <= max_power
+            if min_data is not None:
+                keep &= part_data + max_data_left[i] >= min_data
+            parts.append((part_power[keep], part_data[keep], part_choice[keep]))
+        if len(parts) == 0:
+            return [], [], np.zeros(0), np.zeros(0)
+        power = np.concatenate([part[0] for part in parts])
+        data = np.concatenate([part[1] for part in parts])
+        choice = np.concatenate([part[2] for part in parts])
+        if len(parts) > 1: # a partial system can be dominated by one of another chunk
+            keep = pareto_mask(power, data)
+            power, data, choice = power[keep], data[keep], choice[keep]
+
+    order = np.argsort(power, kind="stable")
+    power, data, choice = power[order], data[order], choice[order]
+    config_list = []
+    sampling_rates_list = []
+    for row in choice:
+        config_list.append([front[0][front[3][j]] for front, j in zip(fronts, row)])
+        sampling_rates_list.append([float(front[4][j]) for front, j in zip(fronts, row)])
+    return config_list, sampling_rates_list, power, data
@@ -0,0 +1,71 @@
+import numpy as np
+from source.TMP117 import TMP117, CONVERSION_DURATION
+
+def sweep_tmp(sampling_rates, configs=None) -> np.ndarray:
+    """
+    Tabulates the average power and data rate of every TMP117 configuration at every sampling rate in one
+    vectorized evaluation of the compute_power / compute_data formulas.
+
+    Parameters
+        sampling_rates (list or numpy array): seconds between samples to try for every configuration. Rates at or
+            below the 15.5 ms conversion time are rejected by validate_configs() and are skipped, like in
+            configOptimizer.sensor_candidates().
+        configs (list): configurations (mode, num_averages, conv_cycle_time). Defaults to all valid configurations.
+
+    Returns
+        numpy structured array with one row per (configuration, sampling rate) and the fields
+        mode, num_averages, conv_cycle_time, sampling_rate, power (mW) and data (bytes per second).
+    """
+    if configs is None:
+        configs = TMP117.generate_valid_configs_tmp(TMP117)
+    sampling_rates = np.asarray(sampling_rates, dtype=float).ravel()
+    sampling_rates = sampling_rates[sampling_rates > CONVERSION_DURATION]
+
+    modes = np.array([config[0] for config in configs])
+    num_averages = np.array([config[1] for config in configs], dtype=float)
+    conv_cycle_times = np.array([config[2] for config in configs], dtype=float)
+
+    # every configuration is repeated once per sampling rate
+    count = len(sampling_rates)
+    table = np.zeros(len(configs) * count, dtype=[
+        ("mode", modes.dtype if len(configs) > 0 else "U1"), ("num_averages", int), ("conv_cycle_time", float),
+        ("sampling_rate", float), ("power", float), ("data", float),
+    ])
+    table["mode"] = np.repeat(modes, count)
+    table["num_averages"] = np.repeat(num_averages, count)
+    table["conv_cycle_time"] = np.repeat(conv_cycle_times, count)
+    table["sampling_rate"] = np.tile(sampling_rates, len(configs))
+    table["power"] = TMP117.compute_power_array(TMP117, table["mode"], table["num_averages"], table["conv_cycle_time"], table["sampling_rate"])
+    table["data"] = TMP117.compute_data_array(TMP117, table["mode"], table["sampling_rate"])
+    return table
+
+def filter_sweep(table: np.ndarray, max_power=None, min_power=None, max_data=None, min_data=None, max_sampling_rate=None, sort_by="power") -> np.ndarray:
+    """
+    Filters and sorts a table from sweep_tmp(). For example, all configurations under 0.05 mW taking at least
+    one sample per minute: filter_sweep(table, max_power=0.05, max_sampling_rate=60)
+
+    Parameters
+        table (numpy structured array): table returned by a sweep.
+        max_power, min_power (float): limits on power (mW).
+        max_data, min_data (float): limits on data (bytes per second).
+        max_sampling_rate (float): longest allowed time between samples (s).
+        sort_by (str or list): field(s) to sort the rows by, None to keep the table order.
+
+    Returns
+        numpy structured array of the rows that meet every given limit.
+    """
+    keep = np.ones(len(table), dtype=bool)
+    if max_power is not None:
+        keep &= table["power"] <= max_power
+    if min_power is not None:
+        keep &= table["power"] >= min_power
+    if max_data is not None:
+        keep &= table["data"] <= max_data
+    if min_data is not None:
+        keep &= table["data"] >= min_data
+    if max_sampling_rate is not None:
+        keep &= table["sampling_rate"] <= max_sampling_rate
+    rows = table[keep]
+    if sort_by is not None:
+        rows = np.sort(rows, order=sort_by, kind="stable")
+    return rows
@@ -1,8 +1,145 @@
-from source.MPU6000 import *
-from source.CAP11NA import *
-from source.BM1422 import *
-from source.TMP117 import *
-from source.TPIS1S1385 import *
+import re
+from operator import itemgetter
+import numpy as np
+from source.MPU6000 import MPU6000
+from source.CAP11NA import CAP11NA
+from source.BM1422 import BM1422
+from source.TMP117 import TMP117
+from source.TPIS1S1385 import TPIS1S1385
+
+# Options of every bitstring field in the order of divide_bitstring(). The bits of a field are the index of the option.
+BITSTRING_FIELDS = [
+    ("TP Mode", ["TP_ON", "TP_OFF"]),
+    ("CAP Mode", ["CAP_ON", "CAP_OFF"]),
+    ("TMP No. Averages", [0, 8, 32, 64]),
+    ("TMP Conv. Cycle Time", [0, 0.0155, 0.125, 0.25, 0.5, 1, 4, 8, 16]), # 0 used only for SHUTDOWN
+    ("TMP Mode", ["CONTINUOUS_CONVERSION", "ONE_SHOT", "SHUTDOWN"]),
+    ("ACC Low Power", [0, 1.25, 5, 20, 40]), # 0 used for all modes except ACCELEROMETER_LOW_POWER
+    ("ACC Dig. Low Pass", ["000", "001", "010", "011", "100", "101", "110", "111"]),
+    ("ACC SRD", [i for i in range(256)]),
+    ("ACC Mode", ["ACCELEROMETER", "ACCELEROMETER_LOW_POWER", "GYROSCOPE", "GYROSCOPE_DMP", "ACCELEROMETER_AND_GYROSCOPE", "ACCELEROMETER_AND_GYROSCOPE_DMP", "SHUTDOWN"]),
+    ("MAG No. Averages", [0, 1, 2, 4, 8, 16]), # 0 only used for POWER_DOWN
+    ("MAG Freq.", [0, 10, 20, 100, 1000]), # 0 only used POWER_DOWN
+    ("MAG Mode", ["CONTINUOUS", "SINGLE", "POWER_DOWN"]),
+]
+
+# Binary dataset: header, then the bitstring codes, durations and sampling rates as little endian columns
+DATASET_MAGIC = b"LSDS"
+DATASET_VERSION = 1
+DATASET_HEADER = np.dtype([("magic", "S4"), ("version", "<u2"), ("bitstring_length", "<u2"), ("count", "<u4"),
+                           ("team_no", "<i4"), ("team_name", "S64")]) # 80 bytes, keeps the columns aligned
+DATASET_CODE = np.dtype("<u8")
+DATASET_DURATION = np.dtype("<u4")
+DATASET_SAMPLING_RATE = np.dtype("<f4")
+
+# Field tables of the codec, built once. The first field takes the most significant bits.
+BITSTRING_WIDTHS = [(len(options)-1).bit_length() for name, options in BITSTRING_FIELDS]
+BITSTRING_LENGTH = sum(BITSTRING_WIDTHS)
+BITSTRING_SHIFTS = [BITSTRING_LENGTH - sum(BITSTRING_WIDTHS[:i+1]) for i in range(len(BITSTRING_FIELDS))]
+BITSTRING_FORMAT = '0' + str(BITSTRING_LENGTH) + 'b'
+_FIELD_CODES = [{option: index << shift for index, option in enumerate(options)} for (name, options), shift in zip(BITSTRING_FIELDS, BITSTRING_SHIFTS)]
+(_TP_CODES, _CAP_CODES, _TMP_AVERAGES_CODES, _TMP_CONV_CODES, _TMP_MODE_CODES, _ACC_LOWPOWER_CODES, _ACC_LOWPASS_CODES,
+ _ACC_SRD_CODES, _ACC_MODE_CODES, _MAG_AVERAGES_CODES, _MAG_FREQ_CODES, _MAG_MODE_CODES) = _FIELD_CODES
+_FIELD_OPTIONS = [np.array(options, dtype=object) for name, options in BITSTRING_FIELDS]
+_FIELD_INDICES = [{option: index for index, option in enumerate(options)} for name, options in BITSTRING_FIELDS]
+
+def config_fields(config):
+    """
+      Returns the values of a configuration in the field order of BITSTRING_FIELDS
+    """
+    tp, cap, tmp, acc, mag = config
+    return [tp, cap, tmp[1], tmp[2], tmp[0], acc[1], acc[2], acc[3], acc[0], mag[2], mag[1], mag[0]]
+
+# (item of the sensor configuration, field in BITSTRING_FIELDS) for TP, CAP, TMP, ACC, MAG, the same order as config_fields()
+_SENSOR_FIELDS = [[(None, 0)], [(None, 1)], [(1, 2), (2, 3), (0, 4)], [(1, 5), (2, 6), (3, 7), (0, 8)], [(2, 9), (1, 10), (0, 11)]]
+
+def encode_config(config):
+    """
+      Packs one configuration into an integer, the number generate_bitstrings() writes in binary
+
+      Parameters
+      ----------
+        config: list of configurations for TP, CAP, TMP, ACC, MAG sensors
+
+      Returns
+      -------
+        int
+    """
+    tp, cap, tmp, acc, mag = config
+    return (_TP_CODES[tp] | _CAP_CODES[cap]
+            | _TMP_AVERAGES_CODES[tmp[1]] | _TMP_CONV_CODES[tmp[2]] | _TMP_MODE_CODES[tmp[0]]
+            | _ACC_LOWPOWER_CODES[acc[1]] | _ACC_LOWPASS_CODES[acc[2]] | _ACC_SRD_CODES[acc[3]] | _ACC_MODE_CODES[acc[0]]
+            | _MAG_AVERAGES_CODES[mag[2]] | _MAG_FREQ_CODES[mag[1]] | _MAG_MODE_CODES[mag[0]])
+
+def encode_configs(config_list):
+    """
+      Packs many configurations into integers at once
+
+      Parameters
+      ----------
+        config_list: nested list of configurations for TP, CAP, TMP, ACC, MAG sensors
+
+      Returns
+      -------
+        numpy uint64 array with one code per configuration
+    """
+    codes = np.zeros(len(config_list), dtype=np.uint64)
+    if len(config_list) == 0:
+        return codes
+    for sensor, fields in enumerate(_SENSOR_FIELDS):
+        column = list(map(itemgetter(sensor), config_list))
+        # a sweep repeats few configurations per sensor, so the field indices are looked up once per distinct configuration
+        unique = {value: i for i, value in enumerate(dict.fromkeys(column))}
+        inverse = np.fromiter(map(unique.__getitem__, column), dtype=np.intp, count=len(column))
+        for item, field in fields:
+            indices = np.array([_FIELD_INDICES[field][value if item is None else value[item]] for value in unique], dtype=np.uint64)
+            np.bitwise_or(codes, np.left_shift(indices[inverse], np.uint64(BITSTRING_SHIFTS[field])), out=codes)
+    return codes
+
+def decode_configs(codes):
+    """
+      Unpacks integers from encode_configs() back into configurations
+
+      Parameters
+      ----------
+        codes: int or array of ints
+
+      Returns
+      -------
+        nested list of configurations for TP, CAP, TMP, ACC, MAG sensors
+    """
+    codes = np.atleast_1d(np.asarray(codes, dtype=np.uint64))
+    columns = []
+    for (name, options), width, shift in zip(BITSTRING_FIELDS, BITSTRING_WIDTHS, BITSTRING_SHIFTS):
+        indices = (codes >> np.uint64(shift)) & np.uint64((1 << width) - 1)
+        if np.any(indices >= len(options)):
+            raise ValueError("Invalid bits for " + name + ".")
+        columns.append(_FIELD_OPTIONS[len(columns)][indices.astype(np.intp)])
+    tp, cap, tmp_averages, tmp_conv, tmp_mode, acc_lowpower, acc_lowpass, acc_srd, acc_mode, mag_averages, mag_freq, mag_mode = columns
+    return [[tp[i], cap[i], (tmp_mode[i], tmp_averages[i], tmp_conv[i]), (acc_mode[i], acc_lowpower[i], acc_lowpass[i], acc_srd[i]), (mag_mode[i], mag_freq[i], mag_averages[i])] for i in range(len(codes))]
+
+def decode_config(code):
+    """
+      Unpacks one integer from encode_config() back into its configurations
+    """
+    return decode_configs([code])[0]
+
+def decode_bitstring(bitstring):
+    """
+      Converts a bitstring from generate_bitstrings() back into its configurations
+
+      Parameters
+      ----------
+        bitstring: string starting with '0b'
+
+      Returns
+      -------
+        list of configurations for TP, CAP, TMP, ACC, MAG sensors
+    """
+    bits = bitstring[2:] if bitstring.startswith("0b") else bitstring
+    if len(bits) != BITSTRING_LENGTH:
+        raise ValueError("Bitstring " + bitstring + " should have " + str(BITSTRING_LENGTH) + " bits.")
+    return decode_config(int(bits, 2))
 
 def convert_int_to_binary(n):
     bin_n = bin(n)
@@ -20,28 +157,22 @@ def validate_configs(config_list, sampling_rates_list, duration_list):
           -------
             True if a configuration is invalid, False otherwise
         """
-    valid_TMP = TMP117.generate_valid_configs_tmp(TMP117)
-    valid_ACC = MPU6000.generate_valid_configs_acc(MPU6000)
-    valid_MAG = BM1422.generate_valid_configs_mag(BM1422)
-    valid_TP = TPIS1S1385.generate_valid_configs_tp(TPIS1S1385)
-
-    valid_CAP = [("CAP_ON"), ("CAP_OFF")]
     counter = 0
     for set_configs in config_list:
         counter+=1
-        if set_configs[0] not in valid_TP:
+        if not TPIS1S1385.is_valid_config(set_configs[0]):
             print('TP configuration ' + str(counter) + ' is invalid')
             return False
-        if set_configs[1] not in valid_CAP:
+        if not CAP11NA.is_valid_config(set_configs[1]):
             print('CAP configuration ' + str(counter) + ' is invalid')
             return False
-        if set_configs[2] not in valid_TMP:
+        if not TMP117.is_valid_config(set_configs[2]):
             print('TMP configuration ' + str(counter) + ' is invalid')
             return False
-        if set_configs[3] not in valid_ACC:
+        if not MPU6000.is_valid_config(set_configs[3]):
             print('ACC configuration ' + str(counter) + ' is invalid')
             return False
-        if set_configs[4] not in valid_MAG:
+        if not BM1422.is_valid_config(set_configs[4]):
             print('MAG configuration ' + str(counter) + ' is invalid')
             return False
     counter = 0
@@ -93,226 +224,7 @@ def generate_bitstrings(config_list):
       -------
         list of bitstrings
     """
-    # Retrieve all possible configurations
-    valid_TMP = TMP117.generate_valid_configs_tmp(TMP117)
-    valid_ACC = MPU6000.generate_valid_configs_acc(MPU6000)
-    valid_MAG = BM1422.generate_valid_configs_mag(BM1422)
-    valid_TP = TPIS1S1385.generate_valid_configs_tp(TPIS1S1385)
-    valid_CAP = [("CAP_ON"), ("CAP_OFF")]
-    
-    dict_tp = {}
-    dict_cap = {}
-    
-    # Assign binary numbers to each possible configuration
-    
-    
-    # TMP
-    num_averages_options = [0, 8, 32, 64]
-    dict_tmp_averages = {}
-    conv_cycle_time_options = [0, 0.0155, 0.125, 0.25, 0.5, 1, 4, 8, 16] # 0 used only for SHUTDOWN
-    dict_tmp_conv = {}
-    mode_options = ["CONTINUOUS_CONVERSION", "ONE_SHOT", "SHUTDOWN"]
-    dict_tmp_modes = {}
-    
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(num_averages_options)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in num_averages_options:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_tmp_averages[option] = bits
-        
-        counter+=1
-        
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(conv_cycle_time_options)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in conv_cycle_time_options:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_tmp_conv[option] = bits
-        
-        counter+=1
-        
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(mode_options)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in mode_options:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_tmp_modes[option] = bits
-        
-        counter+=1
-    
-
-        
-    # MAG
-    num_averages_options = [0, 1, 2, 4, 8, 16] # 0 only used for POWER_DOWN
-    dict_mag_averages = {}
-    freq_options = [0, 10, 20, 100, 1000] # 0 only used POWER_DOWN
-    dict_mag_freq = {}
-    mode_options = ["CONTINUOUS", "SINGLE", "POWER_DOWN"]
-    dict_mag_modes = {}
-    
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(num_averages_options)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in num_averages_options:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_mag_averages[option] = bits
-        
-        counter+=1
-        
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(freq_options)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in freq_options:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_mag_freq[option] = bits
-        
-        counter+=1
-
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(mode_options)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in mode_options:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_mag_modes[option] = bits
-        
-        counter+=1
-    
-    # ACC - TODO: Revise when sampling_rate_divisor becomes its own parameter
-    low_power_wakeup = [0, 1.25, 5, 20, 40] # 0 used for all modes except ACCELEROMETER_LOW_POWER
-    dict_acc_lowpower = {}
-    digital_low_pass = ["000", "001", "010", "011", "100", "101", "110", "111" ]
-    dict_acc_lowpass = {}
-    sampling_rate_divisor = [i for i in range(256)]
-    dict_acc_srd = {}
-    mode_options = ["ACCELEROMETER", "ACCELEROMETER_LOW_POWER", "GYROSCOPE", "GYROSCOPE_DMP", "ACCELEROMETER_AND_GYROSCOPE", "ACCELEROMETER_AND_GYROSCOPE_DMP", "SHUTDOWN"]
-    dict_acc_modes = {}
-    
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(low_power_wakeup)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in low_power_wakeup:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_acc_lowpower[option] = bits
-        
-        counter+=1
-    
-    
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(digital_low_pass)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in digital_low_pass:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_acc_lowpass[option] = bits
-        
-        counter+=1
-        
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(sampling_rate_divisor)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in sampling_rate_divisor:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_acc_srd[option] = bits
-        
-        counter+=1
-        
-    counter = 0
-    maxlength = len(convert_int_to_binary(len(mode_options)-1)) # Calculate length of longest binary string for parameter
-    
-    for option in mode_options:
-        bits = convert_int_to_binary(counter) # Find binary number for option
-        
-        for i in range(0,maxlength - len(bits)): # Append 0s to front so that all bitstrings are same length
-            bits = "0" + bits
-            
-        dict_acc_modes[option] = bits
-        
-        counter+=1
-    
-    
-    # Only two possible configs for these sensors, no need for complex bit assignments
-    
-    counter = 0
-    for config in valid_TP:
-        dict_tp[config] = convert_int_to_binary(counter)
-        counter+=1
-    counter = 0
-    for config in valid_CAP:
-        dict_cap[config] = convert_int_to_binary(counter)
-        counter+=1
-        
-    # Create bitstrings
-    bitstrings = []
-    for config in config_list:
-        bitstring = '0b'
-        #bitstring+="|"
-        bitstring+=dict_tp[config[0]] # Thermopile
-        #bitstring+="|"
-        bitstring+=dict_cap[config[1]] # Capacitive
-        #bitstring+="|"
-        
-        bitstring+=dict_tmp_averages[config[2][1]] # Temperature
-        #bitstring+="|"
-        bitstring+=dict_tmp_conv[config[2][2]]
-        #bitstring+="|"
-        bitstring+=dict_tmp_modes[config[2][0]]
-        #bitstring+="|"
-              
-        bitstring+=dict_acc_lowpower[config[3][1]]
-        #bitstring+="|"
-        bitstring+=dict_acc_lowpass[config[3][2]]
-        #bitstring+="|"
-        bitstring+=dict_acc_srd[config[3][3]]
-        #bitstring+="|"
-        bitstring+=dict_acc_modes[config[3][0]]
-        #bitstring+="|"
-        
-        bitstring+=dict_mag_averages[config[4][2]] # Magnetometer
-        #bitstring+="|"
-        bitstring+=dict_mag_freq[config[4][1]]
-        #bitstring+="|"
-        bitstring+=dict_mag_modes[config[4][0]]
-        #bitstring+="|"
-        
-        bitstrings.append(bitstring)
-    
-    return bitstrings
+    return ['0b' + format(encode_config(config), BITSTRING_FORMAT) for config in config_list]
 
 def divide_bitstring(): # Call to see how bitstring is divided up.
     """
@@ -329,7 +241,30 @@ def divide_bitstring(): # Call to see how bitstring is divided up.
     print("Bitstring Format: 0b| TP Mode | CAP Mode | TMP No. Averages | TMP Conv. Cycle Time | TMP Mode | ACC Low Power | ACC Dig. Low Pass | ACC SRD | ACC Mode | Mag No. Averages | Mag Freq. | MAG Mode |")
     print("Bitstring Size: 0b| 1 bit | 1 bit | 2 bits | 4 bits | 2 bits | 3 bits | 3 bits | 8 bits | 3 bits | 3 bits | 3 bits | 2 bits |")
     
-        
+
+def format_dataset(bitstrings, duration_list, sampling_rates_list, team_name, team_no):
+    """
+      Returns the text generate_dataset() writes to file
+
+      Parameters
+      ----------
+        bitstrings: list of bitstrings
+        duration_list: list of integers
+        sampling_rates_list: nested list of floats
+        team_name: string
+        team_no: int
+
+      Returns
+      -------
+        string
+    """
+    sampling_rates = ["{" + ",".join(str(float(sr)) for sr in sampling_rates[:5]) + "}" for sampling_rates in sampling_rates_list[:len(bitstrings)]]
+    return ("team_no: " + str(team_no) + "\n"
+            + "team_name: " + str(team_name) + "\n"
+            + "Bitstrings: {" + ",".join(bitstrings) + "}\n"
+            + "Durations: {" + ",".join(str(duration) for duration in duration_list[:len(bitstrings)]) + "}\n"
+            + "Sampling Rates: {" + ",".join(sampling_rates) + "}\n")
+
 def generate_dataset(config_list, duration_list, sampling_rates_list, team_name, team_no):
     """
       Generates dataset of bitstrings, durations, and sampling rates, and writes dataset to file.
@@ -348,36 +283,164 @@ def generate_dataset(config_list, duration_list, sampling_rates_list, team_name,
     """
     bitstrings = generate_bitstrings(config_list)
     file_name = str(team_no) + '_' + str(team_name) + '.txt'
-    f = open("outputs/" + file_name, 'w+')  # create file if doesn't exists otherwise open in overwrite mode
-    f.write("team_no: " + str(team_no) + "\n")
-    f.write("team_name: " + str(team_name) + "\n")
-    f.write("Bitstrings: {")
-    for i in range(0,len(bitstrings)-1):
-        f.write(bitstrings[i])
-        f.write(",")
-    f.write(bitstrings[-1])
-    f.write("}\n")
-    f.write("Durations: {")
-    for i in range(0,len(bitstrings)-1):
-        f.write(str(duration_list[i]))
-        f.write(",")
-    f.write(str(duration_list[-1]))
-    f.write("}\n")
-    f.write("Sampling Rates: {")
-    for i in range(0,len(bitstrings)-1):
-        f.write("{")
-        for d in range(0,4):
-            f.write(str(float(sampling_rates_list[i][d])))
-            f.write(",")
-        f.write(str(float(sampling_rates_list[i][4])) + "},")
-    f.write("{")
-    for d in range(0,4):
-        f.write(str(float(sampling_rates_list[-1][d])))
-        f.write(",")
-    f.write(str(float(sampling_rates_list[-1][4])) + "}")
-    f.write("}\n")
-    f.close()
-    f = open("outputs/" + file_name, 'r') 
+    text = format_dataset(bitstrings, duration_list, sampling_rates_list, team_name, team_no)
+    with open("outputs/" + file_name, 'w+') as f: # create file if doesn't exists otherwise open in overwrite mode
+        f.write(text)
     print("Your configuration information is located at outputs/" + str(file_name) + ". Check the directory tree on the left side of this screen to verify that it is there in the outputs folder.")
-    print(f.read())
-    return 0
\ No newline at end of file
+    print(text)
+    return 0
+
+def read_dataset(file_name):
+    """
+      Reads a dataset written by generate_dataset()
+
+      Parameters
+      ----------
+        file_name: path of the dataset, e.g. "outputs/0_EXAMPLE_ARDUINO_CONFIGS.txt"
+
+      Returns
+      -------
+        team_no: int
+        team_name: string
+        bitstrings: list of bitstrings
+        duration_list: list of floats
+        sampling_rates_list: nested list of floats
+    """
+    fields = {}
+    with open(file_name, 'r') as f:
+        for line in f:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                fields[key.strip()] = value.strip()
+    bitstrings = re.findall(r'0b[01]+', fields["Bitstrings"])
+    duration_list = [float(d) for d in fields["Durations"].strip("{}").split(",")]
+    sampling_rates_list = [[float(sr) for sr in group.split(",")] for group in re.findall(r'\{([^{}]*)\}', fields["Sampling Rates"])]
+    return int(fields["team_no"]), fields["team_name"], bitstrings, duration_list, sampling_rates_list
+
+def write_binary_dataset(file_name, codes, duration_list, sampling_rates_list, team_name, team_no):
+    """
+      Writes a dataset in the binary format with a single write: a DATASET_HEADER, one uint64 bitstring code
+      per configuration, one uint32 duration per configuration and a float32 matrix of 5 sampling rates
+      (TP, CAP, TMP, ACC, MAG) per configuration
+
+      Parameters
+      ----------
+        file_name: path of the file to write
+        codes: bitstring codes from encode_configs()
+        duration_list: list of integers (seconds), from 0 to 2**32 - 1
+        sampling_rates_list: nested list of floats, finite and non negative
+        team_name: string, at most 64 bytes
+        team_no: int
+
+      Returns
+      -------
+        number of bytes written
+    """
+    codes = np.asarray(codes, dtype=DATASET_CODE)
+    durations = np.asarray(duration_list, dtype=float)
+    sampling_rates = np.asarray(sampling_rates_list, dtype=float).reshape(-1, 5)
+    name = str(team_name).encode("utf-8")
+    if len(name) > DATASET_HEADER["team_name"].itemsize:
+        raise ValueError("Team name " + str(team_name) + " is too long for the binary format.")
+    if len(durations) != len(codes) or len(sampling_rates) != len(codes):
+        raise ValueError("Every bitstring needs one duration and one set of sampling rates.")
+    if np.any(durations < 0) or np.any(durations > np.iinfo(DATASET_DURATION).max) or np.any(durations != np.round(durations)):
+        raise ValueError("Durations have to be whole seconds from 0 to " + str(np.iinfo(DATASET_DURATION).max) + " in the binary format.")
+    if not np.all((sampling_rates >= 0) & (sampling_rates <= np.finfo(DATASET_SAMPLING_RATE).max)):
+        raise ValueError("Sampling rates have to be finite and non negative in the binary format.")
+    header = np.array([(DATASET_MAGIC, DATASET_VERSION, BITSTRING_LENGTH, len(codes), team_no, name)], dtype=DATASET_HEADER)
+    buffer = b"".join([header.tobytes(), codes.tobytes(), durations.astype(DATASET_DURATION).tobytes(), sampling_rates.astype(DATASET_SAMPLING_RATE).tobytes()])
+    with open(file_name, 'wb') as f:
+        f.write(buffer)
+    return len(buffer)
+
+def generate_binary_dataset(config_list, duration_list, sampling_rates_list, team_name, team_no):
+    """
+      Generates dataset of bitstrings, durations, and sampling rates like generate_dataset(), but writes
+      it in the binary format of write_binary_dataset() to outputs/<team_no>_<team_name>.bin
+
+      Returns
+      -------
+        0 once complete
+    """
+    file_name = str(team_no) + '_' + str(team_name) + '.bin'
+    size = write_binary_dataset("outputs/" + file_name, encode_configs(config_list), duration_list, sampling_rates_list, team_name, team_no)
+    print("Your configuration information is located at outputs/" + str(file_name) + " (" + str(size) + " bytes).")
+    return 0
+
+def read_binary_dataset(file_name, mmap=True):
+    """
+      Reads a dataset written by write_binary_dataset() without parsing
+
+      Parameters
+      ----------
+        file_name: path of the binary dataset
+        mmap: True to map the columns with np.memmap, False to read the file and use np.frombuffer
+
+      Returns
+      -------
+        team_no: int
+        team_name: string
+        codes: uint64 numpy array of bitstring codes, see decode_configs()
+        durations: uint32 numpy array
+        sampling_rates: float32 numpy array of shape (configurations, 5)
+    """
+    with open(file_name, 'rb') as f:
+        data = f.read(DATASET_HEADER.itemsize) if mmap else f.read()
+    header = np.frombuffer(data, dtype=DATASET_HEADER, count=1)[0]
+    if header["magic"] != DATASET_MAGIC or header["version"] != DATASET_VERSION or header["bitstring_length"] != BITSTRING_LENGTH:
+        raise ValueError(str(file_name) + " is not a binary dataset of this version.")
+    count = int(header["count"])
+    offsets = np.cumsum([DATASET_HEADER.itemsize, count * DATASET_CODE.itemsize, count * DATASET_DURATION.itemsize])
+    if mmap:
+        # np.memmap cannot map 0 bytes
+        column = lambda dtype, offset, shape: np.memmap(file_name, dtype=dtype, mode='r', offset=offset, shape=shape) if count > 0 else np.zeros(shape, dtype=dtype)
+    else:
+        column = lambda dtype, offset, shape: np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+    codes = column(DATASET_CODE, offsets[0], (count,))
+    durations = column(DATASET_DURATION, offsets[1], (count,))
+    sampling_rates = column(DATASET_SAMPLING_RATE, offsets[2], (count, 5))
+    return int(header["team_no"]), header["team_name"].decode("utf-8"), codes, durations, sampling_rates
+
+def text_to_binary(text_file, binary_file=None):
+    """
+      Converts a dataset from generate_dataset() to the binary format
+
+      Parameters
+      ----------
+        text_file: path of the text dataset
+        binary_file: path to write, defaults to text_file with the extension .bin
+
+      Returns
+      -------
+        path of the binary dataset
+    """
+    if binary_file is None:
+        binary_file = text_file.rsplit(".", 1)[0] + ".bin"
+    team_no, team_name, bitstrings, duration_list, sampling_rates_list = read_dataset(text_file)
+    codes = [int(bitstring, 2) for bitstring in bitstrings]
+    write_binary_dataset(binary_file, codes, duration_list, sampling_rates_list, team_name, team_no)
+    return binary_file
+
+def binary_to_text(binary_file, text_file=None):
+    """
+      Converts a binary dataset back to the text format of generate_dataset(). Sampling rates are written
+      as the shortest decimal that round trips through float32, so 0.0155 stays 0.0155.
+
+      Parameters
+      ----------
+        binary_file: path of the binary dataset
+        text_file: path to write, defaults to binary_file with the extension .txt
+
+      Returns
+      -------
+        path of the text dataset
+    """
+    if text_file is None:
+        text_file = binary_file.rsplit(".", 1)[0] + ".txt"
+    team_no, team_name, codes, durations, sampling_rates = read_binary_dataset(binary_file, mmap=False)
+    bitstrings = ['0b' + format(code, BITSTRING_FORMAT) for code in codes.tolist()]
+    sampling_rates_list = [[float(str(sr)) for sr in row] for row in sampling_rates]
+    with open(text_file, 'w') as f:
+        f.write(format_dataset(bitstrings, durations.tolist(), sampling_rates_list, team_name, team_no))
+    return text_file
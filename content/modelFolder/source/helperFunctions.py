@@ -1,6 +1,8 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import random
+from source.Trace import Trace, PowerTrace, DataTrace
+
+CHUNK_SIZE = 2**20 # samples per chunk of the streaming simulations, 8 MB per float64 vector
+DATARATE_LIMIT = 1000 # Bytes per second the LunaSat can store
 
 def generate_active_list(total_time: float, modelist: list) -> list:
     """
@@ -14,99 +16,361 @@ def generate_active_list(total_time: float, modelist: list) -> list:
     returns:
         final_arr, list of active times of each mode
     """
+    period, repeats, tail = generate_periodic_schedule(total_time, modelist)
+    period_length = period[-1][1]
+    final_arr = [(start + i*period_length, end + i*period_length, mode, sampling_rate)
+                 for i in range(repeats) for start, end, mode, sampling_rate in period]
+    return final_arr + tail
+    #final_arr is a list of tuples in the form (start, stop, mode): [(start,stop, mode), ...]
+
+def generate_periodic_schedule(total_time: float, modelist: list) -> tuple:
+    """
+    Returns the schedule of generate_active_list() as one period, a repeat count and a tail, without
+    expanding the repeated periods. The number of entries is O(len(modelist)) for any total_time.
+
+    Parameters
+        total_time (float): total active time of the sensor, ie 10 seconds or 10 hours.
+        modelist (list): numpy array describing scheduling period
+
+    returns:
+        period, list of active times of one pass through modelist starting at 0: [(start, end, mode, sampling_rate), ...]
+        repeats, number of complete periods that fit in total_time
+        tail, list of active times after the last complete period, starting at repeats * period length
+    """
+    durations = [int(item[1]) for item in modelist]
+    if any(duration < 0 for duration in durations):
+        raise ValueError("Error. Mode durations cannot be negative.")
+    if sum(durations) <= 0:
+        raise ValueError("Error. The modes list needs at least one mode lasting 1 second or more.")
 
-    modelist = np.array(modelist,dtype=object)
-    keys = modelist[:,0]
-    final_arr = []
+    period = []
     curr_time = 0
-    flag = False
-    while curr_time < total_time:
-        #for val in values:
-        for item in modelist:
-            mode_duration = int(item[1])
-            if curr_time+mode_duration>total_time:
-                flag = True
+    for item, mode_duration in zip(modelist, durations):
+        period.append((curr_time, curr_time+mode_duration, item[0], item[2]))
+        curr_time += mode_duration
+    period_length = curr_time
+
+    repeats = int(total_time // period_length) if total_time > 0 else 0
+    curr_time = repeats * period_length
+    tail = []
+    if curr_time < total_time:
+        for item, mode_duration in zip(modelist, durations): # the first mode that does not fit is cut at total_time
+            if curr_time+mode_duration > total_time:
+                if curr_time < total_time:
+                    tail.append((curr_time, total_time, item[0], item[2]))
                 break
-            final_arr.append((curr_time, curr_time+mode_duration, item[0],item[2]))
+            tail.append((curr_time, curr_time+mode_duration, item[0], item[2]))
             curr_time += mode_duration
-        if flag: 
-            break
-    mode = len(final_arr) % len(modelist)
-    if final_arr[-1][1] > total_time:
-        final_arr[-1] = (final_arr[-1][0], total_time, keys[mode])
-    elif final_arr[-1][1] < total_time:
-        final_arr.append((final_arr[-1][1], total_time, keys[mode]))
-    return final_arr
-    #final_arr is a list of tuples in the form (start, stop, mode): [(start,stop, mode), ...]
+    return period, repeats, tail
 
-def plot_total_data(time_list: np.array, data_list: np.array): 
+def num_samples(total_time: float, time_step: float) -> int:
     """
-    Plot each line in data_list using time_list.
-    
+    Returns the length of np.arange(0, total_time, time_step) without creating it.
+
     Parameters
-        time_list (numpy array): list of time vectors returned from run_sim for each sensor.
-        data_list (numpy array): list of data vectors returned from run_sim for each sensor.
+        total_time (float): total active time of the sensor, ie 10 seconds or 10 hours.
+        time_step (float): seconds between simulation points.
+    """
+    return max(int(np.ceil(total_time / time_step)), 0)
 
-    Returns
-        None
+def time_chunks(total_time: float, time_step: float, chunk_size: int, extend: bool = False):
     """
-    
-    label_reference = {
-        0:"Min. Data", 1:"Accelerometer Sensor", 2:"Magnetometer Sensor", 3:"Thermopile Sensor", 
-        4:"Temperature Sensor", 5:"Capacitive Sensor", 6:"Microcontroller", 7:"Total Data"
+    Yields np.arange(0, total_time, time_step) in consecutive pieces of at most chunk_size samples, with values
+    identical to the full vector. Only one piece is held in memory at a time.
+
+    Parameters
+        total_time (float): total active time of the sensor, ie 10 seconds or 10 hours.
+        time_step (float): seconds between simulation points.
+        chunk_size (int): number of samples per piece.
+        extend (bool): if True, each piece but the last also holds the first time of the next piece, e.g. as
+            the end of the last step for Trace.average().
+
+    yields:
+        numpy array of times (s)
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size has to be at least 1.")
+    length = num_samples(total_time, time_step)
+    for start in range(0, length, chunk_size):
+        stop = min(start + chunk_size, length)
+        if extend and stop < length:
+            stop += 1
+        yield np.arange(start, stop) * time_step # the same products as np.arange(0, total_time, time_step)
+
+def mask_runs(mask: np.array) -> tuple:
+    """
+    Finds the runs of True in a boolean vector, e.g. the samples where the solar power covers the load.
+    The edges of the runs are the nonzero steps of np.diff of the padded mask, so the cost is linear.
+
+    Parameters
+        mask (numpy array): boolean vector.
+
+    returns:
+        starts, numpy array of the first index of each run
+        stops, numpy array of the index after the last index of each run
+    """
+    edges = np.diff(np.concatenate(([0], np.asarray(mask, dtype=np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+def mask_intervals(mask: np.array, time: np.array, time_step: float = None) -> np.array:
+    """
+    Returns the runs of True in mask as time windows, every sample holding its value for one time step
+    like the sensor models.
+
+    Parameters
+        mask (numpy array): boolean vector, e.g. data > limit.
+        time (numpy array): time of each sample of mask.
+        time_step (float): length of the last sample of a run. Defaults to the spacing of time.
+
+    returns:
+        float numpy array of shape (number of runs, 2) holding the (start, end) time of each run
+    """
+    time = np.asarray(time, dtype=float)
+    starts, stops = mask_runs(mask)
+    if time_step is None:
+        time_step = time[1] - time[0] if len(time) > 1 else 0
+    return np.column_stack((time[starts], time[stops - 1] + time_step)) if len(starts) > 0 else np.zeros((0, 2))
+
+def decimate_minmax(x: np.array, y: np.array, max_points: int) -> tuple:
+    """
+    Reduces a line to at most about max_points points for plotting. The samples are split into max_points / 2
+    buckets and the minimum and maximum of each bucket are kept in time order, so the drawn envelope, peaks
+    included, looks the same as the full line at screen resolution. The first and last points are always kept.
+
+    Parameters
+        x (numpy array): x values, e.g. time.
+        y (numpy array): y values of the same length.
+        max_points (int): number of points above which the line is decimated.
+
+    returns:
+        x, y numpy arrays, the inputs themselves if they have at most max_points points
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if max_points is None or len(y) <= max_points:
+        return x, y
+    bucket = int(np.ceil(len(y) / max(max_points // 2, 1)))
+    full = len(y) // bucket * bucket
+    buckets = y[:full].reshape(-1, bucket)
+    offsets = np.arange(0, full, bucket)
+    indices = [offsets + buckets.argmin(axis=1), offsets + buckets.argmax(axis=1), [0, len(y) - 1]]
+    if full < len(y): # the shorter last bucket
+        indices.append([full + y[full:].argmin(), full + y[full:].argmax()])
+    indices = np.unique(np.concatenate(indices)) # sorted, so every bucket keeps its min and max in time order
+    return x[indices], y[indices]
+
+def check_datarate(time: np.array, data: np.array, datarate_limit: float = DATARATE_LIMIT, window: float = None, time_step: float = None) -> dict:
+    """
+    Checks a cumulative data vector against a link limit without plotting. The Bytes of every window are the
+    difference of the cumulative data (a prefix sum) at its two ends, so all windows are checked in one pass.
+    Like the sensor models accumulate the data once per sample, a window of w samples may hold
+    w * datarate_limit Bytes.
+
+    Parameters
+        time (numpy array): time of each sample, e.g. returned from run_sim.
+        data (numpy array): cumulative data (Bytes) at each sample, e.g. total_data of LunaSatSystem.simulate().
+        datarate_limit (float): Bytes per second the link can take.
+        window (float): length (s) of the sliding window, e.g. 60 for the Bytes of any minute. None checks the
+            data from the start of the run as plot_total_data() does, which misses a burst after an idle period.
+        time_step (float): seconds between samples. Defaults to the spacing of time.
+
+    returns:
+        dictionary with
+            violation, boolean numpy array, True at each sample ending a window over the limit
+            violations, number of such samples
+            first_violation, time (s) of the first one, None if there are none
+            intervals, (number of intervals, 2) numpy array of the (start, end) times (s) of the violating samples
+            worst_window, (start, end) times (s) of the window closest to or furthest over the limit
+            worst_utilization, Bytes of that window divided by the Bytes it may hold
+    """
+    time = np.asarray(time, dtype=float)
+    data = np.asarray(data, dtype=float)
+    if time_step is None:
+        time_step = time[1] - time[0] if len(time) > 1 else 1
+    index = np.arange(len(data))
+    if window is None:
+        window_bytes = data
+        window_samples = index + 1
+    else:
+        samples = max(int(round(window / time_step)), 1)
+        window_bytes = data.copy()
+        window_bytes[samples:] -= data[:-samples] # the data before the start of the run is 0
+        window_samples = np.full(len(data), samples)
+    allowed = window_samples * datarate_limit
+
+    violation = window_bytes > allowed
+    if window is None:
+        violation[:1] = False # the first sample is not checked, as in plot_total_data()
+    result = {
+        "violation": violation,
+        "violations": int(np.count_nonzero(violation)),
+        "first_violation": float(time[np.argmax(violation)]) if violation.any() else None,
+        "intervals": mask_intervals(violation, time, time_step),
+        "worst_window": None,
+        "worst_utilization": 0.0,
     }
-    
-    for i in range(0,8):
-        plt.plot(time_list[i],data_list[i],label=label_reference[i])
-
-    datarate_limit = 1000
-    max_datarate = np.ones(len(data_list[0]))
-    for i in range(0,len(max_datarate)):
-        max_datarate[i] = (i * datarate_limit) + datarate_limit
-    plt.plot(time_list[0],max_datarate,label="Max. Datarate")
-    plt.grid(visible=True)
-    plt.xlabel("Time (s)",fontsize=16)
-    plt.ylabel("Data (Bytes)",fontsize=16)
-    plt.title("Data vs Time for all Components",fontsize=16)
-    plt.ion()
-    plt.tight_layout()
-    plt.legend()
-    
-    timePossible = np.where(data_list[7]>max_datarate,time_list[0],None)
-    for i in range(0,len(max_datarate)):
-        if(timePossible[i]!=None and i!=0):
-            print("ERROR! At least one of your configurations exceeds the maximum datarate at " + str(i) + " seconds.")
-            return "ERROR"
-    return "Configurations meet datarate requirements"
-    
-def plot_total_power(time_list: np.array, power_list: np.array):
+    if len(data) > 0:
+        utilization = window_bytes / allowed
+        worst = int(np.argmax(utilization))
+        result["worst_window"] = (float(time[max(worst - window_samples[worst] + 1, 0)]), float(time[worst] + time_step))
+        result["worst_utilization"] = float(utilization[worst])
+    return result
+
+def _compose_clamps(first: tuple, second: tuple) -> tuple:
+    # x -> clip(x + a, low, high) applied after another such map is again one: clip(clip(x + a1, l1, h1) + a2, l2, h2)
+    # = clip(x + a1 + a2, clip(l1 + a2, l2, h2), clip(h1 + a2, l2, h2))
+    shift, low, high = first
+    next_shift, next_low, next_high = second
+    return (shift + next_shift,
+            np.minimum(np.maximum(low + next_shift, next_low), next_high),
+            np.minimum(np.maximum(high + next_shift, next_low), next_high))
+
+def _prefix_clamps(clamps: tuple) -> tuple:
+    # inclusive scan of the clamp maps: neighbours are composed in pairs, the pairs are scanned recursively and
+    # the maps at even positions are composed onto the scanned pair before them. log2(n) levels, O(n) work.
+    length = len(clamps[0])
+    if length < 2:
+        return clamps
+    pairs = _prefix_clamps(_compose_clamps(tuple(c[0:length-1:2] for c in clamps), tuple(c[1::2] for c in clamps)))
+    evens = _compose_clamps(tuple(p[:(length-1)//2] for p in pairs), tuple(c[2::2] for c in clamps))
+    scanned = tuple(np.empty(length) for _ in clamps)
+    for out, clamp, pair, even in zip(scanned, clamps, pairs, evens):
+        out[0] = clamp[0]
+        out[1::2] = pair
+        out[2::2] = even
+    return scanned
+
+def clamped_cumsum(deltas: np.array, initial: float, lower: float, upper: float) -> np.array:
     """
-    Plot each line in power_list using time_list.
-    
+    Returns the running sum s[i] = clip(s[i-1] + deltas[i], lower, upper) with s[-1] = initial, e.g. the energy
+    in a battery that can neither go below empty nor above full. Each step is the map x -> clip(x + delta, lower, upper),
+    and two such maps compose into one of the same form, so the running sum is a prefix scan of these maps in
+    log2(len(deltas)) vectorized levels, however often the sum switches between the bounds.
+
+    Parameters
+        deltas (numpy array): change of the sum at each step.
+        initial (float): value before the first step, between lower and upper.
+        lower (float): floor of the sum.
+        upper (float): ceiling of the sum.
+
+    returns:
+        float64 numpy array of the clamped running sum, same length as deltas
+    """
+    deltas = np.asarray(deltas, dtype=float)
+    shift, low, high = _prefix_clamps((deltas, np.full(len(deltas), float(lower)), np.full(len(deltas), float(upper))))
+    return np.minimum(np.maximum(float(initial) + shift, low), high)
+
+def cast_vector(vector: np.array, dtype=None) -> np.array:
+    """
+    Converts a power or cumulative data vector to a more compact dtype, e.g. np.float32 power or np.uint32 Bytes.
+    Integer dtypes round the data to whole Bytes.
+
     Parameters
-        time_list (numpy array): list of time vectors returned from run_sim for each sensor.
-        power_list (numpy array): list of power vectors returned from run_sim for each sensor.
+        vector (numpy array): float64 vector of the simulation.
+        dtype (numpy dtype): dtype of the output, None to keep float64.
+
+    returns:
+        numpy array in dtype, vector itself if it already has it
+    """
+    if dtype is None:
+        return vector
+    dtype = np.dtype(dtype)
+    if dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        if len(vector) > 0 and (vector.max() > info.max or vector.min() < info.min):
+            raise ValueError("Values up to {:.0f} do not fit in {}, use int64.".format(vector.max(), dtype))
+        return np.rint(vector).astype(dtype)
+    return vector.astype(dtype, copy=False)
+
+def check_memory_budget(samples: int, nbytes: int, memory_budget: int = None):
+    """
+    Raises a ValueError if the dense vectors of a run would take more than memory_budget bytes. Such runs are
+    evaluated in pieces with simulate_chunks() instead.
+
+    Parameters
+        samples (int): number of samples of the run.
+        nbytes (int): bytes of its vectors, see Sensor.output_nbytes() and LunaSatSystem.output_nbytes().
+        memory_budget (int): bytes the vectors may take, None for no limit.
+    """
+    if memory_budget is not None and nbytes > memory_budget:
+        raise ValueError("The output of {} samples needs {:.1f} MB, more than the memory budget of {:.1f} MB. Use simulate_chunks()."
+                         .format(samples, nbytes / 1e6, memory_budget / 1e6))
+
+def summarize_chunks(chunks, time_step: float, datarate_limit: float = None) -> dict:
+    """
+    Reduces the (power, data, time) chunks of Sensor.simulate_chunks() or LunaSatSystem.simulate_chunks() to the
+    totals of the whole run, holding one chunk at a time.
+
+    Parameters
+        chunks (iterable): (power, data, time) numpy arrays of consecutive samples, data cumulative.
+        time_step (float): seconds between simulation points.
+        datarate_limit (float): Bytes per second that can be stored, checked like plot_total_data(). None to skip.
+
+    returns:
+        dictionary with samples, energy (mJ), average_power (mW), peak_power (mW), total_data (Bytes) and, if
+        datarate_limit is given, datarate_violations (number of samples) and first_violation (time in s, None if
+        there are none).
+    """
+    summary = {"samples": 0, "energy": 0.0, "average_power": 0.0, "peak_power": 0.0, "total_data": 0.0}
+    if datarate_limit is not None:
+        summary["datarate_violations"] = 0
+        summary["first_violation"] = None
+    for power, data, time in chunks:
+        if len(time) == 0:
+            continue
+        if datarate_limit is not None:
+            index = summary["samples"] + np.arange(len(data))
+            over = (data > (index + 1) * datarate_limit) & (index > 0) # the first sample is not checked, as in plot_total_data()
+            if summary["first_violation"] is None and over.any():
+                summary["first_violation"] = float(time[np.argmax(over)])
+            summary["datarate_violations"] += int(np.count_nonzero(over))
+        summary["samples"] += len(time)
+        summary["energy"] += float(power.sum()) * time_step
+        summary["peak_power"] = max(summary["peak_power"], float(power.max()))
+        summary["total_data"] = float(data[-1])
+    if summary["samples"] > 0:
+        summary["average_power"] = summary["energy"] / (summary["samples"] * time_step)
+    return summary
+
+def to_vectors(time_list: list, vector_list: list) -> list:
+    """
+    Returns vector_list with every PowerTrace or DataTrace replaced by its dense vector on the matching
+    time vector, so traces returned by run_sim(as_trace=True) can be mixed with numpy arrays.
+
+    Parameters
+        time_list (list): time vectors, one per entry of vector_list.
+        vector_list (list): numpy arrays or traces.
 
     Returns
-        None
+        list of numpy arrays
     """
-    
-    label_reference = {
-        0:"Min. Power", 1:"Accelerometer Sensor", 2:"Magnetometer Sensor", 3:"Thermopile Sensor", 
-        4:"Temperature Sensor", 5:"Capacitive Sensor", 6:"Microcontroller", 7:"Total Power"
-    }
-    
-    for i in range(0,8):
-        plt.plot(time_list[i],power_list[i],label=label_reference[i])
-
-    plt.grid(visible=True)
-    plt.xlabel("Time (s)",fontsize=16)
-    plt.ylabel("Power (mW)",fontsize=16)
-    plt.title("Power vs Time for all Components",fontsize=16)
-    plt.ion()
-    plt.tight_layout()
-    plt.legend()
-    
+    return [vector.to_vector(time) if isinstance(vector, Trace) else vector for time, vector in zip(time_list, vector_list)]
+
+def resample_to_grid(time_list: list, vector_list: list, grid: np.array, time_step: float = None, cumulative: bool = False) -> list:
+    """
+    Maps vectors simulated with different time steps onto one grid so they can be added, e.g. an MPU6000 run
+    at 0.01 s and a TMP117 run at 1 s. Each vector is treated as piecewise constant and averaged over every step
+    of grid with Trace.average(), so energy is conserved from coarse to fine and from fine to coarse. Cumulative data
+    is accumulated once per grid sample, see Trace.DataTrace. Traces from run_sim(as_trace=True) are mapped from their
+    segments without expanding them.
+
+    Parameters
+        time_list (list): time vectors, one per entry of vector_list.
+        vector_list (list): power vectors, cumulative data vectors, or traces.
+        grid (numpy array): start time of each step of the common grid, e.g. np.arange(0, duration, time_step).
+        time_step (float): length of the last grid step. Defaults to the spacing of the grid.
+        cumulative (bool): True if the numpy arrays in vector_list are cumulative data vectors.
+
+    Returns
+        list of numpy arrays on grid
+    """
+    resampled = []
+    for time, vector in zip(time_list, vector_list):
+        if not isinstance(vector, Trace):
+            vector = DataTrace.from_vector(time, vector) if cumulative else PowerTrace.from_vector(time, vector)
+        resampled.append(vector.to_grid(grid, time_step))
+    return resampled
+
 def valid():
     """
     Finds all valid configuration options
@@ -115,177 +379,48 @@ def valid():
         None
 
     Returns
-        Valid configurations for all 5 sensors (TODO: Add microcontroller and RF)
+        Valid configurations for all 5 sensors as frozensets (TODO: Add microcontroller and RF). These are the
+        cached sets of each sensor class, so repeated calls do not rebuild them.
     """
-    # getting all valid inputs for tmp
-    
-    num_averages_options = [0, 8, 32, 64]
-    conv_cycle_time_options = [0.0155, 0.125, 0.25, 0.5, 1, 4, 8, 16] 
-    mode_options = ["CONTINUOUS_CONVERSION", "ONE_SHOT", "SHUTDOWN"]
-    valid_TMP = []
-
-    for averages in num_averages_options:
-        if averages == 0:
-            time_options_trunc = conv_cycle_time_options[0:]
-            cc_configs = [("CONTINUOUS_CONVERSION", 0, time) for time in time_options_trunc]
-            valid_TMP += cc_configs
-        elif averages == 8:
-            time_options_trunc = conv_cycle_time_options[1:]
-            cc_configs = [("CONTINUOUS_CONVERSION", 8, time) for time in time_options_trunc]
-            valid_TMP += cc_configs
-        elif averages == 32:
-            time_options_trunc = conv_cycle_time_options[3:]
-            cc_configs = [("CONTINUOUS_CONVERSION", 32, time) for time in time_options_trunc]
-            valid_TMP += cc_configs
-        elif averages == 64:
-            time_options_trunc = conv_cycle_time_options[4:]
-            cc_configs = [("CONTINUOUS_CONVERSION", 64, time) for time in time_options_trunc]
-            valid_TMP += cc_configs
-
-    os_configs = [("ONE_SHOT",0,0.0155),("ONE_SHOT",8,0.0155),("ONE_SHOT",32,0.0155),("ONE_SHOT",64,0.0155)]
-    valid_TMP += os_configs + [('SHUTDOWN',0,0)]
-    
-    # getting all valid inputs for magnetometer
-    num_averages_options = [1, 2, 4, 8, 16]
-    freq_options = [10, 20, 100, 1000]
-    mode_options = ["CONTINUOUS", "SINGLE", "POWER_DOWN"]
-    valid_MAG = []
-
-    for averages in num_averages_options:
-        if averages == 1:
-            freq_options_trunc = freq_options[0:]
-            configs = [("CONTINUOUS", freq, 1) for freq in freq_options_trunc]
-            valid_MAG += configs
-        elif averages == 2:
-            freq_options_trunc = freq_options[0:]
-            configs = [("CONTINUOUS", freq, 2) for freq in freq_options_trunc]
-            valid_MAG += configs
-        elif averages == 4:
-            freq_options_trunc = freq_options[:3]
-            configs = [("CONTINUOUS", freq, 4) for freq in freq_options_trunc]
-            valid_MAG += configs
-        elif averages == 8:
-            freq_options_trunc = freq_options[:3]
-            configs = [("CONTINUOUS", freq, 8) for freq in freq_options_trunc]
-            valid_MAG += configs
-        elif averages == 16:
-            freq_options_trunc = freq_options[:3]
-            configs = [("CONTINUOUS", freq, 16) for freq in freq_options_trunc]
-            valid_MAG += configs
-
-    s_configs = [("SINGLE",1000,1),("SINGLE",1000,2),("SINGLE",1000,4),("SINGLE",1000,8),("SINGLE",1000,16)]
-    valid_MAG += s_configs + [('POWER_DOWN',0,0)]
-
-    # getting all valid inputs for acc
-    low_power_wakeup = [0, 1.25, 5, 20, 40]
-    digital_low_pass = ["000", "001", "010", "011", "100", "101", "110", "111" ]
-    mode_options = ["ACCELEROMETER", "ACCELEROMETER_LOW_POWER", "GYROSCOPE", "GYROSCOPE_DMP", "ACCELEROMETER_AND_GYROSCOPE", "ACCELEROMETER_AND_GYROSCOPE_DMP", "SHUTDOWN"]
-    sample_rate_divisor = []
-    valid_ACC = []
-
-    for lpw in low_power_wakeup:
-        if lpw == 1.25:
-            dlp_options_trunc = digital_low_pass[1:7]
-            lpw_configs = [("ACCELEROMETER_LOW_POWER", 1.25, dlp, srd) for dlp in dlp_options_trunc for srd in range(256)]
-            valid_ACC += lpw_configs
-        elif lpw == 5:
-            dlp_options_trunc = digital_low_pass[1:7]
-            lpw_configs = [("ACCELEROMETER_LOW_POWER", 5, dlp, srd) for dlp in dlp_options_trunc for srd in range(256)]
-            valid_ACC += lpw_configs
-        elif lpw == 20:
-            dlp_options_trunc = digital_low_pass[1:7]
-            lpw_configs = [("ACCELEROMETER_LOW_POWER", 20, dlp, srd) for dlp in dlp_options_trunc for srd in range(256)]
-            valid_ACC += lpw_configs
-        elif lpw == 40:
-            dlp_options_trunc = digital_low_pass[1:7]
-            lpw_configs = [("ACCELEROMETER_LOW_POWER", 40, dlp, srd) for dlp in dlp_options_trunc for srd in range(256)]
-            valid_ACC += lpw_configs
-    dlp_options_trunc = digital_low_pass[1:7]
-    accelerometer_config = [("ACCELEROMETER",0, dlp, srd) for dlp in dlp_options_trunc for srd in range(256)]
-    gyroscope_config = [("GYROSCOPE",0, dlp, srd) for dlp in digital_low_pass for srd in range(256)]
-    gyroscope_dmp_config = [("GYROSCOPE_DMP",0, dlp, srd) for dlp in digital_low_pass for srd in range(256)]
-    accelerometer_gyroscope_config = [("ACCELEROMETER_AND_GYROSCOPE",0, dlp, srd) for dlp in dlp_options_trunc for srd in range(256)]
-    accelerometer_gyroscope_dmp_config = [("ACCELEROMETER_AND_GYROSCOPE_DMP",0, dlp, srd) for dlp in dlp_options_trunc for srd in range(256)]
-    valid_ACC += accelerometer_config + gyroscope_config + gyroscope_dmp_config + accelerometer_gyroscope_config +accelerometer_gyroscope_dmp_config + [('SHUTDOWN',0,"000", srd) for srd in range(256)]
-
-    valid_TP = [("TP_OFF"),("TP_ON")]
-    valid_CAP = [("CAP_OFF"),("CAP_ON")]
+    # imported here, the sensor modules import generate_active_list from this module
+    from source.TMP117 import TMP117
+    from source.MPU6000 import MPU6000
+    from source.BM1422 import BM1422
+    from source.TPIS1S1385 import TPIS1S1385
+    from source.CAP11NA import CAP11NA
+
+    valid_TMP = TMP117.get_valid_configs()
+    valid_ACC = MPU6000.get_valid_configs()
+    valid_MAG = BM1422.get_valid_configs()
+    valid_TP = TPIS1S1385.get_valid_configs()
+    valid_CAP = CAP11NA.get_valid_configs()
 
     return valid_TMP, valid_ACC, valid_MAG, valid_TP, valid_CAP
-    
-def plot_power_separate(time_list, power_list): 
+
+def plot_total_data(time_list: np.array, data_list: np.array, datarate_limit: float = DATARATE_LIMIT, window: float = None):
     """
-      Plots seperate power usage plots for sensors
+    Plot each line in data_list using time_list. See plotFunctions.plot_total_data().
+    """
+    from source import plotFunctions # imports matplotlib on first use only
+    return plotFunctions.plot_total_data(time_list, data_list, datarate_limit, window)
 
-      Parameters
-      ----------
-        time_list: np array
-        power_list: np array
+def plot_total_power(time_list: np.array, power_list: np.array):
+    """
+    Plot each line in power_list using time_list. See plotFunctions.plot_total_power().
+    """
+    from source import plotFunctions # imports matplotlib on first use only
+    return plotFunctions.plot_total_power(time_list, power_list)
 
-      Returns
-      -------
-        None
+def plot_power_separate(time_list, power_list):
     """
-    fig, axs = plt.subplots(1,5, figsize=(8,2))
-    labels = ["Accelerometer Sensor", "Magnetometer Sensor", "Thermopile Sensor", "Temperature Sensor", "Capacitive Sensor", "Microcontroller", "Total"]
-    
-    for i, power in enumerate(power_list[0:6]):#have to split array because last value is total_power
-        axs[i].plot(time_list[i], power, label = labels[i])
-        axs[i].set_ylim([0, 70]) # normalize y limits
-        axs[i].fill_between(time_list[i], power, where=((time_list[i] >= 0) & (time_list[i] <= len(power))), color='orange')
-        axs[i].set_title(labels[i], fontsize = 8)
-        axs[i].grid()
-
-    fig.supxlabel('Time (s)')
-    fig.supylabel('Power (mW)')
-    plt.tight_layout();
-    
-    plt.figure(figsize=(10,5))
-    plt.ion()
-    plt.plot(time_list[0], power_list[-1], label = "Total Power (mW)")#last value of power_list must be total_power.
-    plt.ylim([0, 70]) # normalize y limits
-    plt.fill_between(time_list[0], power_list[-1], where=((power_list[-1] >= 0) & (power_list[-1] <= len(power))), color='orange')
-    plt.legend()
-    plt.grid()
-    plt.ylabel("Power (mW)")
-    plt.xlabel("Time (s)")
-    plt.title("Power (mW) vs Time All Sensors")
-    
-def plot_rf_data(time_list: np.array, data_list: np.array): 
+    Plots seperate power usage plots for sensors. See plotFunctions.plot_power_separate().
     """
-    Plot each line in data_list using time_list.
-    
-    Parameters
-        time_list (numpy array): list of time vectors returned from run_sim for each sensor.
-        data_list (numpy array): list of data vectors returned from run_sim for each sensor.
+    from source import plotFunctions # imports matplotlib on first use only
+    return plotFunctions.plot_power_separate(time_list, power_list)
 
-    Returns
-        None
+def plot_rf_data(time_list: np.array, data_list: np.array, datarate_limit: float = DATARATE_LIMIT, window: float = None):
     """
-    
-    label_reference = {
-        0:"Min. Data", 1:"Microcontroller", 2:"RF", 3:"Total Data"
-    }
-    
-    for i in range(0,4):
-        plt.plot(time_list[i],data_list[i],label=label_reference[i])
-
-    datarate_limit = 1000
-    max_datarate = np.ones(len(data_list[0]))
-    for i in range(0,len(max_datarate)):
-        max_datarate[i] = (i * datarate_limit) + datarate_limit
-    plt.plot(time_list[0],max_datarate,label="Max. Datarate")
-    plt.grid(visible=True)
-    plt.xlabel("Time (s)",fontsize=16)
-    plt.ylabel("Data (Bytes)",fontsize=16)
-    plt.title("Data vs Time for all Components",fontsize=16)
-    plt.ion()
-    plt.tight_layout()
-    plt.legend()
-    
-    timePossible = np.where(data_list[3]>max_datarate,time_list[0],None)
-    for i in range(0,len(max_datarate)):
-        if(timePossible[i]!=None and i!=0):
-            print("ERROR! At least one of your configurations exceeds the maximum datarate at " + str(i) + " seconds.")
-            return "ERROR"
-    return "Configurations meet datarate requirements"
\ No newline at end of file
+    Plot each line in data_list using time_list. See plotFunctions.plot_rf_data().
+    """
+    from source import plotFunctions # imports matplotlib on first use only
+    return plotFunctions.plot_rf_data(time_list, data_list, datarate_limit, window)
@@ -0,0 +1,299 @@
+"""
+    Plotting functions of the LPDM. matplotlib is only imported by this module, which the sensor classes and
+    helperFunctions import when a plot is requested, so the numerical code loads without matplotlib.
+
+    Lines longer than MAX_POINTS are decimated to their min/max envelope before they are handed to matplotlib,
+    see helperFunctions.decimate_minmax(), so long runs redraw quickly. Set MAX_POINTS = None to plot every point.
+"""
+import matplotlib.pyplot as plt
+import numpy as np
+from typing import List
+from source.helperFunctions import to_vectors, check_datarate, decimate_minmax, DATARATE_LIMIT
+
+MAX_POINTS = 4000 # points per line, about two per pixel of a wide figure
+
+def _decimate(x, y):
+    return decimate_minmax(x, y, MAX_POINTS)
+
+def plot_sensor_data(power_vector: np.array, data_vector: np.array, time_vector: np.array, active_times: List[tuple]) -> None:
+    """
+        Creates plots given power, data, and time vectors. Active times is needed for the topmost plot.
+
+        Arguments:
+            power_vector: calculated values from Sensor.simulate(). 
+            data_vector: calculated values from Sensor.simulate(). 
+            time_vector: calculated values from Sensor.simulate(). 
+            active_times: active times list from generate_active_list() function.
+    """
+    #one row per distinct mode, in order of first appearance in active_times.
+    rows = {}
+    for v in active_times:
+        rows.setdefault(v[2], len(rows))
+    num_modes = max(len(rows), 1)
+    #fixed color per row instead of random colors, so every mode is told apart and the colors do not change between plots.
+    colors = plt.get_cmap("tab10")(np.arange(num_modes) % 10)
+
+    #plot setup/ manipulation.
+    fig, (ax1,ax2,ax3) = plt.subplots(nrows=3,ncols=1,sharex=True,gridspec_kw={'height_ratios': [num_modes*0.3, 3, 3]},figsize=(7,7))
+    ax1.set_title("Power and Data")
+    ax1.set_xlim(0, active_times[-1][1])#set limit to be the last value of active_times.
+    ax1.set_ylabel('Active times')
+    ax1.grid()
+
+    #active times plot. All bars of a mode are one broken_barh call, i.e. one collection per mode however long the schedule is.
+    starts = np.array([v[0] for v in active_times], dtype=float)
+    widths = np.array([v[1] - v[0] for v in active_times], dtype=float)
+    row_of = np.array([rows[v[2]] for v in active_times])
+    for mode, row in rows.items():
+        in_row = row_of == row
+        ax1.broken_barh(np.column_stack((starts[in_row], widths[in_row])), (row, 0.8), color=colors[row])#change 0.8 to change height of bars.
+    ax1.set_yticks([row + 0.5 for row in rows.values()], labels=[str(mode) for mode in rows.keys()])#set labels for each mode in active times chart
+
+    power_plot, = ax2.plot(*_decimate(time_vector, power_vector))
+    ax2.tick_params('y', labelsize=12)
+    ax2.tick_params('x', labelbottom=False)
+    ax2.set_ylabel('Power (mW)')
+    ax2.grid()
+    
+    data_plot, = ax3.plot(*_decimate(time_vector, data_vector))
+    ax3.tick_params('y', labelsize=12)
+    ax3.tick_params('x', labelsize=12)
+    ax3.set_ylabel('Data (Bytes)')
+    ax3.set_xlabel('Seconds')
+    ax3.grid()
+
+    plt.ion()
+    plt.tight_layout()
+    plt.show()
+
+def plot_total_data(time_list: np.array, data_list: np.array, datarate_limit: float = DATARATE_LIMIT, window: float = None): 
+    """
+    Plot each line in data_list using time_list and checks the total with helperFunctions.check_datarate().
+    
+    Parameters
+        time_list (numpy array): list of time vectors returned from run_sim for each sensor.
+        data_list (numpy array): list of data vectors returned from run_sim for each sensor.
+        datarate_limit (float): Bytes per second the LunaSat can store.
+        window (float): length (s) of the sliding window to check, None to check from the start of the run.
+
+    Returns
+        None
+    """
+    data_list = to_vectors(time_list, data_list)
+    
+    label_reference = {
+        0:"Min. Data", 1:"Accelerometer Sensor", 2:"Magnetometer Sensor", 3:"Thermopile Sensor", 
+        4:"Temperature Sensor", 5:"Capacitive Sensor", 6:"Microcontroller", 7:"Total Data"
+    }
+    
+    for i in range(0,8):
+        plt.plot(*_decimate(time_list[i],data_list[i]),label=label_reference[i])
+
+    max_datarate = (np.arange(len(data_list[0])) + 1) * datarate_limit
+    plt.plot(*_decimate(time_list[0],max_datarate),label="Max. Datarate")
+    plt.grid(visible=True)
+    plt.xlabel("Time (s)",fontsize=16)
+    plt.ylabel("Data (Bytes)",fontsize=16)
+    plt.title("Data vs Time for all Components",fontsize=16)
+    plt.ion()
+    plt.tight_layout()
+    plt.legend()
+    
+    check = check_datarate(time_list[0], data_list[7], datarate_limit, window)
+    if check["violations"] > 0:
+        print("ERROR! At least one of your configurations exceeds the maximum datarate at " + str(check["first_violation"]) + " seconds.")
+        return "ERROR"
+    return "Configurations meet datarate requirements"
+
+def plot_total_power(time_list: np.array, power_list: np.array):
+    """
+    Plot each line in power_list using time_list.
+    
+    Parameters
+        time_list (numpy array): list of time vectors returned from run_sim for each sensor.
+        power_list (numpy array): list of power vectors returned from run_sim for each sensor.
+
+    Returns
+        None
+    """
+    power_list = to_vectors(time_list, power_list)
+    
+    label_reference = {
+        0:"Min. Power", 1:"Accelerometer Sensor", 2:"Magnetometer Sensor", 3:"Thermopile Sensor", 
+        4:"Temperature Sensor", 5:"Capacitive Sensor", 6:"Microcontroller", 7:"Total Power"
+    }
+    
+    for i in range(0,8):
+        plt.plot(*_decimate(time_list[i],power_list[i]),label=label_reference[i])
+
+    plt.grid(visible=True)
+    plt.xlabel("Time (s)",fontsize=16)
+    plt.ylabel("Power (mW)",fontsize=16)
+    plt.title("Power vs Time for all Components",fontsize=16)
+    plt.ion()
+    plt.tight_layout()
+    plt.legend()
+
+def plot_power_separate(time_list, power_list): 
+    """
+      Plots seperate power usage plots for sensors
+
+      Parameters
+      ----------
+        time_list: np array
+        power_list: np array
+
+      Returns
+      -------
+        None
+    """
+    power_list = to_vectors(time_list, power_list)
+    fig, axs = plt.subplots(1,5, figsize=(8,2))
+    labels = ["Accelerometer Sensor", "Magnetometer Sensor", "Thermopile Sensor", "Temperature Sensor", "Capacitive Sensor", "Microcontroller", "Total"]
+    
+    for i, power in enumerate(power_list[0:6]):#have to split array because last value is total_power
+        time, decimated = _decimate(time_list[i], power)
+        axs[i].plot(time, decimated, label = labels[i])
+        axs[i].set_ylim([0, 70]) # normalize y limits
+        axs[i].fill_between(time, decimated, where=((time >= 0) & (time <= len(power))), color='orange')
+        axs[i].set_title(labels[i], fontsize = 8)
+        axs[i].grid()
+
+    fig.supxlabel('Time (s)')
+    fig.supylabel('Power (mW)')
+    plt.tight_layout();
+    
+    plt.figure(figsize=(10,5))
+    plt.ion()
+    time, decimated = _decimate(time_list[0], power_list[-1])
+    plt.plot(time, decimated, label = "Total Power (mW)")#last value of power_list must be total_power.
+    plt.ylim([0, 70]) # normalize y limits
+    plt.fill_between(time, decimated, where=((decimated >= 0) & (decimated <= len(power))), color='orange')
+    plt.legend()
+    plt.grid()
+    plt.ylabel("Power (mW)")
+    plt.xlabel("Time (s)")
+    plt.title("Power (mW) vs Time All Sensors")
+
+def plot_rf_data(time_list: np.array, data_list: np.array, datarate_limit: float = DATARATE_LIMIT, window: float = None): 
+    """
+    Plot each line in data_list using time_list and checks the total with helperFunctions.check_datarate().
+    
+    Parameters
+        time_list (numpy array): list of time vectors returned from run_sim for each sensor.
+        data_list (numpy array): list of data vectors returned from run_sim for each sensor.
+        datarate_limit (float): Bytes per second the LunaSat can store.
+        window (float): length (s) of the sliding window to check, None to check from the start of the run.
+
+    Returns
+        None
+    """
+    data_list = to_vectors(time_list, data_list)
+    
+    label_reference = {
+        0:"Min. Data", 1:"Microcontroller", 2:"RF", 3:"Total Data"
+    }
+    
+    for i in range(0,4):
+        plt.plot(*_decimate(time_list[i],data_list[i]),label=label_reference[i])
+
+    max_datarate = (np.arange(len(data_list[0])) + 1) * datarate_limit
+    plt.plot(*_decimate(time_list[0],max_datarate),label="Max. Datarate")
+    plt.grid(visible=True)
+    plt.xlabel("Time (s)",fontsize=16)
+    plt.ylabel("Data (Bytes)",fontsize=16)
+    plt.title("Data vs Time for all Components",fontsize=16)
+    plt.ion()
+    plt.tight_layout()
+    plt.legend()
+    
+    check = check_datarate(time_list[0], data_list[3], datarate_limit, window)
+    if check["violations"] > 0:
+        print("ERROR! At least one of your configurations exceeds the maximum datarate at " + str(check["first_violation"]) + " seconds.")
+        return "ERROR"
+    return "Configurations meet datarate requirements"
+
+def plot_power_available(times: np.array, output: np.array) -> None:
+    """
+    Plots the power produced by the solar panel
+
+    args:
+        times (numpy array): times [hrs] returned by SM111K.model()
+        output (numpy array): power [mW] returned by SM111K.model()
+    returns:
+        None
+    """
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.plot(*_decimate(times, output), color="steelblue")
+    ax.set_title("Power Available", fontsize=20)
+    ax.set_xlabel("Time (hours)", fontsize=16)
+    ax.set_ylabel("Power (mW)", fontsize=16)
+
+    ax.grid(True, alpha=0.25)
+
+def plot_power_possible(time: np.array, power: np.array, possiblePower: np.array) -> None:
+    """
+    Plots the power produced by the solar panel and shades where it exceeds the power consumed
+
+    args:
+        time (numpy array): times [hrs] returned by SM111K.model()
+        power (numpy array): power [mW] returned by SM111K.model()
+        possiblePower (numpy array): power where it exceeds the power consumed, 0 otherwise
+    returns:
+        None
+    """
+    fig, ax = plt.subplots(figsize=(8,5))
+    ax.plot(*_decimate(time, power), color="steelblue")
+    ax.fill_between(*_decimate(time, possiblePower), step="pre", alpha=0.4)
+    ax.set_title("Power Available", fontsize=20)
+    ax.set_xlabel("Time Since Lunar Midnight (Earth hours)", fontsize=16)
+    ax.set_ylabel("Power (mW)", fontsize=16)
+
+    ax.grid(True, alpha=0.25)
+
+def plot_state_of_charge(time: np.array, state_of_charge: np.array, brownout: np.array, floor: float, ceiling: float) -> None:
+    """
+    Plots the state of charge of the battery and shades the brown-outs
+
+    args:
+        time (numpy array): times [s] returned by Battery.simulate()
+        state_of_charge (numpy array): fraction of capacity returned by Battery.simulate()
+        brownout (numpy array): True where the battery cannot supply the load
+        floor (float): lowest state of charge of the battery
+        ceiling (float): highest state of charge of the battery
+    returns:
+        None
+    """
+    hours = time / 3600
+    fig, ax = plt.subplots(figsize=(8,5))
+    ax.plot(*_decimate(hours, state_of_charge * 100), color="steelblue")
+    # the envelope of the mask keeps every bucket holding a brown-out shaded
+    brownout_hours, decimated = _decimate(hours, np.asarray(brownout, dtype=float))
+    ax.fill_between(brownout_hours, 0, 100, where=decimated > 0, step="post", color="red", alpha=0.3, label="Brown-out")
+    ax.axhline(floor * 100, color="gray", linestyle="--")
+    ax.axhline(ceiling * 100, color="gray", linestyle="--")
+    ax.set_title("Battery State of Charge", fontsize=20)
+    ax.set_xlabel("Time (hours)", fontsize=16)
+    ax.set_ylabel("State of Charge (%)", fontsize=16)
+    ax.set_ylim(0, 100)
+    ax.legend()
+
+    ax.grid(True, alpha=0.25)
+
+def plot_feasibility_map(times: np.array, latitudes: np.array, feasible: np.array) -> None:
+    """
+    Plots where the solar panel covers the load as a heatmap of latitude against time
+
+    args:
+        times (numpy array): times [hrs] returned by SM111K.feasibility_map()
+        latitudes (numpy array): latitudes [degrees] returned by SM111K.feasibility_map()
+        feasible (numpy array): (latitude x time) boolean array returned by SM111K.feasibility_map()
+    returns:
+        None
+    """
+    fig, ax = plt.subplots(figsize=(8,5))
+    extent = [times[0], times[-1], latitudes[0], latitudes[-1]]
+    ax.imshow(feasible, aspect="auto", origin="lower", extent=extent, cmap="Greens", vmin=0, vmax=1, interpolation="nearest")
+    ax.set_title("Times the Load is Covered", fontsize=20)
+    ax.set_xlabel("Time Since Lunar Midnight (Earth hours)", fontsize=16)
+    ax.set_ylabel("Latitude (degrees)", fontsize=16)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the notebooks import the models as source.<module> from content/modelFolder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "content", "modelFolder"))
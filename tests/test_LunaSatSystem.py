@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from source.LunaSatSystem import LunaSatSystem
+
+def lunasat(**kwargs):
+    modes_tmp = [(("CONTINUOUS_CONVERSION", 8, 0.125), 30, 1), (("SHUTDOWN", 0, 0), 30, 1)]
+    modes_mcr = [(("ACTIVE", "OSCHF", 4, "OFF", 1), 20, 0), (("IDLE", "XOSC32K", 32.768, "ON", 2), 40, 0)]
+    return LunaSatSystem(60, 0.5, modes_tmp=modes_tmp, modes_mcr=modes_mcr, **kwargs)
+
+def test_dtypes_round_the_float64_run():
+    result = lunasat().simulate()
+    typed = lunasat().simulate(power_dtype=np.float32, data_dtype=np.int64)
+    assert typed.keys() == result.keys()
+    for field in result:
+        if field.endswith("_data"):
+            assert typed[field].dtype == np.int64
+            assert np.array_equal(typed[field], np.rint(result[field]))
+        elif field.endswith("_power"):
+            assert typed[field].dtype == np.float32
+            assert np.allclose(typed[field], result[field], rtol=1e-6)
+
+def test_memory_budget_raises_instead_of_returning_chunks():
+    system = lunasat()
+    nbytes = system.output_nbytes()
+    assert set(system.simulate(memory_budget=nbytes)) == set(system.fields())
+    with pytest.raises(ValueError, match="simulate_chunks"):
+        system.simulate(memory_budget=nbytes - 1)
+
+@pytest.mark.parametrize("chunk_size", [1, 13, 10**6])
+def test_simulate_chunks_equals_simulate(chunk_size):
+    result = lunasat(time_steps={"tmp": 0.1}).simulate()
+    chunks = list(lunasat(time_steps={"tmp": 0.1}).simulate_chunks(chunk_size))
+    assert all(len(chunk["time"]) <= chunk_size for chunk in chunks)
+    for field in result:
+        assert np.allclose(np.concatenate([chunk[field] for chunk in chunks]), result[field], rtol=1e-12, atol=1e-9), field
@@ -0,0 +1,32 @@
+from collections import OrderedDict
+import numpy as np
+import pytest
+from source.SM111K import SM111K
+
+@pytest.fixture
+def cache(monkeypatch):
+    # every test gets its own empty cache instead of the one shared by all panels
+    monkeypatch.setattr(SM111K, "_cache", OrderedDict())
+    monkeypatch.setattr(SM111K, "cache_dir", None)
+    return SM111K._cache
+
+@pytest.mark.parametrize("steps_per_day", [4000, None])
+def test_model_matches_power_at_over_several_lunar_days(cache, steps_per_day):
+    panel = SM111K(5.3, 3000, 30, 45)
+    time_step = panel.lunar_day_length / steps_per_day if steps_per_day else panel.time_step
+    assert panel.period_samples(time_step) == steps_per_day
+    for latitude in (45, np.array([0.0, 30.0, 60.0])):
+        times, powers = panel.model(time_step=time_step, latitude=latitude)
+        assert np.allclose(powers, panel.power_at(times, latitude), rtol=0, atol=1e-9)
+
+def test_cache_eviction_bounds_bytes(cache, monkeypatch):
+    panel = SM111K(0, 100, 30, 45)
+    entry_bytes = panel.model()[1].nbytes
+    monkeypatch.setattr(SM111K, "cache_bytes", 3 * entry_bytes)
+    monkeypatch.setattr(SM111K, "cache_entry_bytes", entry_bytes)
+    for latitude in range(10):
+        panel.model(latitude=latitude)
+        assert sum(powers.nbytes for powers in cache.values()) <= SM111K.cache_bytes
+    assert len(cache) == 3
+    panel.model(end_time=200) # larger than cache_entry_bytes, computed but not cached
+    assert len(cache) == 3 and all(key[4] == 100 for key in cache)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from source.TMP117 import TMP117
+from source.MPU6000 import MPU6000
+
+def test_rate_warning_printed_once_per_run(capsys):
+    modes = [(("ONE_SHOT", 8, 0.0155), 10, 0.01), (("ONE_SHOT", 8, 0.0155), 5, 0.02), (("SHUTDOWN", 0, 0), 5, 1)]
+    power, data, time = TMP117(0.5, 200, modes, 20).simulate()
+    assert capsys.readouterr().out.count("exceeded the speed of the TMP117 sensor") == 1
+    assert np.isclose(power.max(), TMP117.compute_power(TMP117, "ONE_SHOT", 8, 0.0155, 0.01))
+
+TMP_MODES = [(("CONTINUOUS_CONVERSION", 8, 0.125), 30, 1), (("ONE_SHOT", 0, 0.0155), 20, 1), (("SHUTDOWN", 0, 0), 10, 1)]
+
+def test_dtypes_round_the_float64_run():
+    tmp = TMP117(0.1, 60, TMP_MODES, 20)
+    power, data, time = tmp.simulate()
+    power32, data64, time_typed = tmp.simulate(power_dtype=np.float32, data_dtype=np.int64)
+    assert power32.dtype == np.float32 and data64.dtype == np.int64
+    assert np.array_equal(time_typed, time)
+    assert np.allclose(power32, power, rtol=1e-6)
+    assert np.array_equal(data64, np.rint(data))
+
+def test_memory_budget_raises_for_dense_vectors():
+    tmp = TMP117(0.1, 60, TMP_MODES, 20)
+    nbytes = tmp.output_nbytes(np.float32, np.uint32)
+    power, data, time = tmp.simulate(power_dtype=np.float32, data_dtype=np.uint32, memory_budget=nbytes)
+    assert len(power) == len(data) == len(time) == tmp.num_samples()
+    with pytest.raises(ValueError, match="simulate_chunks"):
+        tmp.simulate(memory_budget=nbytes)
+    power, data, time = tmp.simulate(as_trace=True, memory_budget=0) # traces are not limited
+    assert power.end == 60
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 10**6])
+def test_simulate_chunks_equals_simulate(chunk_size):
+    for sensor in (TMP117(0.1, 60, TMP_MODES, 20), MPU6000(0.5, 60, [(("ACCELEROMETER", 0, "001", 4), 25, 10), (("SHUTDOWN", 0, "000", 0), 35, 1)], 1000)):
+        power, data, time = sensor.simulate()
+        chunks = list(sensor.simulate_chunks(chunk_size))
+        assert all(len(chunk[2]) <= chunk_size for chunk in chunks)
+        assert np.array_equal(np.concatenate([chunk[0] for chunk in chunks]), power)
+        assert np.allclose(np.concatenate([chunk[1] for chunk in chunks]), data, rtol=1e-12, atol=0)
+        assert np.array_equal(np.concatenate([chunk[2] for chunk in chunks]), time)
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+from source.Trace import DataTrace, PowerTrace
+
+@pytest.mark.parametrize("time_step", [1.0, 0.5, 0.1, 2.5])
+def test_total_data_matches_to_grid(time_step):
+    # 5 B/s for 10 s, accumulated once per sample like the sensor models
+    trace = DataTrace([0, 10], [5])
+    grid = np.arange(0, 10, time_step)
+    assert trace.to_grid(grid, time_step)[-1] == pytest.approx(trace.total_data(time_step))
+    assert trace.to_vector(grid)[-1] == pytest.approx(trace.total_data(time_step))
+    assert trace.total_data() == pytest.approx(50)
+
+def test_to_grid_conserves_energy():
+    trace = PowerTrace([0, 0.3, 2.7, 10], [1, 4, 2])
+    for time_step in (0.1, 1.0, 5.0):
+        grid = np.arange(0, 10, time_step)
+        assert np.sum(trace.to_grid(grid, time_step)) * time_step == pytest.approx(trace.energy())
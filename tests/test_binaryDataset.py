@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from source.TPIS1S1385 import TPIS1S1385
+from source.CAP11NA import CAP11NA
+from source.TMP117 import TMP117
+from source.MPU6000 import MPU6000
+from source.BM1422 import BM1422
+from source.generateBitstrings import encode_configs, decode_configs, write_binary_dataset, read_binary_dataset
+
+def configs(count):
+    valid = [sensor.generate_valid_configs(sensor) for sensor in (TPIS1S1385, CAP11NA, TMP117, MPU6000, BM1422)]
+    return [[options[(i * 7919) % len(options)] for options in valid] for i in range(count)] # spread over every field
+
+def test_binary_dataset_round_trip(tmp_path):
+    config_list = configs(20)
+    durations = list(range(0, 200, 10))
+    sampling_rates = [[0.5, 1, 0.0155, 0.05, 2**32] for _ in config_list]
+    file_name = str(tmp_path / "0_team.bin")
+    write_binary_dataset(file_name, encode_configs(config_list), durations, sampling_rates, "team", 0)
+    for mmap in (True, False):
+        team_no, team_name, codes, read_durations, read_sampling_rates = read_binary_dataset(file_name, mmap=mmap)
+        assert (team_no, team_name) == (0, "team")
+        assert decode_configs(codes) == config_list
+        assert read_durations.tolist() == durations
+        assert np.array_equal(read_sampling_rates, np.float32(sampling_rates))
+
+@pytest.mark.parametrize("durations, sampling_rate", [
+    ([-1], 1), ([2**32], 1), ([1.5], 1), ([1], -0.5), ([1], np.inf), ([1], np.nan), ([1], 1e39),
+])
+def test_binary_dataset_rejects_out_of_range_values(tmp_path, durations, sampling_rate):
+    codes = encode_configs(configs(1))
+    with pytest.raises(ValueError):
+        write_binary_dataset(str(tmp_path / "0_team.bin"), codes, durations, [[sampling_rate]*5], "team", 0)
+    assert not (tmp_path / "0_team.bin").exists()
@@ -0,0 +1,55 @@
+import numpy as np
+import source.configOptimizer as configOptimizer
+from source.configOptimizer import pareto_mask, pareto_front, sensor_candidates, SENSOR_NAMES, SENSOR_CLASSES
+from source.TMP117 import TMP117
+from source.MPU6000 import MPU6000
+from source.BM1422 import BM1422
+
+SAMPLING_RATES = [0.05, 1, 10]
+CONFIGS = [None, None, TMP117.generate_valid_configs(TMP117)[::5], MPU6000.generate_valid_configs(MPU6000)[::700], BM1422.generate_valid_configs(BM1422)[::4]]
+
+def brute_force_mask(power, data):
+    mask = np.zeros(len(power), dtype=bool)
+    for i in range(len(power)):
+        dominated = (power <= power[i]) & (data >= data[i]) & ((power < power[i]) | (data > data[i]))
+        duplicate = (power == power[i]) & (data == data[i]) & (np.arange(len(power)) < i)
+        mask[i] = not np.any(dominated | duplicate)
+    return mask
+
+def test_pareto_mask_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        power = rng.integers(0, 10, 40).astype(float) # small integers give many ties
+        data = rng.integers(0, 10, 40).astype(float)
+        mask = pareto_mask(power, data)
+        expected = brute_force_mask(power, data)
+        assert sorted(zip(power[mask], data[mask])) == sorted(zip(power[expected], data[expected]))
+    assert len(pareto_mask([], [])) == 0
+
+def all_systems():
+    power, data = np.zeros(1), np.zeros(1)
+    for sensor, configs in zip(SENSOR_NAMES, CONFIGS):
+        if configs is None:
+            configs = SENSOR_CLASSES[sensor].generate_valid_configs(SENSOR_CLASSES[sensor])
+        sensor_power, sensor_data = sensor_candidates(sensor, SAMPLING_RATES, configs)[:2]
+        power = (power[:, None] + sensor_power[None, :]).ravel()
+        data = (data[:, None] + sensor_data[None, :]).ravel()
+    return power, data
+
+def test_pareto_front_matches_brute_force():
+    power, data = all_systems()
+    for max_power, min_data in [(None, None), (18, 5), (25, 50), (None, 100), (17.5, None)]:
+        front_power, front_data = pareto_front(SAMPLING_RATES, max_power=max_power, min_data=min_data, configs=CONFIGS)[2:]
+        keep = pareto_mask(power, data)
+        if max_power is not None:
+            keep &= power <= max_power
+        if min_data is not None:
+            keep &= data >= min_data
+        assert np.allclose(sorted(zip(power[keep], data[keep])), sorted(zip(front_power, front_data)))
+
+def test_pareto_front_chunked_merge(monkeypatch):
+    expected = pareto_front(SAMPLING_RATES, max_power=25, configs=CONFIGS)
+    monkeypatch.setattr(configOptimizer, "MERGE_CHUNK", 7)
+    config_list, sampling_rates_list, power, data = pareto_front(SAMPLING_RATES, max_power=25, configs=CONFIGS)
+    assert config_list == expected[0] and sampling_rates_list == expected[1]
+    assert np.array_equal(power, expected[2]) and np.array_equal(data, expected[3])
@@ -0,0 +1,27 @@
+import numpy as np
+from source.TMP117 import TMP117
+from source.configSweep import sweep_tmp, filter_sweep
+
+SAMPLING_RATES = [0.001, 0.0155, 0.05, 0.125, 1, 60]
+
+def test_sweep_tmp_matches_scalar_formulas():
+    table = sweep_tmp(SAMPLING_RATES)
+    configs = TMP117.generate_valid_configs_tmp(TMP117)
+    expected = [(config, sampling_rate) for config in configs for sampling_rate in SAMPLING_RATES if sampling_rate > 0.0155]
+    assert len(table) == len(expected)
+    for row, ((mode, num_averages, conv_cycle_time), sampling_rate) in zip(table, expected):
+        assert (row["mode"], row["num_averages"], row["conv_cycle_time"], row["sampling_rate"]) == (mode, num_averages, conv_cycle_time, sampling_rate)
+        assert np.isclose(row["power"], TMP117.compute_power(TMP117, mode, num_averages, conv_cycle_time, sampling_rate))
+        assert np.isclose(row["data"], TMP117.compute_data(TMP117, mode, conv_cycle_time, num_averages, sampling_rate))
+
+def test_sweep_tmp_skips_rates_below_conversion_time():
+    table = sweep_tmp(SAMPLING_RATES)
+    assert np.all(table["sampling_rate"] > 0.0155)
+    assert np.all(table["power"] > 0)
+    assert len(sweep_tmp([0.001, 0.0155])) == 0
+
+def test_filter_sweep_matches_brute_force():
+    table = sweep_tmp(SAMPLING_RATES)
+    rows = filter_sweep(table, max_power=5, max_sampling_rate=1)
+    expected = sorted((row for row in table if row["power"] <= 5 and row["sampling_rate"] <= 1), key=lambda row: row["power"])
+    assert [tuple(row) for row in rows] == [tuple(row) for row in expected]
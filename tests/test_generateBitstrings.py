@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import random
+import numpy as np
+from source.TPIS1S1385 import TPIS1S1385
+from source.CAP11NA import CAP11NA
+from source.TMP117 import TMP117
+from source.MPU6000 import MPU6000
+from source.BM1422 import BM1422
+from source.generateBitstrings import (BITSTRING_FIELDS, BITSTRING_WIDTHS, config_fields, encode_config, encode_configs,
+                                       decode_config, decode_configs, decode_bitstring, generate_bitstrings)
+
+def random_configs(count, seed=0):
+    rng = random.Random(seed)
+    valid = [sensor.generate_valid_configs(sensor) for sensor in (TPIS1S1385, CAP11NA, TMP117, MPU6000, BM1422)]
+    return [[rng.choice(configs) for configs in valid] for _ in range(count)]
+
+def brute_force_bitstring(config):
+    # every field written as the index of its option, padded to the field width, in the order of divide_bitstring()
+    return '0b' + ''.join(format(options.index(value), '0' + str(width) + 'b')
+                          for (name, options), width, value in zip(BITSTRING_FIELDS, BITSTRING_WIDTHS, config_fields(config)))
+
+def test_bitstrings_match_field_layout():
+    configs = random_configs(500)
+    assert generate_bitstrings(configs) == [brute_force_bitstring(config) for config in configs]
+
+def test_codec_round_trip():
+    configs = random_configs(500, seed=1)
+    codes = encode_configs(configs)
+    assert codes.dtype == np.uint64
+    assert codes.tolist() == [encode_config(config) for config in configs]
+    assert decode_configs(codes) == configs
+    assert [decode_config(code) for code in codes.tolist()] == configs
+    assert [decode_bitstring(bitstring) for bitstring in generate_bitstrings(configs)] == configs
+
+def test_import_skips_matplotlib():
+    # the batch tools import the codec in every worker, so it must not pull in matplotlib (see plotFunctions)
+    script = ("import sys, time, numpy\n"
+              "sys.modules['matplotlib'] = None\n"
+              "start = time.perf_counter()\n"
+              "import source.generateBitstrings\n"
+              "print(time.perf_counter() - start)\n")
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                            cwd=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'content', 'modelFolder'))
+    assert result.returncode == 0, result.stderr
+    assert float(result.stdout) < 0.5
@@ -0,0 +1,82 @@
+import numpy as np
+from source.helperFunctions import clamped_cumsum, check_datarate, mask_runs, mask_intervals
+
+def brute_force_clamped_cumsum(deltas, initial, lower, upper):
+    clamped = np.empty(len(deltas))
+    value = initial
+    for i, delta in enumerate(deltas):
+        value = np.clip(value + delta, lower, upper)
+        clamped[i] = value
+    return clamped
+
+def test_clamped_cumsum_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        deltas = rng.normal(0, 1, rng.integers(0, 300))
+        lower, upper = np.sort(rng.uniform(-3, 3, 2))
+        initial = rng.uniform(lower, upper)
+        clamped = clamped_cumsum(deltas, initial, lower, upper)
+        assert np.allclose(clamped, brute_force_clamped_cumsum(deltas, initial, lower, upper), rtol=0, atol=1e-9)
+        assert np.all((clamped >= lower) & (clamped <= upper))
+
+def test_clamped_cumsum_alternating_bounds():
+    deltas = np.tile([5.0, -5.0], 50001) # hits the other bound on every step
+    assert np.array_equal(clamped_cumsum(deltas, 0, 0, 3), np.tile([3.0, 0.0], 50001))
+    assert np.array_equal(clamped_cumsum(deltas[:-1], 1, 1, 1), np.ones(len(deltas) - 1)) # floor == ceiling, odd length
+    assert len(clamped_cumsum([], 0, 0, 1)) == 0
+    assert np.array_equal(clamped_cumsum([2.0], 0.5, 0, 1), [1.0])
+
+def brute_force_violations(data, datarate_limit, window_samples=None):
+    violation = []
+    for i in range(len(data)):
+        if window_samples is None:
+            violation.append(i > 0 and data[i] > (i + 1) * datarate_limit)
+        else:
+            window_bytes = data[i] - (data[i - window_samples] if i >= window_samples else 0)
+            violation.append(window_bytes > window_samples * datarate_limit)
+    return np.array(violation, dtype=bool)
+
+def test_check_datarate_matches_brute_force():
+    rng = np.random.default_rng(1)
+    for time_step in (1, 0.5, 0.0155):
+        time = np.arange(0, 200) * time_step
+        data = np.cumsum(rng.choice([0, 400, 2500], size=len(time), p=[0.5, 0.3, 0.2]))
+        for window in (None, 10 * time_step, 50 * time_step):
+            check = check_datarate(time, data, 1000, window)
+            expected = brute_force_violations(data, 1000, None if window is None else int(round(window / time_step)))
+            assert np.array_equal(check["violation"], expected)
+            assert check["violations"] == expected.sum()
+            if expected.any():
+                first = int(np.argmax(expected))
+                assert check["first_violation"] == time[first]
+                assert check["intervals"][0, 0] == time[first]
+                assert np.isclose((check["intervals"][:, 1] - check["intervals"][:, 0]).sum(), expected.sum() * time_step)
+            else:
+                assert check["first_violation"] is None and len(check["intervals"]) == 0
+
+def test_check_datarate_worst_window():
+    time = np.arange(0, 10, 0.5)
+    data = np.cumsum([0] * 10 + [3000] * 2 + [0] * 8)
+    check = check_datarate(time, data, 1000, window=1.0)
+    assert check["first_violation"] == 5.0 # a time, not the sample index 10
+    assert check["worst_window"] == (5.0, 6.0)
+    assert check["worst_utilization"] == 3.0
+
+def brute_force_intervals(mask, time, time_step):
+    intervals = []
+    for i, value in enumerate(mask):
+        if value and (i == 0 or not mask[i - 1]):
+            intervals.append([time[i], None])
+        if value:
+            intervals[-1][1] = time[i] + time_step
+    return intervals
+
+def test_mask_intervals_edge_runs():
+    time = np.arange(10) * 0.5
+    for mask in ([1, 1, 0, 0, 1, 0, 1, 1, 1, 1], [1] * 10, [0] * 10, [0] * 9 + [1], [1] + [0] * 9, [1, 0] * 5):
+        mask = np.array(mask, dtype=bool)
+        assert mask_intervals(mask, time).tolist() == brute_force_intervals(mask, time, 0.5)
+        starts, stops = mask_runs(mask)
+        assert np.count_nonzero(mask) == np.sum(stops - starts)
+    assert mask_intervals(np.array([True]), np.array([3.0]), 2.0).tolist() == [[3.0, 5.0]]
+    assert mask_intervals(np.zeros(0, dtype=bool), np.zeros(0)).shape == (0, 2)